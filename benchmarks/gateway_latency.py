@@ -0,0 +1,198 @@
+"""Pre-commit hook latency under background load, with and without the Ollama gateway.
+
+Starts a simulated Ollama server that streams a fixed number of tokens
+per request and runs at most a few generations at once (like
+OLLAMA_NUM_PARALLEL). Background clients then keep it saturated with
+batch requests while a "hook" sends review requests one after another.
+The hook's latency is measured going straight to the server and going
+through an OllamaGateway that puts it in the precommit lane. Finally a
+burst of identical requests shows single-flight coalescing.
+
+Usage:
+    python benchmarks/gateway_latency.py
+    python benchmarks/gateway_latency.py --background 32 --hook-requests 30
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from ai_code_reviewer.gateway import CLIENT_HEADER, PRIORITY_HEADER, OllamaGateway  # noqa: E402
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Streams `tokens` NDJSON chunks per /api/chat request, `parallel` requests at a time."""
+
+    server: 'FakeOllama'
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', '0')))
+        with self.server.slots:
+            with self.server.lock:
+                self.server.generations += 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for i in range(self.server.tokens):
+                    time.sleep(self.server.token_seconds)
+                    line = json.dumps({'message': {'content': 'x'}, 'done': i == self.server.tokens - 1}) + '\n'
+                    data = line.encode('utf-8')
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+                    self.wfile.flush()
+                self.wfile.write(b'0\r\n\r\n')
+            except OSError:
+                self.close_connection = True
+
+    def log_message(self, format: str, *args):
+        pass
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """Simulated Ollama server with limited parallelism."""
+
+    daemon_threads = True
+
+    def __init__(self, parallel: int, tokens: int, token_seconds: float):
+        self.slots = threading.BoundedSemaphore(parallel)
+        self.tokens = tokens
+        self.token_seconds = token_seconds
+        self.lock = threading.Lock()
+        self.generations = 0
+        super().__init__(('127.0.0.1', 0), FakeOllamaHandler)
+
+
+def _serve(server: ThreadingHTTPServer) -> str:
+    """Run a server on a background thread and return its URL."""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def _chat(url: str, lane: str, client: str, prompt: str) -> float:
+    """Send one streaming chat request and read it to the end.
+
+    Returns:
+        Seconds until the last byte
+    """
+    started = time.perf_counter()
+    host, port = url[len('http://'):].split(':')
+    connection = http.client.HTTPConnection(host, int(port), timeout=600)
+    body = json.dumps({'model': 'bench', 'messages': [{'role': 'user', 'content': prompt}], 'stream': True})
+    connection.request('POST', '/api/chat', body=body, headers={
+        'Content-Type': 'application/json', PRIORITY_HEADER: lane, CLIENT_HEADER: client
+    })
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    return time.perf_counter() - started
+
+
+def _hook_latencies(url: str, background: int, hook_requests: int) -> List[float]:
+    """Measure sequential hook requests while background clients saturate the server."""
+    stop = threading.Event()
+
+    def flood(worker: int):
+        n = 0
+        while not stop.is_set():
+            _chat(url, 'batch', f"audit-{worker % 4}", f"batch {worker} {n}")
+            n += 1
+
+    with ThreadPoolExecutor(max_workers=background) as executor:
+        for worker in range(background):
+            executor.submit(flood, worker)
+        time.sleep(0.5)  # Let the backlog build up
+
+        latencies = [_chat(url, 'precommit', 'developer', f"hook {i}") for i in range(hook_requests)]
+        stop.set()
+    return latencies
+
+
+def _coalescing(url: str, burst: int) -> float:
+    """Send a burst of identical requests at once.
+
+    Returns:
+        Seconds for the whole burst
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=burst) as executor:
+        list(executor.map(lambda i: _chat(url, 'precommit', f"dev-{i}", "same diff"), range(burst)))
+    return time.perf_counter() - started
+
+
+def _summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        'p50': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--parallel', type=int, default=2, help='Generations the simulated server runs at once')
+    parser.add_argument('--tokens', type=int, default=20, help='Tokens streamed per request')
+    parser.add_argument('--token-ms', type=float, default=10.0, help='Milliseconds per token')
+    parser.add_argument('--background', type=int, default=16, help='Concurrent batch clients')
+    parser.add_argument('--hook-requests', type=int, default=20, help='Sequential hook requests measured')
+    parser.add_argument('--burst', type=int, default=10, help='Identical requests sent at once')
+    args = parser.parse_args()
+
+    console = Console()
+    results = {}
+    for mode in ('direct', 'gateway'):
+        ollama = FakeOllama(args.parallel, args.tokens, args.token_ms / 1000)
+        url = _serve(ollama)
+        gateway = None
+        if mode == 'gateway':
+            gateway = OllamaGateway(('127.0.0.1', 0), upstreams=[url], slots=args.parallel)
+            url = _serve(gateway)
+
+        console.print(f"[cyan]Measuring hook latency ({mode})...[/cyan]")
+        results[mode] = _summarize(_hook_latencies(url, args.background, args.hook_requests))
+
+        if gateway is not None:
+            before = ollama.generations
+            seconds = _coalescing(url, args.burst)
+            metrics = gateway.snapshot()
+            results['coalescing'] = (seconds, ollama.generations - before, metrics)
+            gateway.shutdown()
+        ollama.shutdown()
+
+    unloaded = args.tokens * args.token_ms / 1000
+    table = Table(title=f"Hook latency with {args.background} background clients "
+                        f"(unloaded request: {unloaded * 1000:.0f}ms)")
+    table.add_column("Path", style="cyan")
+    for column in ('p50', 'p95', 'max'):
+        table.add_column(column, justify="right")
+    for mode in ('direct', 'gateway'):
+        table.add_row(mode, *(f"{results[mode][column] * 1000:.0f}ms" for column in ('p50', 'p95', 'max')))
+    console.print(table)
+
+    seconds, generations, metrics = results['coalescing']
+    console.print(f"Coalescing: {args.burst} identical requests served by {generations} generation(s) "
+                  f"in {seconds * 1000:.0f}ms ({metrics['coalesced']} coalesced in total)")
+    lanes = metrics['lanes']
+    console.print("Queue wait p95 by lane: " + ", ".join(
+        f"{lane} {stats['wait_p95'] * 1000:.0f}ms ({stats['served']} served)" for lane, stats in lanes.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""Scaling benchmarks for the git layer on synthetic repositories.
+
+Generates repositories with configurable numbers of tracked, modified,
+staged, untracked and binary files, then times each GitHandler entry
+point in a fresh process. For each entry point it records wall time,
+the number of subprocesses spawned and the peak RSS of the Python process.
+The results are compared against stored baselines.
+
+Subprocess counts and memory growth are deterministic enough to gate
+on. Times are not: they depend on the machine and, on small shared
+machines, vary by 2x between runs. They are compared relative to a
+reference operation (a plain `git status` of the same repository)
+measured in the same run, and reported as "slower" without failing
+the run unless --gate-time is given.
+
+Git children are only counted, not measured: a forked child inherits the
+parent's resident pages, so their ru_maxrss says more about the parent
+than about git.
+
+Usage:
+    python benchmarks/git_scaling.py                      # small, medium, big-diffs
+    python benchmarks/git_scaling.py --scenarios large    # 100k files (slow to generate)
+    python benchmarks/git_scaling.py --update-baseline    # record new baselines
+    python benchmarks/git_scaling.py --gate-time          # also fail on slowdowns (quiet machine)
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baselines' / 'git_scaling.json'
+
+# Repository shapes; counts are numbers of files
+SCENARIOS = {
+    'small': {'files': 1000, 'modified': 50, 'staged': 50, 'untracked': 50, 'binaries': 10, 'diff_lines': 20},
+    'medium': {'files': 10000, 'modified': 200, 'staged': 200, 'untracked': 500, 'binaries': 50, 'diff_lines': 50},
+    'large': {'files': 100000, 'modified': 1000, 'staged': 1000, 'untracked': 2000, 'binaries': 200,
+              'diff_lines': 50},
+    'big-diffs': {'files': 1000, 'modified': 20, 'staged': 20, 'untracked': 0, 'binaries': 0, 'diff_lines': 20000},
+}
+DEFAULT_SCENARIOS = ['small', 'medium', 'big-diffs']
+
+# Operation every other time is compared relative to
+REFERENCE = 'git status (reference)'
+
+# Differences below these are treated as noise when comparing
+NOISE_FLOOR = 0.005  # Seconds
+RSS_NOISE_FLOOR_MB = 5.0
+
+
+def _tracked_paths(handler) -> List[str]:
+    """List tracked paths without going through _should_exclude."""
+    return [path for path in handler.repo.git.ls_files('-z').split('\0') if path]
+
+
+def _entry_points() -> Dict[str, Tuple[Optional[Callable], Callable]]:
+    """Benchmarked operations; each takes a fresh GitHandler and a setup value."""
+    return {
+        REFERENCE: (None, lambda handler, _: handler.repo.git.status('--porcelain', '--untracked-files=all')),
+        'get_staged_changes': (None, lambda handler, _: handler.get_staged_changes()),
+        'get_staged_changes+diffs': (None, lambda handler, _: [
+            len(change.diff) for change in handler.get_staged_changes()
+        ]),
+        'iter_staged_changes (first)': (None, lambda handler, _: next(handler.iter_staged_changes(), None)),
+        'get_unstaged_changes': (None, lambda handler, _: handler.get_unstaged_changes()),
+        'get_repo_status': (None, lambda handler, _: handler.get_repo_status()),
+        '_should_exclude (all tracked)': (_tracked_paths, lambda handler, paths: [
+            handler._should_exclude(path) for path in paths
+        ]),
+        'read_blobs (all tracked, HEAD)': (_tracked_paths, lambda handler, paths: handler.read_blobs([
+            f'HEAD:{path}' for path in paths
+        ])),
+    }
+
+
+def _git(repo: Path, *args: str):
+    """Run a git command in the benchmark repository."""
+    subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True)
+
+
+def _source_path(index: int) -> str:
+    """Path of the index-th generated source file (100 files per directory)."""
+    return f"src/pkg{index // 10000}/mod{index // 100 % 100}/file{index}.py"
+
+
+def generate_repo(root: Path, spec: Dict[str, int], seed: int = 0) -> Path:
+    """Create a synthetic repository for a scenario.
+
+    Args:
+        root: Directory to create the repository in
+        spec: Scenario spec (see SCENARIOS)
+        seed: Random seed for binary contents
+
+    Returns:
+        Path of the repository
+    """
+    rng = random.Random(seed)
+    repo = root / 'repo'
+    repo.mkdir(parents=True)
+    _git(repo, 'init', '-q')
+    _git(repo, 'config', 'user.email', 'bench@example.com')
+    _git(repo, 'config', 'user.name', 'bench')
+
+    for index in range(spec['files']):
+        path = repo / _source_path(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f'"""Module {index}."""\n\n\ndef value_{index}(x):\n    return x + {index}\n')
+    (repo / 'package-lock.json').write_text('{}\n')
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', 'initial')
+
+    added = ''.join(f"    # change {line}\n    x += {line}\n" for line in range(spec['diff_lines'] // 2))
+
+    # Unstaged modifications
+    for index in range(spec['modified']):
+        with open(repo / _source_path(index), 'a') as f:
+            f.write(f"\n\ndef changed_{index}(x):\n{added}    return x\n")
+
+    # Staged modifications and new files
+    staged = []
+    for index in range(spec['modified'], spec['modified'] + spec['staged']):
+        with open(repo / _source_path(index), 'a') as f:
+            f.write(f"\n\ndef staged_{index}(x):\n{added}    return x\n")
+        staged.append(_source_path(index))
+    for index in range(spec['staged'] // 5):
+        path = repo / 'src' / 'new' / f"added{index}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"def added_{index}(x):\n{added}    return x\n")
+        staged.append(str(path.relative_to(repo)))
+
+    # Untracked trees
+    for index in range(spec['untracked']):
+        path = repo / 'untracked' / f"tree{index // 50}" / f"sub{index // 10 % 5}" / f"u{index}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"print({index})\n")
+
+    # Binaries, half staged and half untracked
+    for index in range(spec['binaries']):
+        path = repo / 'assets' / f"blob{index}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(bytes(rng.getrandbits(8) for _ in range(4096)))
+        if index % 2 == 0:
+            staged.append(str(path.relative_to(repo)))
+
+    for start in range(0, len(staged), 500):
+        _git(repo, 'add', '--', *staged[start:start + 500])
+
+    return repo
+
+
+def _measure(repo: str, entry: str, repeats: int, results):
+    """Measure one entry point in this (fresh) process; put the result dict in the queue."""
+    sys.path.insert(0, str(SRC_DIR))
+    from ai_code_reviewer.git_handler import GitHandler
+
+    spawned = [0]
+    original_init = subprocess.Popen.__init__
+
+    def counting_init(self, *args, **kwargs):
+        spawned[0] += 1
+        original_init(self, *args, **kwargs)
+
+    subprocess.Popen.__init__ = counting_init
+
+    setup, operation = _entry_points()[entry]
+    value = setup(GitHandler(repo)) if setup else None
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    counts = []
+    for _ in range(repeats):
+        handler = GitHandler(repo)
+        spawned[0] = 0
+        started = time.perf_counter()
+        operation(handler, value)
+        timings.append(time.perf_counter() - started)
+        counts.append(spawned[0])
+
+    results.put({
+        'seconds': min(timings),
+        'subprocesses': max(counts),
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'rss_growth_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+    })
+
+
+def run_entry(repo: Path, entry: str, repeats: int) -> Dict[str, float]:
+    """Run one measurement in a spawned process so peak RSS is not inherited.
+
+    Args:
+        repo: Benchmark repository
+        entry: Entry point name
+        repeats: Timed repetitions (the fastest one is reported)
+
+    Returns:
+        Measurement dict
+    """
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(str(repo), entry, repeats, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def compare(result: Dict[str, float], baseline: Dict[str, float], reference: float, tolerance: float,
+            gate_time: bool = False) -> str:
+    """Compare a measurement with its baseline.
+
+    The baseline time is scaled to this machine by the reference
+    operation: an entry point that took twice as long as the reference
+    when the baseline was recorded is expected to do so again.
+
+    Args:
+        result: New measurement
+        baseline: Stored measurement (may be None)
+        reference: Seconds the reference operation took in this run
+        tolerance: Allowed relative slowdown and memory growth, e.g. 0.5 for +50%
+        gate_time: Whether a slowdown is a regression rather than a warning
+
+    Returns:
+        'new', 'ok', 'faster', a 'slower ...' warning or a 'REGRESSION: ...' description
+    """
+    if not baseline:
+        return 'new'
+
+    problems = []
+    if result['subprocesses'] > baseline['subprocesses']:
+        problems.append(f"subprocesses {baseline['subprocesses']} -> {result['subprocesses']}")
+    expected = baseline['relative'] * reference
+    limit = max(expected * (1 + tolerance), expected + NOISE_FLOOR)
+    slower = f"time x{result['seconds'] / max(expected, 1e-9):.2f}" if result['seconds'] > limit else None
+    if slower and gate_time:
+        problems.append(slower)
+    rss_limit = baseline['rss_growth_mb'] * (1 + tolerance) + RSS_NOISE_FLOOR_MB
+    if result['rss_growth_mb'] > rss_limit:
+        problems.append(f"RSS growth {baseline['rss_growth_mb']:.1f}MB -> {result['rss_growth_mb']:.1f}MB")
+
+    if problems:
+        return 'REGRESSION: ' + ', '.join(problems)
+    if slower:
+        return f"slower: {slower}"
+    if result['seconds'] < expected / (1 + tolerance) - NOISE_FLOOR:
+        return 'faster'
+    return 'ok'
+
+
+def main() -> int:
+    """Run the benchmark suite.
+
+    Returns:
+        Exit code (1 if any regression was found)
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help=f"Comma separated scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument('--repeats', type=int, default=3, help='Timed repetitions per entry point')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed slowdown relative to the reference operation (default: 0.5)')
+    parser.add_argument('--gate-time', action='store_true', help='Fail on slowdowns, not only on extra subprocesses')
+    parser.add_argument('--workdir', type=Path, default=None,
+                        help='Keep generated repositories here and reuse them between runs')
+    args = parser.parse_args()
+
+    console = Console()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {'results': {}}
+    results = {}
+    regressions = 0
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix='git-scaling-'))
+    for name in args.scenarios.split(','):
+        spec = SCENARIOS[name]
+        spec_hash = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:8]
+        root = workdir / f"{name}-{spec_hash}"
+        repo = root / 'repo'
+        if not repo.exists():
+            console.print(f"[cyan]Generating '{name}' repository ({spec['files']} files)...[/cyan]")
+            started = time.perf_counter()
+            generate_repo(root, spec)
+            console.print(f"[dim]  generated in {time.perf_counter() - started:.1f}s[/dim]")
+
+        table = Table(title=f"{name}: {spec}")
+        for column in ('Entry point', 'Time', 'x Ref', 'Procs', 'Peak RSS', 'Growth', 'Baseline'):
+            table.add_column(column, justify='left' if column in ('Entry point', 'Baseline') else 'right',
+                             no_wrap=column == 'Entry point')
+
+        results[name] = {}
+        reference = None
+        for entry in _entry_points():
+            result = run_entry(repo, entry, args.repeats)
+            reference = reference or max(result['seconds'], 1e-9)  # The reference comes first
+            result['relative'] = result['seconds'] / reference
+            results[name][entry] = result
+            status = compare(result, baseline['results'].get(name, {}).get(entry), reference, args.tolerance,
+                             args.gate_time)
+            regressions += status.startswith('REGRESSION')
+            style = 'red' if status.startswith('REGRESSION') else 'yellow' if status.startswith('slower') \
+                else 'green' if status == 'faster' else ''
+            table.add_row(entry, f"{result['seconds']:.3f}s", f"{result['relative']:.2f}",
+                          str(result['subprocesses']), f"{result['peak_rss_mb']:.1f}MB", f"+{result['rss_growth_mb']:.1f}MB",
+                          f"[{style}]{status}[/{style}]" if style else status)
+        console.print(table)
+
+    if args.update_baseline:
+        baseline['results'].update(results)
+        baseline['machine'] = f"{platform.system()} {platform.machine()}, Python {platform.python_version()}, " \
+                              f"{os.cpu_count()} CPUs"
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        console.print(f"[green]Baseline written to {args.baseline}[/green]")
+
+    if regressions:
+        console.print(f"[red]{regressions} regression(s) against {args.baseline}[/red]")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
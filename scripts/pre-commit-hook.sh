@@ -33,6 +33,8 @@ fi
 # Configuration
 # Set BLOCK_ON_ISSUES=true to prevent commits with code quality issues
 BLOCK_ON_ISSUES=${BLOCK_ON_ISSUES:-false}
+# Set FAIL_FAST=true to stop reviewing once the commit is known to be blocked
+FAIL_FAST=${FAIL_FAST:-false}
 
 # Build command
 if [ -x "$REVIEW_SCRIPT" ]; then
@@ -45,6 +47,9 @@ fi
 
 if [ "$BLOCK_ON_ISSUES" = "true" ]; then
     CMD="$CMD --block-on-issues"
+    if [ "$FAIL_FAST" = "true" ]; then
+        CMD="$CMD --fail-fast"
+    fi
 fi
 
 # Run the AI code review with streaming output
@@ -4,12 +4,14 @@ __version__ = "1.0.0"
 __author__ = "Haufe 2025 Hackathon Team"
 __description__ = "Pre-commit code reviews with local AI powered by Ollama + LLama 3.2:1B"
 
+from .change import Change
 from .code_reviewer import CodeReviewer
 from .git_handler import GitHandler
 from .ollama_client import OllamaClient
 from .tui import ReviewTUI
 
 __all__ = [
+    "Change",
     "CodeReviewer",
     "GitHandler", 
     "OllamaClient",
@@ -1,23 +1,40 @@
 """Command-line interface for AI Code Review Assistant."""
 
+import json
+import os
 import sys
+import time
 import argparse
-
-from .code_reviewer import CodeReviewer
-from .git_handler import GitHandler
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from .audit import RepoAuditor, parse_shard, merge_audit_reports
+from .cache_server import ReviewCacheServer, parse_bind
+from .cancellation import CancellationToken, CancelledError
+from .change import Change
+from .code_reviewer import CodeReviewer, ReviewStream
+from .gateway import OllamaGateway
+from .git_handler import GitHandler, detect_language
+from .journal import ReviewJournal
+from .multi_repo import MultiRepoReviewer, read_manifest
 from .ollama_client import OllamaClient
+from .pipeline import prefetch
+from .summary import SummaryAggregator
+from .triage import TIER_SKIP
 from .tui import ReviewTUI
+from .watch import ReviewWatcher, InotifyBackend
 from . import config
 
 
 class CodeReviewApp:
     """Main application class."""
 
-    def __init__(self, repo_path: str = None):
+    def __init__(self, repo_path: str = None, priority: str = 'interactive'):
         """Initialize the application.
 
         Args:
             repo_path: Path to git repository
+            priority: Gateway lane for this run's model calls
         """
         self.tui = ReviewTUI()
 
@@ -27,8 +44,21 @@ class CodeReviewApp:
             self.tui.show_error(str(e))
             sys.exit(1)
 
-        self.ollama_client = OllamaClient()
+        self.ollama_client = OllamaClient(models=config.OLLAMA_MODELS, priority=priority)
         self.code_reviewer = CodeReviewer(self.git_handler, self.ollama_client)
+        self.started = time.perf_counter()
+
+    def get_timing(self) -> Dict[str, any]:
+        """Collect timing statistics for the run so far.
+
+        Returns:
+            Dict for ReviewTUI.show_timing_report
+        """
+        return {
+            'elapsed': time.perf_counter() - self.started,
+            'pool': self.ollama_client.get_pool_stats(),
+            'concurrency': self.ollama_client.get_concurrency_stats()
+        }
 
     def check_prerequisites(self) -> bool:
         """Check if all prerequisites are met.
@@ -36,21 +66,7 @@ class CodeReviewApp:
         Returns:
             True if everything is ready
         """
-        connected = self.ollama_client.check_connection()
-        model_available = self.ollama_client.check_model_available() if connected else False
-
-        self.tui.show_connection_status(connected, model_available)
-
-        if not connected:
-            self.tui.show_error("Please start Ollama: ollama serve")
-            return False
-
-        if not model_available:
-            self.tui.show_warning(f"Model '{config.OLLAMA_MODEL}' not found.")
-            self.tui.show_info(f"Pull the model with: ollama pull {config.OLLAMA_MODEL}")
-            return False
-
-        return True
+        return check_prerequisites(self.tui, self.ollama_client)
 
     def run_interactive(self):
         """Run the application in interactive mode."""
@@ -59,6 +75,9 @@ class CodeReviewApp:
         if not self.check_prerequisites():
             return
 
+        # Reviews stay open for follow-up questions
+        self.code_reviewer.keep_conversations = True
+
         # Show initial repo status
         status = self.git_handler.get_repo_status()
         self.tui.show_repo_status(status)
@@ -91,45 +110,7 @@ class CodeReviewApp:
             return
 
         self.tui.show_changes_list(changes)
-
-        if not self.tui.confirm_action(f"\nReview {len(changes)} file(s)?"):
-            return
-
-        self.tui.show_info("Starting AI review... Watch the magic happen! ✨")
-
-        reviews = []
-        
-        # Review each file with streaming output
-        for i, change in enumerate(changes, 1):
-            self.tui.show_info(f"[{i}/{len(changes)}] Reviewing {change['file']}...")
-            self.tui.show_streaming_review_header(
-                change['file'],
-                change['type'],
-                change['language']
-            )
-            
-            # Stream the review
-            review_dict = None
-            for chunk, is_complete, review_data in self.code_reviewer.review_single_file_streaming(
-                change['file'],
-                change['diff'],
-                change['language'],
-                change['type']
-            ):
-                if not is_complete:
-                    self.tui.show_streaming_chunk(chunk)
-                else:
-                    review_dict = review_data
-            
-            # Finalize this review
-            if review_dict:
-                self.tui.finalize_streaming_review(review_dict['rating'])
-                reviews.append(review_dict)
-
-        # Show summary
-        if reviews:
-            summary = self.code_reviewer.get_summary(reviews)
-            self.tui.show_summary(summary)
+        self._confirm_and_review(changes)
 
     def review_staged(self):
         """Review staged changes."""
@@ -142,60 +123,139 @@ class CodeReviewApp:
             return
 
         self.tui.show_changes_list(changes)
+        self._confirm_and_review(changes)
+
+    def _confirm_and_review(self, changes: List[Change]):
+        """Ask whether to review the listed changes, reviewing speculatively while the prompt is open.
+
+        Args:
+            changes: Changes shown to the user
+        """
+        self.code_reviewer.conversations.clear()
+        stream = ReviewStream(self.code_reviewer, changes)
 
-        if not self.tui.confirm_action(f"\nReview {len(changes)} file(s)?"):
+        try:
+            confirmed = self.tui.confirm_action(f"\nReview {len(changes)} file(s)?")
+        except BaseException:
+            stream.cancel()
+            raise
+        if not confirmed:
+            stream.cancel()
             return
 
+        stream.confirm()
+        self._review_streaming(changes, stream)
+
+    def _review_streaming(self, changes: List[Change], stream: ReviewStream):
+        """Show streaming reviews of changes one by one, then the summary.
+
+        Output buffered while the confirmation prompt was open is shown
+        first. Ctrl-C cancels the review in progress and returns to the
+        caller.
+
+        Args:
+            changes: List of changes to review
+            stream: Reviews of the changes, already running
+        """
         self.tui.show_info("Starting AI review... Watch the magic happen! ✨")
 
         reviews = []
-        
-        # Review each file with streaming output
-        for i, change in enumerate(changes, 1):
-            self.tui.show_info(f"[{i}/{len(changes)}] Reviewing {change['file']}...")
-            self.tui.show_streaming_review_header(
-                change['file'],
-                change['type'],
-                change['language']
-            )
-            
-            # Stream the review
-            review_dict = None
-            for chunk, is_complete, review_data in self.code_reviewer.review_single_file_streaming(
-                change['file'],
-                change['diff'],
-                change['language'],
-                change['type']
-            ):
+        current = None
+        position = 0
+
+        try:
+            # Show each file's review as it streams
+            for change, chunk, is_complete, review_data in stream:
+                if change is not current:
+                    current = change
+                    position += 1
+                    self.tui.show_info(f"[{position}/{len(changes)}] Reviewing {change.file}...")
+                    self.tui.show_streaming_review_header(change.file, change.type, change.language)
+
                 if not is_complete:
                     self.tui.show_streaming_chunk(chunk)
-                else:
-                    review_dict = review_data
-            
-            # Finalize this review
-            if review_dict:
-                self.tui.finalize_streaming_review(review_dict['rating'])
-                reviews.append(review_dict)
+                elif review_data:
+                    # Finalize this review
+                    self.tui.finalize_streaming_review(review_data['rating'], review_data)
+                    reviews.append(review_data)
+        except (KeyboardInterrupt, CancelledError):
+            stream.cancel()
+            self.tui.show_warning(f"Review cancelled after {len(reviews)} of {len(changes)} file(s).")
 
         # Show summary
         if reviews:
             summary = self.code_reviewer.get_summary(reviews)
             self.tui.show_summary(summary)
 
-    def run_quick_review(self, staged: bool = False):
+        self._follow_up([review['file'] for review in reviews])
+
+    def _follow_up(self, files: List[str]):
+        """Answer follow-up questions about the reviews of a run until the user is done.
+
+        Args:
+            files: Reviewed files, in display order
+        """
+        files = [filename for filename in files if filename in self.code_reviewer.conversations]
+        while files:
+            request = self.tui.prompt_follow_up(files)
+            if request is None:
+                break
+
+            filename, question = request
+            self.tui.show_follow_up_header(filename, question)
+            started = time.perf_counter()
+            cancel_token = CancellationToken()
+            try:
+                for chunk in self.code_reviewer.ask_follow_up(filename, question, cancel_token=cancel_token):
+                    self.tui.show_streaming_chunk(chunk)
+            except KeyboardInterrupt:
+                cancel_token.cancel()
+                self.tui.show_warning("Answer cancelled.")
+                continue
+            self.tui.finalize_follow_up(time.perf_counter() - started)
+
+    def run_quick_review(self, staged: bool = False, resume: Optional[str] = None):
         """Run a quick review without interaction.
 
         Args:
             staged: Review staged changes if True, unstaged if False
+            resume: Id of an interrupted run to continue (its staged setting wins)
         """
         self.tui.show_banner()
 
+        runs_dir = Path(self.git_handler.repo_root) / config.RUNS_DIR
+        journal = None
+        if resume:
+            try:
+                journal = ReviewJournal.open(runs_dir, resume)
+            except ValueError as e:
+                self.tui.show_error(str(e))
+                return
+            staged = journal.header['staged']
+
         if not self.check_prerequisites():
             return
 
+        if resume:
+            self.tui.show_info(f"Resuming run {journal.run_id}: {len(journal.completed())} file(s) already reviewed")
+        elif config.RUN_JOURNAL_ENABLED:
+            journal = ReviewJournal.create(runs_dir, staged)
+            self.tui.show_info(f"Run ID: {journal.run_id}")
+
         self.tui.show_info(f"Reviewing {'staged' if staged else 'unstaged'} changes...")
 
-        reviews = self.code_reviewer.review_changes(staged=staged)
+        cancel_token = CancellationToken()
+        try:
+            reviews = self.code_reviewer.review_changes(staged=staged, cancel_token=cancel_token, journal=journal)
+        except (KeyboardInterrupt, CancelledError):
+            cancel_token.cancel()
+            self.tui.show_warning("Review cancelled. In-flight requests were aborted.")
+            if journal:
+                self.tui.show_info(f"Finished reviews are saved; continue with --resume {journal.run_id}")
+            return
+        finally:
+            if journal:
+                journal.close()
 
         if not reviews:
             self.tui.show_warning("No changes found.")
@@ -205,15 +265,120 @@ class CodeReviewApp:
         for review in reviews:
             self.tui.show_review_result(review)
 
-        # Show summary
-        summary = self.code_reviewer.get_summary(reviews)
+        # Show summary; a journaled run is summarized from disk
+        if journal:
+            summary = self.code_reviewer.get_summary(journal.reviews(), keep_reviews=False)
+        else:
+            summary = self.code_reviewer.get_summary(reviews)
         self.tui.show_summary(summary)
 
-    def run_precommit(self, block_on_issues: bool = False) -> int:
+    def run_watch(self):
+        """Review changed files in the background until interrupted.
+
+        Results go to the review cache, so the pre-commit hook and other
+        review runs serve them without calling the model again.
+        """
+        self.tui.show_banner()
+
+        if not self.check_prerequisites():
+            return
+
+        if self.code_reviewer.cache is None:
+            self.tui.show_error("Watch mode needs the review cache (unset AI_REVIEW_CACHE=0).")
+            return
+
+        # Background work should never slow down the editor or the build
+        if hasattr(os, 'nice'):
+            os.nice(config.WATCH_NICENESS)
+
+        watcher = ReviewWatcher(self.code_reviewer)
+        backend = 'inotify' if isinstance(watcher.backend, InotifyBackend) else 'polling'
+        self.tui.show_info(f"Watching {self.git_handler.repo_root} ({backend}). Press Ctrl-C to stop.")
+
+        cancel_token = CancellationToken()
+        try:
+            watcher.run(cancel_token, on_review=self.tui.show_watch_review)
+        except (KeyboardInterrupt, CancelledError):
+            cancel_token.cancel()
+            self.tui.show_info("Stopped watching.")
+
+    def run_audit(self, shard: str = "0/1", output_dir: str = config.AUDIT_OUTPUT_DIR):
+        """Review every tracked file belonging to one shard of the repository.
+
+        Args:
+            shard: Shard spec "i/N"
+            output_dir: Directory for checkpoints and reports (relative to repo root)
+        """
+        self.tui.show_banner()
+
+        try:
+            shard_index, shard_count = parse_shard(shard)
+        except ValueError as e:
+            self.tui.show_error(str(e))
+            return
+
+        if not self.check_prerequisites():
+            return
+
+        auditor = RepoAuditor(self.code_reviewer, shard_index, shard_count, output_dir)
+        files = auditor.select_files()
+
+        if not files:
+            self.tui.show_warning("No tracked files in this shard.")
+            return
+
+        self.tui.show_info(f"Auditing shard {shard_index}/{shard_count}: {len(files)} file(s)...")
+
+        with self.tui.show_review_progress(len(files)) as progress:
+            task = progress.add_task("Auditing", total=len(files))
+            progress.update(task, completed=len(auditor.load_checkpoint()))
+
+            summary = auditor.run(progress_callback=lambda record: progress.advance(task))
+            progress.update(task, completed=len(files))
+
+        self.tui.show_summary(summary)
+        self.tui.show_success(f"Shard report written to {auditor.report_path}")
+
+    def run_audit_merge(self, output_dir: str = config.AUDIT_OUTPUT_DIR):
+        """Merge the outputs of all audit shards into one report.
+
+        Args:
+            output_dir: Directory containing the shard reports (relative to repo root)
+        """
+        directory = Path(self.git_handler.repo_root) / output_dir
+        summary = merge_audit_reports(self.code_reviewer, str(directory))
+
+        if not summary['shards']:
+            self.tui.show_warning(f"No shard reports found in {directory}")
+            return
+
+        if summary['missing_shards']:
+            self.tui.show_warning(f"Incomplete audit: no report for shard(s) {', '.join(summary['missing_shards'])}")
+        if summary['ignored_shards']:
+            self.tui.show_warning(f"Ignored outputs of an audit with another shard count: "
+                                  f"{', '.join(summary['ignored_shards'])}")
+        self.tui.show_info(f"Merged {len(summary['shards'])} of {summary['shard_count']} shard(s)")
+        self.tui.show_summary(summary)
+        self.tui.show_success(f"Audit report written to {directory / 'report.json'}")
+
+    def run_push_cache(self):
+        """Upload the local review cache to the team-shared cache service."""
+        if self.code_reviewer.remote_cache is None:
+            self.tui.show_error("Set AI_REVIEW_REMOTE_CACHE to the cache service URL (and AI_REVIEW_REMOTE_CACHE_TOKEN).")
+            return
+
+        stored = self.code_reviewer.push_shared_reviews()
+        if not self.code_reviewer.remote_cache.writable:
+            self.tui.show_error(f"The cache service rejected the upload after {stored} review(s).")
+            return
+        self.tui.show_success(f"Uploaded {stored} review(s) to {config.REMOTE_CACHE_URL}")
+
+    def run_precommit(self, block_on_issues: bool = False, fail_fast: bool = False) -> int:
         """Run pre-commit review on staged changes with streaming.
 
         Args:
             block_on_issues: If True, block commit on NEEDS_WORK or ERROR ratings
+            fail_fast: With block_on_issues, stop reviewing once the commit is known to be blocked
 
         Returns:
             Exit code (0 = allow commit, 1 = block commit)
@@ -230,40 +395,55 @@ class CodeReviewApp:
 
         model_available = self.ollama_client.check_model_available()
         if not model_available:
-            self.tui.show_warning(f"Model '{config.OLLAMA_MODEL}' not found. Skipping AI review.")
-            self.tui.show_info(f"Pull with: ollama pull {config.OLLAMA_MODEL}")
+            self.tui.show_warning(f"Model '{self.ollama_client.model}' not found. Skipping AI review.")
+            self.tui.show_info(f"Pull with: ollama pull {self.ollama_client.model}")
             return 0  # Allow commit
 
-        # Get staged changes
-        changes = self.git_handler.get_staged_changes()
+        # List staged files without reading their diffs
+        files = self.git_handler.get_staged_files()
 
-        if not changes:
+        if not files:
             self.tui.show_info("No staged changes to review.")
             return 0
 
-        self.tui.console.print(f"[cyan]Found {len(changes)} file(s) to review:[/cyan]")
-        for change in changes:
-            self.tui.console.print(f"  • {change['file']} ({change['language']})")
+        self.tui.console.print(f"[cyan]Found {len(files)} file(s) to review:[/cyan]")
+        for filepath in files:
+            self.tui.console.print(f"  • {filepath} ({detect_language(filepath)})")
         self.tui.console.print()
 
-        reviews = []
+        # One round-trip to the team cache for the whole commit
+        self.code_reviewer.fetch_shared_reviews(self.code_reviewer.cache_keys(files, 'staged').values())
+
+        aggregator = SummaryAggregator()
+        fail_fast = block_on_issues and fail_fast
+
+        # With --fail-fast, triage everything first and handle instant verdicts
+        # (e.g. syntax errors) before any model call
+        if fail_fast:
+            # Only this repository's index goes into the commit, not the submodules'
+            changes = self.git_handler.get_staged_changes(nested=False)
+            triages = self.code_reviewer.triage_changes(changes)
+            order = sorted(range(len(changes)), key=lambda index: triages[index]['tier'] != TIER_SKIP)
+            pending = [(changes[index], triages[index]) for index in order]
+        else:
+            # Read diffs on a background thread so the first review starts right away
+            pending = ((change, None) for change in prefetch(self.git_handler.iter_staged_changes()))
 
         # Review each file with streaming
-        for i, change in enumerate(changes, 1):
-            self.tui.console.print(f"[bold cyan][{i}/{len(changes)}] Reviewing {change['file']}...[/bold cyan]")
-            self.tui.show_streaming_review_header(
-                change['file'],
-                change['type'],
-                change['language']
-            )
+        for i, (change, triage) in enumerate(pending, 1):
+            if fail_fast and aggregator.blocks_commit:
+                aggregator.mark_not_reviewed([remaining.file for remaining, _ in pending[i - 1:]])
+                break
+
+            self.tui.console.print(f"[bold cyan][{i}/{len(files)}] Reviewing {change.file}...[/bold cyan]")
+            self.tui.show_streaming_review_header(change.file, change.type, change.language)
 
             # Stream the review
             review_dict = None
             for chunk, is_complete, review_data in self.code_reviewer.review_single_file_streaming(
-                change['file'],
-                change['diff'],
-                change['language'],
-                change['type']
+                change,
+                triage=triage,
+                stop_on_ratings=['NEEDS_WORK'] if fail_fast else None
             ):
                 if not is_complete:
                     self.tui.show_streaming_chunk(chunk)
@@ -272,24 +452,20 @@ class CodeReviewApp:
 
             # Finalize this review
             if review_dict:
-                self.tui.finalize_streaming_review(review_dict['rating'])
-                reviews.append(review_dict)
+                self.tui.finalize_streaming_review(review_dict['rating'], review_dict)
+                aggregator.add(review_dict)
 
         # Show summary
-        if reviews:
-            summary = self.code_reviewer.get_summary(reviews)
+        if aggregator.total:
+            summary = aggregator.summary()
             self.tui.show_summary(summary)
 
             # Decide whether to block commit
-            if block_on_issues:
-                needs_work = summary['ratings'].get('NEEDS_WORK', 0)
-                errors = summary['errors']
-
-                if needs_work > 0 or errors > 0:
-                    self.tui.console.print()
-                    self.tui.show_error("Commit blocked due to code quality issues!")
-                    self.tui.console.print("[yellow]Fix the issues and try again, or use --no-verify to skip.[/yellow]")
-                    return 1  # Block commit
+            if block_on_issues and aggregator.blocks_commit:
+                self.tui.console.print()
+                self.tui.show_error("Commit blocked due to code quality issues!")
+                self.tui.console.print("[yellow]Fix the issues and try again, or use --no-verify to skip.[/yellow]")
+                return 1  # Block commit
 
             self.tui.console.print()
             self.tui.show_success("Review complete. Proceeding with commit.")
@@ -298,6 +474,38 @@ class CodeReviewApp:
         return 0
 
 
+def check_prerequisites(tui: ReviewTUI, ollama_client: OllamaClient) -> bool:
+    """Check that Ollama is running and the review models are available.
+
+    Args:
+        tui: Where to report problems
+        ollama_client: Client to check
+
+    Returns:
+        True if everything is ready
+    """
+    connected = ollama_client.check_connection()
+    model_available = ollama_client.check_model_available() if connected else False
+
+    tui.show_connection_status(connected, model_available)
+
+    if not connected:
+        tui.show_error("Please start Ollama: ollama serve")
+        return False
+
+    if not model_available:
+        tui.show_warning(f"Model '{ollama_client.model}' not found.")
+        tui.show_info(f"Pull the model with: ollama pull {ollama_client.model}")
+        return False
+
+    for model in ollama_client.models[1:]:
+        if not ollama_client.check_model_available(model):
+            tui.show_warning(f"Escalation model '{model}' not found; reviews will stop at the smaller model.")
+            tui.show_info(f"Pull the model with: ollama pull {model}")
+
+    return True
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -327,20 +535,281 @@ def main():
     parser.add_argument(
         '--block-on-issues',
         action='store_true',
-        help='Block commit if code has NEEDS_WORK or ERROR ratings (use with --precommit)'
+        help='Block commit if code has NEEDS_WORK or ERROR ratings (use with --precommit or --repos)'
+    )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='Stop reviewing as soon as the commit is known to be blocked (use with --block-on-issues)'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='RUN_ID',
+        default=None,
+        help='Continue an interrupted review run, skipping files it already reviewed'
+    )
+    parser.add_argument(
+        '--audit',
+        action='store_true',
+        help='Review every tracked file in the repository (use with --shard to split the work)'
+    )
+    parser.add_argument(
+        '--shard',
+        type=str,
+        default='0/1',
+        help='Audit only shard i of N, e.g. 0/4 (default: 0/1, the whole repository)'
+    )
+    parser.add_argument(
+        '--audit-dir',
+        type=str,
+        default=config.AUDIT_OUTPUT_DIR,
+        help=f'Directory for audit checkpoints and reports (default: {config.AUDIT_OUTPUT_DIR})'
+    )
+    parser.add_argument(
+        '--merge-audit',
+        action='store_true',
+        help='Merge the shard reports of the latest audit in --audit-dir into one report'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Review changed files in the background as you edit, so commits are reviewed instantly'
+    )
+    parser.add_argument(
+        '--serve-cache',
+        action='store_true',
+        help='Run the team-shared review cache service (no repository needed)'
+    )
+    parser.add_argument(
+        '--serve-gateway',
+        action='store_true',
+        help='Run a gateway in front of Ollama with priority lanes and request coalescing (no repository needed)'
+    )
+    parser.add_argument(
+        '--bind',
+        type=str,
+        default=None,
+        help=f'Address for --serve-cache (default: {config.CACHE_SERVER_BIND}) '
+             f'or --serve-gateway (default: {config.GATEWAY_BIND})'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=config.CACHE_SERVER_DIR,
+        help=f'Directory where --serve-cache stores reviews (default: {config.CACHE_SERVER_DIR})'
+    )
+    parser.add_argument(
+        '--push-cache',
+        action='store_true',
+        help='Upload the local review cache to AI_REVIEW_REMOTE_CACHE (e.g. from CI after a review run)'
+    )
+    parser.add_argument(
+        '--repos',
+        nargs='+',
+        metavar='PATH',
+        default=[],
+        help='Review several repositories in one run with a shared model pool and cache (no repository needed)'
+    )
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        default=None,
+        help='File listing repositories to review, one path per line (like --repos)'
+    )
+    parser.add_argument(
+        '--report',
+        type=str,
+        default=None,
+        help='Write the per-repository and overall summaries of --repos/--manifest to this JSON file'
+    )
+    parser.add_argument(
+        '--timing',
+        action='store_true',
+        help='Show a timing report (elapsed time, HTTP connection reuse, review concurrency) when done'
     )
 
     args = parser.parse_args()
 
-    app = CodeReviewApp(args.repo_path)
-
+    if args.serve_cache:
+        serve_cache(args.bind or config.CACHE_SERVER_BIND, args.cache_dir)
+        return
+
+    if args.serve_gateway:
+        serve_gateway(args.bind or config.GATEWAY_BIND)
+        return
+
+    if args.repos or args.manifest:
+        sys.exit(review_repositories(args))
+
+    app = CodeReviewApp(args.repo_path, priority=review_priority(args))
+
+    try:
+        run(app, args)
+    except KeyboardInterrupt:
+        app.tui.show_warning("Review cancelled.")
+        sys.exit(130)
+    finally:
+        app.git_handler.close()
+        if args.timing:
+            app.tui.show_timing_report(app.get_timing())
+
+
+def serve_cache(bind: str, directory: str):
+    """Run the team-shared review cache service until interrupted.
+
+    Args:
+        bind: Listen address, "host:port"
+        directory: Directory holding the cached reviews
+    """
+    tui = ReviewTUI()
+    try:
+        server = ReviewCacheServer(parse_bind(bind), Path(directory), token=config.REMOTE_CACHE_TOKEN)
+    except (ValueError, OSError) as e:
+        tui.show_error(str(e))
+        sys.exit(1)
+
+    writes = "token required for writes" if config.REMOTE_CACHE_TOKEN else "anonymous writes from this machine"
+    tui.show_info(f"Serving reviews from {directory} on http://{bind} ({writes}). Press Ctrl-C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        tui.show_info("Cache service stopped.")
+    finally:
+        server.server_close()
+
+
+def serve_gateway(bind: str):
+    """Run the Ollama gateway until interrupted.
+
+    Args:
+        bind: Listen address, "host:port"
+    """
+    tui = ReviewTUI()
+    try:
+        server = OllamaGateway(parse_bind(bind))
+    except (ValueError, OSError) as e:
+        tui.show_error(str(e))
+        sys.exit(1)
+
+    upstreams = ", ".join(server.upstreams)
+    tui.show_info(f"Gateway on http://{bind} for {upstreams} ({config.GATEWAY_UPSTREAM_CONCURRENCY} slot(s) each). "
+                  f"Point clients at it with OLLAMA_HOST=http://{bind}; metrics at /gateway/metrics. "
+                  f"Press Ctrl-C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        tui.show_info("Gateway stopped.")
+    finally:
+        server.server_close()
+
+
+def review_priority(args: argparse.Namespace) -> str:
+    """Pick the gateway lane for the selected mode.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        'precommit' for the hook, 'batch' for background and bulk modes, 'interactive' otherwise
+    """
     if args.precommit:
-        exit_code = app.run_precommit(block_on_issues=args.block_on_issues)
+        return 'precommit'
+    if args.watch or args.audit or args.merge_audit or args.push_cache:
+        return 'batch'
+    return 'interactive'
+
+
+def review_repositories(args: argparse.Namespace) -> int:
+    """Review the changes of many repositories through one scheduler.
+
+    Args:
+        args: Parsed command-line arguments (--repos, --manifest, --staged, --report)
+
+    Returns:
+        Exit code (1 if a repository could not be read, or if --block-on-issues found issues)
+    """
+    tui = ReviewTUI()
+    started = time.perf_counter()
+
+    repo_paths = list(args.repos)
+    if args.manifest:
+        try:
+            repo_paths += read_manifest(args.manifest)
+        except OSError as e:
+            tui.show_error(f"Cannot read manifest: {e}")
+            return 1
+
+    tui.show_banner()
+    ollama_client = OllamaClient(models=config.OLLAMA_MODELS, priority='batch')
+    if not check_prerequisites(tui, ollama_client):
+        return 1
+
+    reviewer = MultiRepoReviewer(ollama_client, repo_paths, staged=args.staged)
+    tui.show_info(f"Reviewing {'staged' if args.staged else 'unstaged'} changes in {len(reviewer.runs)} repositories...")
+
+    def show(repo: str, review: Dict[str, any]):
+        tui.show_watch_review({**review, 'file': f"{Path(repo).name}/{review['file']}"})
+
+    cancel_token = CancellationToken()
+    try:
+        results = reviewer.run(cancel_token, on_review=show)
+    except (KeyboardInterrupt, CancelledError):
+        cancel_token.cancel()
+        tui.show_warning("Review cancelled. In-flight requests were aborted.")
+        return 130
+    finally:
+        reviewer.close()
+        if args.timing:
+            tui.show_timing_report({
+                'elapsed': time.perf_counter() - started,
+                'pool': ollama_client.get_pool_stats(),
+                'concurrency': ollama_client.get_concurrency_stats()
+            })
+
+    tui.show_multi_repo_summary(results)
+    if results['summary']['total_files']:
+        tui.show_summary(results['summary'])
+    else:
+        tui.show_warning("No changes found.")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        tui.show_success(f"Report written to {args.report}")
+
+    failed = [repo['repo'] for repo in results['repos'] if repo['error']]
+    if failed:
+        tui.show_error(f"{len(failed)} repositories could not be reviewed.")
+        return 1
+    if args.block_on_issues and results['blocked']:
+        tui.show_error("Code quality issues found.")
+        return 1
+    return 0
+
+
+def run(app: CodeReviewApp, args: argparse.Namespace):
+    """Dispatch to the mode selected on the command line.
+
+    Args:
+        app: The application
+        args: Parsed command-line arguments
+    """
+    if args.push_cache:
+        app.run_push_cache()
+    elif args.merge_audit:
+        app.run_audit_merge(args.audit_dir)
+    elif args.audit:
+        app.run_audit(args.shard, args.audit_dir)
+    elif args.watch:
+        app.run_watch()
+    elif args.precommit:
+        exit_code = app.run_precommit(block_on_issues=args.block_on_issues, fail_fast=args.fail_fast)
         sys.exit(exit_code)
     elif args.interactive:
         app.run_interactive()
     else:
-        app.run_quick_review(staged=args.staged)
+        app.run_quick_review(staged=args.staged, resume=args.resume)
 
 
 if __name__ == "__main__":
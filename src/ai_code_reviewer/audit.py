@@ -0,0 +1,373 @@
+"""Full-repository audit mode with deterministic sharding."""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Callable
+
+from .change import Change
+from .code_reviewer import CodeReviewer, RATING_SEVERITY
+from .git_handler import detect_language
+from .state_dir import make_state_dir
+from . import config
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a shard specification of the form ``i/N``.
+
+    Args:
+        spec: Shard spec, e.g. "0/4" (zero-based index, shard count)
+
+    Returns:
+        Tuple of (shard_index, shard_count)
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/', 1))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}'. Expected format i/N, e.g. 0/4")
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}'. Index must be in range 0..N-1")
+
+    return index, count
+
+
+def shard_for_path(filepath: str, shard_count: int) -> int:
+    """Assign a file to a shard by hashing its path.
+
+    The hash is stable across processes and machines, so every shard of
+    an audit agrees on the assignment without coordination.
+
+    Args:
+        filepath: Repository-relative file path
+        shard_count: Total number of shards
+
+    Returns:
+        Zero-based shard index
+    """
+    digest = hashlib.sha1(filepath.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+
+def chunk_content(content: str, chunk_size: int) -> List[str]:
+    """Split content into chunks on line boundaries.
+
+    Args:
+        content: Text to split
+        chunk_size: Maximum characters per chunk
+
+    Returns:
+        List of chunks (a single line longer than chunk_size is kept whole)
+    """
+    chunks = []
+    current = []
+    current_size = 0
+
+    for line in content.splitlines(keepends=True):
+        if current and current_size + len(line) > chunk_size:
+            chunks.append(''.join(current))
+            current = []
+            current_size = 0
+        current.append(line)
+        current_size += len(line)
+
+    if current:
+        chunks.append(''.join(current))
+
+    return chunks
+
+
+def prepare_file(repo_root: str, filepath: str) -> Dict[str, any]:
+    """Read, classify, hash and chunk a single file.
+
+    Runs in a worker process, so it must stay a module-level function.
+
+    Args:
+        repo_root: Absolute path of the repository working tree
+        filepath: Repository-relative file path
+
+    Returns:
+        Dict with file info, content hash and chunks, or a skip reason
+    """
+    prepared = {
+        'file': filepath,
+        'language': detect_language(filepath),
+        'hash': None,
+        'chunks': [],
+        'skipped': None
+    }
+
+    full_path = Path(repo_root) / filepath
+    try:
+        if full_path.stat().st_size > config.AUDIT_MAX_FILE_SIZE:
+            prepared['skipped'] = 'too large'
+            return prepared
+
+        raw = full_path.read_bytes()
+    except OSError as e:
+        prepared['skipped'] = f"unreadable: {e}"
+        return prepared
+
+    if b'\0' in raw[:8192]:
+        prepared['skipped'] = 'binary'
+        return prepared
+
+    prepared['hash'] = hashlib.sha256(raw).hexdigest()
+    content = raw.decode('utf-8', errors='ignore')
+
+    if not content.strip():
+        prepared['skipped'] = 'empty'
+        return prepared
+
+    prepared['chunks'] = chunk_content(content, config.AUDIT_CHUNK_SIZE)
+    return prepared
+
+
+def _prepare_file_args(args: Tuple[str, str]) -> Dict[str, any]:
+    """Unpack arguments for prepare_file (used with executor.map)."""
+    return prepare_file(*args)
+
+
+class RepoAuditor:
+    """Review every tracked file of a repository, one shard at a time."""
+
+    def __init__(self, code_reviewer: CodeReviewer, shard_index: int = 0, shard_count: int = 1,
+                 output_dir: str = config.AUDIT_OUTPUT_DIR):
+        """Initialize the auditor.
+
+        Args:
+            code_reviewer: Reviewer used for model calls and summaries
+            shard_index: Zero-based index of the shard to audit
+            shard_count: Total number of shards
+            output_dir: Directory for checkpoints and reports (relative to repo root)
+        """
+        self.code_reviewer = code_reviewer
+        self.git_handler = code_reviewer.git_handler
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.output_dir = Path(self.git_handler.repo_root) / output_dir
+
+    @property
+    def shard_name(self) -> str:
+        """Base name used for this shard's output files."""
+        return f"shard-{self.shard_index}-of-{self.shard_count}"
+
+    @property
+    def checkpoint_path(self) -> Path:
+        """Append-only JSON Lines file with completed file reviews."""
+        return self.output_dir / f"{self.shard_name}.jsonl"
+
+    @property
+    def report_path(self) -> Path:
+        """Final JSON report for this shard."""
+        return self.output_dir / f"{self.shard_name}.json"
+
+    def select_files(self) -> List[str]:
+        """Get the tracked files that belong to this shard.
+
+        Returns:
+            Sorted list of repository-relative paths
+        """
+        return sorted(
+            filepath for filepath in self.git_handler.get_tracked_files()
+            if shard_for_path(filepath, self.shard_count) == self.shard_index
+        )
+
+    def prepare(self, files: List[str]) -> List[Dict[str, any]]:
+        """Run CPU-bound preprocessing for files in a process pool.
+
+        Args:
+            files: Repository-relative paths
+
+        Returns:
+            List of prepared file dicts (see prepare_file)
+        """
+        if not files:
+            return []
+
+        repo_root = self.git_handler.repo_root
+        with ProcessPoolExecutor(max_workers=config.AUDIT_PREPROCESS_WORKERS) as executor:
+            return list(executor.map(
+                _prepare_file_args,
+                [(repo_root, filepath) for filepath in files],
+                chunksize=64
+            ))
+
+    def load_checkpoint(self) -> Dict[str, Dict[str, any]]:
+        """Load completed reviews from this shard's checkpoint.
+
+        Returns:
+            Dict mapping file path to its review record
+        """
+        return _read_journal(self.checkpoint_path)
+
+    def run(self, progress_callback: Optional[Callable[[Dict[str, any]], None]] = None) -> Dict[str, any]:
+        """Audit this shard, resuming from the checkpoint if present.
+
+        Files whose content hash matches the checkpoint are not reviewed again.
+
+        Args:
+            progress_callback: Called with each review record as it completes
+
+        Returns:
+            Summary dict for the shard (see CodeReviewer.get_summary)
+        """
+        make_state_dir(self.output_dir)
+
+        done = self.load_checkpoint()
+        prepared = self.prepare(self.select_files())
+
+        pending = []
+        for item in prepared:
+            previous = done.get(item['file'])
+            if previous and previous.get('hash') == item['hash']:
+                continue
+            pending.append(item)
+
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as journal:
+            with ThreadPoolExecutor(max_workers=config.REVIEW_CONCURRENCY_MAX) as executor:
+                futures = [executor.submit(self._review_prepared, item) for item in pending]
+
+                for future in as_completed(futures):
+                    record = future.result()
+                    journal.write(json.dumps(record) + '\n')
+                    journal.flush()
+                    done[record['file']] = record
+
+                    if progress_callback:
+                        progress_callback(record)
+
+        reviews = [done[item['file']] for item in prepared if item['file'] in done]
+        summary = self.code_reviewer.get_summary(reviews)
+        # Lets merge_audit_reports pick the shards of one audit
+        summary['shard'] = f"{self.shard_index}/{self.shard_count}"
+        summary['shard_index'] = self.shard_index
+        summary['shard_count'] = self.shard_count
+
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        return summary
+
+    def _review_prepared(self, item: Dict[str, any]) -> Dict[str, any]:
+        """Review all chunks of a prepared file.
+
+        Args:
+            item: Prepared file dict
+
+        Returns:
+            Review record with the most severe chunk rating
+        """
+        record = {
+            'file': item['file'],
+            'type': 'audit',
+            'language': item['language'],
+            'hash': item['hash'],
+            'skipped': item['skipped'],
+            'error': False
+        }
+
+        if item['skipped']:
+            record['review'] = f"Skipped: {item['skipped']}"
+            record['rating'] = 'SKIPPED'
+            return record
+
+        chunks = item['chunks']
+        texts = []
+        rating = 'EXCELLENT'
+        for i, chunk in enumerate(chunks, 1):
+            label = item['file'] if len(chunks) == 1 else f"{item['file']} (part {i}/{len(chunks)})"
+            try:
+                result = self.code_reviewer.review_change(Change.from_text(label, 'audit', item['language'], chunk))
+            except Exception as e:
+                result = {'review': f"Error during review: {str(e)}", 'rating': 'ERROR', 'error': True}
+
+            texts.append(result['review'])
+            record['error'] = record['error'] or result.get('error', False)
+            if RATING_SEVERITY.get(result['rating'], 0) > RATING_SEVERITY.get(rating, 0):
+                rating = result['rating']
+
+        record['review'] = '\n\n'.join(texts)
+        record['rating'] = rating
+        record['chunks'] = len(chunks)
+        return record
+
+
+def _read_journal(path: Path) -> Dict[str, Dict[str, any]]:
+    """Read a JSON Lines review journal, keeping the last record per file.
+
+    Args:
+        path: Journal file
+
+    Returns:
+        Dict mapping file path to review record
+    """
+    records = {}
+    if not path.exists():
+        return records
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Partial line from an interrupted run
+                continue
+            records[record['file']] = record
+
+    return records
+
+
+def merge_audit_reports(code_reviewer: CodeReviewer, output_dir: str) -> Dict[str, any]:
+    """Merge the reports of one audit's shards into one report.
+
+    Only finished shards count: each shard's report lists exactly the
+    files the shard held when it ran, unlike its checkpoint, which keeps
+    records of files deleted since. The directory may also hold reports
+    of an earlier audit with a different shard count; the shard count of
+    the most recently written report decides which set is merged.
+
+    Args:
+        code_reviewer: Reviewer used to compute the summary
+        output_dir: Directory containing shard-<i>-of-<N>.json reports
+
+    Returns:
+        Summary dict covering every merged shard, with 'shards' (merged report
+        names), 'missing_shards' (shards of the set without a report) and
+        'ignored_shards' (reports of other shard counts)
+    """
+    directory = Path(output_dir)
+    reports = []
+    for path in directory.glob('shard-*-of-*.json'):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            reports.append((path.stat().st_mtime, path.stem, report))
+        except (OSError, ValueError):
+            continue
+    # Reports written before shard counts were recorded cannot be matched to a set
+    reports = [entry for entry in reports if 'shard_count' in entry[2]]
+
+    shard_count = max(reports, key=lambda entry: entry[0])[2]['shard_count'] if reports else 0
+    chosen = {
+        report['shard_index']: (name, report)
+        for _, name, report in sorted(reports, key=lambda entry: entry[1])
+        if report['shard_count'] == shard_count
+    }
+
+    reviews = [review for index in sorted(chosen) for review in chosen[index][1].get('reviews', [])]
+    reviews.sort(key=lambda review: review['file'])
+    summary = code_reviewer.get_summary(reviews)
+    summary['shard_count'] = shard_count
+    summary['shards'] = [chosen[index][0] for index in sorted(chosen)]
+    summary['missing_shards'] = [f"{index}/{shard_count}" for index in range(shard_count) if index not in chosen]
+    summary['ignored_shards'] = sorted(name for _, name, report in reports if report['shard_count'] != shard_count)
+
+    with open(directory / 'report.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
@@ -0,0 +1,188 @@
+"""Caches of finished reviews, keyed by file content: on disk and shared over HTTP."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import httpx
+
+from . import config
+from .state_dir import make_state_dir
+
+
+# Cache keys are SHA-256 hex digests
+KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ReviewCache:
+    """Store reviews so identical content is never reviewed twice.
+
+    Entries are keyed by the file path and the git blob ids of its old
+    and new content, salted with everything else that shapes a review
+    (models, prompts). Writes are atomic, so several processes (e.g. a
+    watcher and a pre-commit hook) can share one cache directory.
+    """
+
+    def __init__(self, directory: Path, salt: str = ''):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (created on first write)
+            salt: Review settings; changing it invalidates every entry
+        """
+        self.directory = Path(directory)
+        self.salt = hashlib.sha256(salt.encode('utf-8')).hexdigest()
+
+    def key(self, filepath: str, base_id: Optional[str], new_id: str) -> str:
+        """Build the cache key for a change.
+
+        Args:
+            filepath: Path relative to the repo root
+            base_id: Blob id of the committed version (None for new files)
+            new_id: Blob id of the changed version
+
+        Returns:
+            Hex digest identifying the review
+        """
+        material = '\0'.join([self.salt, filepath, base_id or '-', new_id])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Get the file holding an entry."""
+        return self.directory / key[:2] / f"{key}.json"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[Dict[str, any]]:
+        """Look up a review.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The stored review dict, or None on a miss
+        """
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, review: Dict[str, any]):
+        """Store a review.
+
+        Args:
+            key: Cache key
+            review: Review result dict (must be JSON serializable)
+        """
+        path = self._path(key)
+        try:
+            make_state_dir(path.parent)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(review, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A cache that cannot be written must never fail a review
+            pass
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, any]]]:
+        """Iterate over every stored review.
+
+        Yields:
+            Tuples of (key, review dict)
+        """
+        for path in self.directory.glob('*/*.json'):
+            review = self.get(path.stem)
+            if review is not None:
+                yield path.stem, review
+
+
+class RemoteReviewCache:
+    """Client for a team-shared review cache (see cache_server).
+
+    Lookups for a whole changeset are one request. A failed lookup turns
+    the remote tier off for the rest of the run, and a rejected store
+    turns off storing, so an unreachable server costs at most one timeout.
+    """
+
+    def __init__(self, url: str = config.REMOTE_CACHE_URL, token: Optional[str] = config.REMOTE_CACHE_TOKEN,
+                 timeout: float = config.REMOTE_CACHE_TIMEOUT):
+        """Initialize the client.
+
+        Args:
+            url: Base URL of the cache service
+            token: Bearer token for storing reviews (lookups need none)
+            timeout: Seconds per request
+        """
+        self.url = url.rstrip('/')
+        self.available = True
+        self.writable = True
+        headers = {'Authorization': f"Bearer {token}"} if token else {}
+        self._client = httpx.Client(timeout=timeout, headers=headers)
+
+    def _post(self, path: str, payload: Dict[str, any]) -> Dict[str, any]:
+        """Send a JSON request.
+
+        Raises:
+            httpx.HTTPError: If the request fails or the server rejects it
+            ValueError: If the response is not JSON
+        """
+        response = self._client.post(self.url + path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, any]]:
+        """Look up several reviews in one round-trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict mapping each key found to its review
+        """
+        keys = sorted({key for key in keys if key})
+        hits = {}
+        for start in range(0, len(keys), config.REMOTE_CACHE_BATCH):
+            if not self.available:
+                break
+            try:
+                answer = self._post('/lookup', {'keys': keys[start:start + config.REMOTE_CACHE_BATCH]})
+            except (httpx.HTTPError, ValueError):
+                self.available = False
+                break
+            hits.update({
+                key: review for key, review in answer.get('hits', {}).items()
+                if KEY_PATTERN.match(key) and isinstance(review, dict)
+            })
+        return hits
+
+    def put_many(self, entries: Dict[str, Dict[str, any]]) -> int:
+        """Store reviews; needs a token unless the server accepts anonymous writes.
+
+        Args:
+            entries: Dict mapping cache key to review
+
+        Returns:
+            Number of reviews the server stored
+        """
+        stored = 0
+        keys = sorted(entries)
+        for start in range(0, len(keys), config.REMOTE_CACHE_BATCH):
+            if not (self.available and self.writable):
+                break
+            batch = {key: entries[key] for key in keys[start:start + config.REMOTE_CACHE_BATCH]}
+            try:
+                stored += self._post('/store', {'entries': batch}).get('stored', 0)
+            except (httpx.HTTPError, ValueError):
+                self.writable = False
+        return stored
+
+    def close(self):
+        """Close the HTTP connection."""
+        self._client.close()
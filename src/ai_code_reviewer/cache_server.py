@@ -0,0 +1,175 @@
+"""Small HTTP service sharing finished reviews across a team (--serve-cache)."""
+
+import hmac
+import ipaddress
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .cache import KEY_PATTERN, ReviewCache
+from . import config
+
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024  # Largest request body accepted
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints of the cache service.
+
+    POST /lookup  {"keys": [...]}             -> {"hits": {key: review}}
+    POST /store   {"entries": {key: review}}  -> {"stored": n}
+    GET  /health                              -> {"status": "ok", "entries": n}
+    """
+
+    server: 'ReviewCacheServer'
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so a client pays the connection cost once
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._reply(404, {'error': 'not found'})
+            return
+        entries = sum(1 for _ in self.server.cache.directory.glob('*/*.json'))
+        self._reply(200, {'status': 'ok', 'entries': entries})
+
+    def do_POST(self):
+        payload = self._read_json()
+        if payload is None:
+            return
+
+        if self.path == '/lookup':
+            keys = payload.get('keys', [])
+            if not isinstance(keys, list) or len(keys) > config.REMOTE_CACHE_BATCH:
+                self._reply(400, {'error': f"'keys' must be a list of at most {config.REMOTE_CACHE_BATCH}"})
+                return
+            hits = {}
+            for key in keys:
+                if isinstance(key, str) and KEY_PATTERN.match(key):
+                    review = self.server.cache.get(key)
+                    if review is not None:
+                        hits[key] = review
+            self._reply(200, {'hits': hits})
+        elif self.path == '/store':
+            if not self._authorized():
+                self._reply(401, {'error': 'a valid bearer token is required to store reviews'})
+                return
+            entries = payload.get('entries', {})
+            if not isinstance(entries, dict):
+                self._reply(400, {'error': "'entries' must be an object"})
+                return
+            stored = 0
+            for key, review in entries.items():
+                if KEY_PATTERN.match(key) and isinstance(review, dict):
+                    self.server.cache.put(key, review)
+                    stored += 1
+            self._reply(200, {'stored': stored})
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def _authorized(self) -> bool:
+        """Check the bearer token of a write request."""
+        if not self.server.token:
+            return True
+        header = self.headers.get('Authorization', '')
+        return hmac.compare_digest(header, f"Bearer {self.server.token}")
+
+    def _read_json(self) -> Optional[Dict[str, any]]:
+        """Read the JSON request body, replying with an error if it is unusable."""
+        try:
+            length = int(self.headers.get('Content-Length', '0'))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_REQUEST_BYTES:
+            self._reply(413, {'error': 'request body missing or too large'})
+            return None
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._reply(400, {'error': 'invalid JSON'})
+            return None
+        if not isinstance(payload, dict):
+            self._reply(400, {'error': 'expected a JSON object'})
+            return None
+        return payload
+
+    def _reply(self, status: int, body: Dict[str, any]):
+        """Send a JSON response."""
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ReviewCacheServer(ThreadingHTTPServer):
+    """Threaded HTTP server over an on-disk ReviewCache.
+
+    Entries are written atomically, so several server processes (or a
+    local reviewer) can share one directory. Clients trust every review
+    the server returns, so anonymous writes are only accepted on a
+    loopback address.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], directory: Path, token: Optional[str] = None,
+                 verbose: bool = False):
+        """Bind the server.
+
+        Args:
+            address: (host, port) to listen on
+            directory: Directory holding the entries
+            token: Bearer token required by /store (None allows anonymous writes, loopback only)
+            verbose: Log every request to stderr
+
+        Raises:
+            ValueError: If no token is given for an address reachable from other machines
+        """
+        if token is None and not is_loopback(address[0]):
+            raise ValueError(f"Refusing to serve on {address[0]} without a token: anyone on the network could "
+                             f"store reviews. Set AI_REVIEW_REMOTE_CACHE_TOKEN or bind to 127.0.0.1.")
+        self.cache = ReviewCache(directory)
+        self.token = token
+        self.verbose = verbose
+        super().__init__(address, CacheRequestHandler)
+
+
+def is_loopback(host: str) -> bool:
+    """Check whether a listen host is only reachable from this machine.
+
+    Args:
+        host: Host name or IP address
+
+    Returns:
+        True for localhost and loopback addresses; other host names count as reachable
+    """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host.strip('[]')).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_bind(bind: str) -> Tuple[str, int]:
+    """Parse a "host:port" listen address.
+
+    Args:
+        bind: Address such as "0.0.0.0:8765" or ":8765"
+
+    Returns:
+        Tuple of (host, port)
+
+    Raises:
+        ValueError: If the address is malformed
+    """
+    host, _, port = bind.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid address '{bind}': expected host:port")
+    return host or '0.0.0.0', int(port)
@@ -0,0 +1,88 @@
+"""Cooperative cancellation for in-flight reviews."""
+
+import threading
+from typing import Callable, Optional
+
+
+class CancelledError(Exception):
+    """Raised when work is stopped through a CancellationToken."""
+
+
+class CancellationToken:
+    """Thread-safe flag shared by everything working on one review run.
+
+    Workers poll the token between units of work; resources that block
+    (HTTP streams, connections) register callbacks that release them as
+    soon as the token is cancelled.
+    """
+
+    def __init__(self):
+        """Initialize an uncancelled token."""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the token and run every registered callback once."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Cancellation must never fail half-way
+                pass
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback to run on cancellation.
+
+        Runs the callback immediately if the token is already cancelled.
+
+        Args:
+            callback: Function without arguments
+
+        Returns:
+            The callback, for use with remove_callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return callback
+
+        callback()
+        return callback
+
+    def remove_callback(self, callback: Callable[[], None]):
+        """Unregister a callback that is no longer needed.
+
+        Args:
+            callback: Callback passed to add_callback
+        """
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        """Raise CancelledError if the token has been cancelled."""
+        if self._event.is_set():
+            raise CancelledError("Review cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the token is cancelled or the timeout expires.
+
+        Args:
+            timeout: Seconds to wait (None waits forever)
+
+        Returns:
+            True if the token is cancelled
+        """
+        return self._event.wait(timeout)
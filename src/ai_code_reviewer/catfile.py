@@ -0,0 +1,254 @@
+"""Long-lived ``git cat-file`` sessions for reading objects without a process per blob."""
+
+import re
+import subprocess
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from . import config
+
+
+# Full object id (SHA-1 or SHA-256)
+_OBJECT_ID = re.compile(r'^(?:[0-9a-f]{40}|[0-9a-f]{64})$')
+
+
+class ObjectInfo:
+    """Header of an object as reported by cat-file."""
+
+    __slots__ = ('id', 'type', 'size')
+
+    def __init__(self, object_id: str, object_type: str, size: int):
+        self.id = object_id
+        self.type = object_type
+        self.size = size
+
+
+class _BatchProcess:
+    """One ``git cat-file --batch`` or ``--batch-check`` process.
+
+    Requests from any thread are written under a lock and answered in
+    order by a reader thread, so several callers can have requests in
+    flight at once without waiting for each other's replies.
+    """
+
+    def __init__(self, repo_root: str, contents: bool):
+        """Start the process.
+
+        Args:
+            repo_root: Repository to read from
+            contents: Use --batch (header and contents) instead of --batch-check (header only)
+        """
+        self.contents = contents
+        self.process = subprocess.Popen(
+            ['git', 'cat-file', '--batch' if contents else '--batch-check'],
+            cwd=repo_root, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self._write_lock = threading.Lock()
+        self._pending = deque()
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name='git-cat-file', daemon=True)
+        self._reader.start()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process still accepts requests."""
+        return not self._closed and self.process.poll() is None
+
+    def request(self, specs: List[str]) -> List[Future]:
+        """Send object names in one write.
+
+        Args:
+            specs: Object names (ids, "rev:path" or ":path")
+
+        Returns:
+            One future per name, resolved to (ObjectInfo, contents) or None if missing
+        """
+        futures = [Future() for _ in specs]
+        payload = b''.join(spec.encode('utf-8') + b'\n' for spec in specs)
+        with self._write_lock:
+            if not self.alive:
+                raise OSError("git cat-file session is closed")
+            self._pending.extend(futures)
+            try:
+                self.process.stdin.write(payload)
+                self.process.stdin.flush()
+            except OSError:
+                self._closed = True
+                raise
+        return futures
+
+    def _read_loop(self):
+        """Resolve pending requests from the process output, in order."""
+        stdout = self.process.stdout
+        future = None
+        try:
+            while True:
+                header = stdout.readline()
+                if not header:
+                    break
+                future = self._pending.popleft()
+
+                # "<id> <type> <size>", or "<name> missing" / "<name> ambiguous"
+                fields = header.rstrip(b'\n').rsplit(b' ', 2)
+                if len(fields) != 3 or not fields[2].isdigit():
+                    future.set_result(None)
+                    continue
+
+                info = ObjectInfo(fields[0].decode('ascii'), fields[1].decode('ascii'), int(fields[2]))
+                data = None
+                if self.contents:
+                    data = stdout.read(info.size)
+                    stdout.read(1)  # Trailing newline
+                future.set_result((info, data))
+        except Exception as e:
+            if future is not None and not future.done():
+                future.set_exception(e)
+        finally:
+            with self._write_lock:
+                self._closed = True
+                while self._pending:
+                    self._pending.popleft().set_exception(OSError("git cat-file session ended"))
+
+    def close(self):
+        """Stop the process and fail any unanswered requests."""
+        with self._write_lock:
+            self._closed = True
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self._reader.join(timeout=5)
+
+
+class CatFileSession:
+    """Blob reader backed by persistent cat-file processes and a small LRU.
+
+    Names like "HEAD:path" or ":path" are first resolved to an object id
+    through --batch-check, which only returns headers. Contents are then
+    served from the LRU, which is keyed by object id and therefore never
+    stale, or read through --batch. Both processes start on first use and
+    are restarted if they die.
+
+    git reads the index once per process, so ":path" names answer with
+    what was staged when the session started; callers that need the
+    current index resolve those names themselves.
+    """
+
+    def __init__(self, repo_root: str, cache_bytes: int = config.CATFILE_CACHE_BYTES):
+        """Initialize the session.
+
+        Args:
+            repo_root: Repository to read from
+            cache_bytes: Total size of object contents kept in the LRU
+        """
+        self.repo_root = repo_root
+        self.cache_bytes = cache_bytes
+        self._lock = threading.Lock()
+        self._processes = {}
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+
+    def _process(self, contents: bool) -> _BatchProcess:
+        """Get the running --batch or --batch-check process, starting it if needed."""
+        with self._lock:
+            process = self._processes.get(contents)
+            if process is None or not process.alive:
+                process = _BatchProcess(self.repo_root, contents)
+                self._processes[contents] = process
+            return process
+
+    def info_many(self, specs: List[str]) -> List[Optional[ObjectInfo]]:
+        """Look up object headers.
+
+        Args:
+            specs: Object names (ids, "rev:path" or ":path"; no newlines); empty names are missing
+
+        Returns:
+            ObjectInfo per name, or None where the object does not exist
+        """
+        valid = [spec for spec in specs if spec and '\n' not in spec]
+        futures = iter(self._process(contents=False).request(valid)) if valid else iter(())
+        results = []
+        for spec in specs:
+            if not spec or '\n' in spec:
+                results.append(None)
+                continue
+            answer = next(futures).result()
+            results.append(answer[0] if answer else None)
+        return results
+
+    def read_many(self, specs: List[str]) -> List[Optional[Tuple[ObjectInfo, bytes]]]:
+        """Read objects, pipelining every request of the call.
+
+        Args:
+            specs: Object names (ids, "rev:path" or ":path"; no newlines)
+
+        Returns:
+            (ObjectInfo, contents) per name, or None where the object does not exist
+        """
+        ids = [spec if _OBJECT_ID.match(spec) else None for spec in specs]
+        to_resolve = [i for i, object_id in enumerate(ids) if object_id is None]
+        if to_resolve:
+            for i, info in zip(to_resolve, self.info_many([specs[i] for i in to_resolve])):
+                ids[i] = info.id if info else None
+
+        results = [None] * len(specs)
+        missing = []
+        for i, object_id in enumerate(ids):
+            if object_id is None:
+                continue
+            hit = self._cache_get(object_id)
+            if hit is not None:
+                results[i] = hit
+            else:
+                missing.append(i)
+
+        if missing:
+            futures = self._process(contents=True).request([ids[i] for i in missing])
+            for i, future in zip(missing, futures):
+                answer = future.result()
+                if answer:
+                    self._cache_put(answer)
+                results[i] = answer
+        return results
+
+    def read(self, spec: str) -> Optional[Tuple[ObjectInfo, bytes]]:
+        """Read one object (see read_many)."""
+        return self.read_many([spec])[0]
+
+    def _cache_get(self, object_id: str) -> Optional[Tuple[ObjectInfo, bytes]]:
+        """Get an object from the LRU, marking it recently used."""
+        with self._lock:
+            entry = self._cache.get(object_id)
+            if entry is not None:
+                self._cache.move_to_end(object_id)
+            return entry
+
+    def _cache_put(self, entry: Tuple[ObjectInfo, bytes]):
+        """Add an object to the LRU, evicting the least recently used ones."""
+        info, data = entry
+        # Large objects would flush everything else
+        if info.size > self.cache_bytes // 4:
+            return
+        with self._lock:
+            if info.id in self._cache:
+                return
+            self._cache[info.id] = entry
+            self._cached_bytes += info.size
+            while self._cached_bytes > self.cache_bytes:
+                _, (evicted, _) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted.size
+
+    def close(self):
+        """Stop the cat-file processes."""
+        with self._lock:
+            processes = list(self._processes.values())
+            self._processes.clear()
+        for process in processes:
+            process.close()
@@ -0,0 +1,118 @@
+"""Compact, lazily-loaded representation of one changed file."""
+
+from typing import Callable, Optional, Tuple
+
+from .preprocess import is_unified_diff
+
+
+def count_changed_lines(text: str) -> Tuple[int, int]:
+    """Count added and removed lines without splitting the text.
+
+    Full file content (e.g. an untracked file) counts as all added.
+
+    Args:
+        text: Unified diff or full file content
+
+    Returns:
+        Tuple of (additions, deletions)
+    """
+    if is_unified_diff(text):
+        additions = text.count('\n+') - text.count('\n+++ ')
+        deletions = text.count('\n-') - text.count('\n--- ')
+        return additions, deletions
+
+    lines = text.count('\n')
+    if text and not text.endswith('\n'):
+        lines += 1
+    return lines, 0
+
+
+class Change:
+    """A changed file waiting for review.
+
+    Stats are known up front; the diff body is only read from git or disk
+    when something accesses ``diff`` and can be dropped again with
+    ``release()``, so holding thousands of changes stays cheap.
+    """
+
+    __slots__ = ('file', 'type', 'language', 'additions', 'deletions', 'size', 'truncated', 'cache_key',
+                 'content_key', '_diff', '_loader')
+
+    def __init__(self, file: str, change_type: str, language: str,
+                 loader: Optional[Callable[[], Tuple[str, bool]]] = None, diff: Optional[str] = None,
+                 additions: int = 0, deletions: int = 0, truncated: bool = False):
+        """Initialize a change.
+
+        Args:
+            file: Path relative to the repo root
+            change_type: Type of change (modified, staged, untracked, audit)
+            language: Programming language
+            loader: Function returning (diff, truncated); called on first access
+            diff: Diff already in memory (kept until garbage collected)
+            additions: Number of added lines
+            deletions: Number of removed lines
+            truncated: Whether the diff was cut off at the read cap
+        """
+        self.file = file
+        self.type = change_type
+        self.language = language
+        self.additions = additions
+        self.deletions = deletions
+        self.size = len(diff) if diff is not None else None
+        self.truncated = truncated
+        self.cache_key = None
+        self.content_key = None  # "<HEAD blob id>:<changed blob id>", set when a run journal needs it
+        self._diff = diff
+        self._loader = loader
+
+    @classmethod
+    def from_text(cls, file: str, change_type: str, language: str, text: str) -> 'Change':
+        """Create a change from a diff or content that is already in memory.
+
+        Args:
+            file: Path or label of the change
+            change_type: Type of change
+            language: Programming language
+            text: Diff or full content
+
+        Returns:
+            Change with stats computed from the text
+        """
+        additions, deletions = count_changed_lines(text)
+        return cls(file, change_type, language, diff=text, additions=additions, deletions=deletions)
+
+    @property
+    def diff(self) -> str:
+        """The diff or content, loaded on first access."""
+        if self._diff is None:
+            if self._loader:
+                self._diff, truncated = self._loader()
+                self.truncated = self.truncated or truncated
+            else:
+                self._diff = ''
+            self.size = len(self._diff)
+        return self._diff
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the diff body is currently held in memory."""
+        return self._diff is not None
+
+    @property
+    def lines(self) -> int:
+        """Number of changed lines."""
+        return self.additions + self.deletions
+
+    @property
+    def tokens_raw(self) -> int:
+        """Estimated model tokens of the full diff (loads it if its size is unknown)."""
+        size = self.size if self.size is not None else len(self.diff)
+        return (size + 3) // 4  # Same heuristic as estimate_tokens
+
+    def release(self):
+        """Drop the diff body; it is loaded again if accessed later."""
+        if self._loader is not None:
+            self._diff = None
+
+    def __repr__(self) -> str:
+        return f"Change({self.file!r}, {self.type!r}, +{self.additions} -{self.deletions})"
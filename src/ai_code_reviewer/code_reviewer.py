@@ -1,33 +1,155 @@
 """Core code review logic."""
 
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Dict, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from .cache import RemoteReviewCache, ReviewCache
+from .cancellation import CancellationToken, CancelledError
+from .change import Change
+from .dedup import DiffClusterer, normalize_diff
 from .git_handler import GitHandler
-from .ollama_client import OllamaClient
+from .journal import ReviewJournal
+from .ollama_client import Conversation, OllamaClient
+from .pipeline import Prefetcher
+from .preprocess import DiffPreprocessor, estimate_tokens
+from .semantic import SemanticIndex, SemanticMatch
+from .summary import SummaryAggregator
+from .triage import Triage, TIER_SKIP, TIER_CHEAP, TIER_FULL
 from . import config
 
 
+# Ordering used when several verdicts have to be combined into one
+RATING_SEVERITY = {
+    'SKIPPED': 0,
+    'EXCELLENT': 1,
+    'GOOD': 2,
+    'UNKNOWN': 3,
+    'FAIR': 3,
+    'NEEDS_WORK': 4,
+    'ERROR': 5
+}
+
+# Where the new content of each change type lives, for content-keyed caching
+_CACHE_SOURCES = {
+    'staged': 'index',
+    'modified': 'worktree',
+    'untracked': 'worktree'
+}
+
+
+class ReviewStream:
+    """Streaming reviews of several changes, started before the user confirms them.
+
+    Reviews run one after another on a background thread and their
+    output is buffered until iterated. Until confirm() is called, only
+    the first `speculative` changes are reviewed; cancel() aborts the
+    work and drops the buffer.
+    """
+
+    def __init__(self, code_reviewer: 'CodeReviewer', changes: List[Change],
+                 speculative: int = config.SPECULATIVE_REVIEWS):
+        """Start reviewing.
+
+        Args:
+            code_reviewer: Reviewer to run
+            changes: Changes to review, in display order
+            speculative: Number of changes reviewed before confirmation
+        """
+        self.cancel_token = CancellationToken()
+        self._confirmed = threading.Event()
+        self._abort = self.cancel_token.add_callback(code_reviewer.ollama_client.abort_inflight)
+        self._output = Prefetcher(self._produce(code_reviewer, changes, speculative), maxsize=0)
+
+    def _produce(self, code_reviewer: 'CodeReviewer', changes: List[Change], speculative: int):
+        """Review the changes in order, holding back unconfirmed ones (background thread)."""
+        for i, change in enumerate(changes):
+            while i >= speculative and not self._confirmed.wait(0.1):
+                self.cancel_token.raise_if_cancelled()
+            for chunk, is_complete, review in code_reviewer.review_single_file_streaming(
+                    change, cancel_token=self.cancel_token):
+                yield change, chunk, is_complete, review
+
+    def confirm(self):
+        """Let the reviews continue past the speculative ones."""
+        self._confirmed.set()
+
+    def cancel(self):
+        """Abort in-flight reviews and stop the rest."""
+        self.cancel_token.cancel()
+        self._output.close()
+        self.cancel_token.remove_callback(self._abort)
+
+    def __iter__(self) -> Iterator[Tuple[Change, str, bool, Optional[Dict[str, any]]]]:
+        """Yield (change, chunk_text, is_complete, review_dict) tuples, buffered ones first."""
+        try:
+            yield from self._output
+        finally:
+            self.cancel_token.remove_callback(self._abort)
+
+
 class CodeReviewer:
     """Main code reviewer orchestrator."""
 
-    def __init__(self, git_handler: GitHandler, ollama_client: OllamaClient):
+    def __init__(self, git_handler: GitHandler, ollama_client: OllamaClient,
+                 cache_root: Optional[Path] = None, shared: Optional['CodeReviewer'] = None):
         """Initialize code reviewer.
 
         Args:
             git_handler: Git operations handler
             ollama_client: Ollama AI client
+            cache_root: Directory holding the review cache and semantic index (default: repo root)
+            shared: Reviewer whose cache, semantic index and remote cache this one uses
+                (multi-repository runs; must share the client)
         """
         self.git_handler = git_handler
         self.ollama_client = ollama_client
+        self.preprocessor = DiffPreprocessor()
+        self.triage = Triage(git_handler)
+        self.keep_conversations = False  # Set by interactive mode, which offers follow-up questions
+        self.conversations: Dict[str, Conversation] = {}
+        if shared is not None:
+            self.cache = shared.cache
+            self.semantic_index = shared.semantic_index
+            self.remote_cache = shared.remote_cache
+            return
+
+        cache_root = Path(cache_root or git_handler.repo_root)
+        settings = [*ollama_client.models, config.SYSTEM_PROMPT, config.REVIEW_PROMPT_TEMPLATE,
+                    str(config.REVIEW_NUM_PREDICT), str(config.PREPROCESS_ENABLED)]
+        if config.REVIEW_FANOUT:
+            settings += [config.ASPECT_PROMPT_TEMPLATE, str(config.ASPECT_NUM_PREDICT), *config.REVIEW_ASPECTS]
+        self.cache = None
+        if config.CACHE_ENABLED:
+            self.cache = ReviewCache(cache_root / config.CACHE_DIR, salt='\0'.join(settings))
+        self.semantic_index = None
+        if config.SEMANTIC_ENABLED:
+            # One index per review settings, like the cache salt
+            salt = '\0'.join([*settings, config.SEMANTIC_EMBED_MODEL, config.ADAPT_PROMPT_TEMPLATE])
+            name = hashlib.sha256(salt.encode('utf-8')).hexdigest()[:16]
+            self.semantic_index = SemanticIndex(cache_root / config.SEMANTIC_DIR / f"{name}.jsonl")
+        self.remote_cache = None
+        if self.cache is not None and config.REMOTE_CACHE_URL:
+            self.remote_cache = RemoteReviewCache()
 
-    def review_changes(self, staged: bool = False) -> List[Dict[str, any]]:
+    def review_changes(self, staged: bool = False, cancel_token: Optional[CancellationToken] = None,
+                       journal: Optional[ReviewJournal] = None) -> List[Dict[str, any]]:
         """Review all changes (staged or unstaged).
 
+        With a journal, every review is recorded as soon as it finishes.
+        Files the journal already holds a successful review of (for the
+        same content) are not reviewed again, so an interrupted run can be
+        resumed with the same journal.
+
         Args:
             staged: Whether to review staged changes (True) or unstaged (False)
+            cancel_token: Token that stops the run and drains in-flight reviews
+            journal: Journal of the run
 
         Returns:
-            List of review results
+            List of review results (with a journal, every file of the run so far)
         """
         if staged:
             changes = self.git_handler.get_staged_changes()
@@ -37,88 +159,735 @@ class CodeReviewer:
         if not changes:
             return []
 
-        reviews = []
+        clusters = self.plan_reviews(changes, content_keys=journal is not None)
+        if journal is not None:
+            done = journal.completed()
+            clusters = [
+                cluster for cluster in clusters
+                if any(change.file not in done or done[change.file] != change.content_key for change in cluster)
+            ]
+        representatives = [cluster[0] for cluster in clusters]
 
-        # Review files in batches
-        for i in range(0, len(changes), config.REVIEW_BATCH_SIZE):
-            batch = changes[i:i + config.REVIEW_BATCH_SIZE]
-            batch_reviews = self._review_batch(batch)
-            reviews.extend(batch_reviews)
+        # One pool for every file; the client's adaptive limit decides how many reach the server at once
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        on_review = (lambda change, review: journal.append(review, change.content_key)) if journal else None
+        reviews = self._review_batch(representatives, cancel_token, on_review=on_review)
 
-        return reviews
+        results = self._fan_out(clusters, reviews)
+        if journal is None:
+            return results
+
+        keys = {change.file: change.content_key for cluster in clusters for change in cluster[1:]}
+        for review in results:
+            if review['file'] in keys:
+                journal.append(review, keys[review['file']])
+        return list(journal.reviews())
+
+    def plan_reviews(self, changes: List[Change], content_keys: bool = False) -> List[List[Change]]:
+        """Prepare changes for review: cache keys, shared-cache prefetch and deduplication.
+
+        Args:
+            changes: Changes to review
+            content_keys: Also set each change's content_key (see assign_cache_keys)
+
+        Returns:
+            Clusters of changes with identical diffs, representative first
+        """
+        self.assign_cache_keys(changes, content_keys)
+        self.fetch_shared_reviews(change.cache_key for change in changes)
+
+        if config.DEDUP_ENABLED:
+            return DiffClusterer().cluster(changes)
+        return [[change] for change in changes]
+
+    def _fan_out(self, clusters: List[List[Change]], reviews: List[Dict[str, any]]) -> List[Dict[str, any]]:
+        """Copy each representative's review to the other members of its cluster.
+
+        Args:
+            clusters: Clusters of changes, representative first
+            reviews: Reviews of the representatives
+
+        Returns:
+            Reviews for every change
+        """
+        by_file = {review['file']: review for review in reviews}
+        results = []
+
+        for cluster in clusters:
+            representative = by_file.get(cluster[0].file)
+            if representative is None:
+                continue
+
+            representative['duplicates'] = [change.file for change in cluster[1:]]
+            results.append(representative)
 
-    def _review_batch(self, changes: List[Dict[str, str]]) -> List[Dict[str, any]]:
+            for change in cluster[1:]:
+                review = dict(representative)
+                review.update({
+                    'file': change.file,
+                    'type': change.type,
+                    'language': change.language,
+                    'diff_lines': change.lines,
+                    'truncated': change.truncated,
+                    'tokens_raw': change.tokens_raw,
+                    'tokens_sent': 0,
+                    'duplicate_of': representative['file'],
+                    'duplicates': []
+                })
+                results.append(review)
+
+        return results
+
+    def _review_batch(self, changes: List[Change], cancel_token: Optional[CancellationToken] = None,
+                      on_review: Optional[Callable[[Change, Dict[str, any]], None]] = None) -> List[Dict[str, any]]:
         """Review a batch of changes in parallel.
 
+        On cancellation (or Ctrl-C) queued reviews are dropped, open HTTP
+        streams are aborted and running workers get CANCEL_DRAIN_TIMEOUT
+        seconds to finish before the error propagates.
+
         Args:
             changes: List of changes to review
+            cancel_token: Token that stops the batch
+            on_review: Called with (change, review) as each review finishes
 
         Returns:
             List of review results
         """
         reviews = []
+        cancel_token = cancel_token or CancellationToken()
+        abort = cancel_token.add_callback(self.ollama_client.abort_inflight)
 
-        with ThreadPoolExecutor(max_workers=config.REVIEW_BATCH_SIZE) as executor:
-            future_to_change = {
-                executor.submit(
-                    self._review_single_file,
-                    change['file'],
-                    change['diff'],
-                    change['language'],
-                    change['type']
-                ): change for change in changes
-            }
+        executor = ThreadPoolExecutor(max_workers=config.REVIEW_CONCURRENCY_MAX)
+        future_to_change = {}
+        try:
+            for change in changes:
+                future = executor.submit(self._review_and_release, change, cancel_token)
+                future_to_change[future] = change
 
             for future in as_completed(future_to_change):
                 change = future_to_change[future]
                 try:
                     review = future.result()
-                    reviews.append(review)
+                except CancelledError:
+                    raise
                 except Exception as e:
-                    reviews.append({
-                        'file': change['file'],
-                        'type': change['type'],
-                        'language': change['language'],
-                        'review': f"Error during review: {str(e)}",
-                        'rating': 'ERROR',
-                        'error': True
-                    })
+                    review = self.error_review(change, e)
+                reviews.append(review)
+                if on_review:
+                    on_review(change, review)
+        except BaseException:
+            cancel_token.cancel()
+            raise
+        finally:
+            cancel_token.remove_callback(abort)
+            self._shutdown_executor(executor, list(future_to_change), cancel_token)
 
         return reviews
 
-    def _review_single_file(self, filename: str, diff: str, language: str, change_type: str) -> Dict[str, any]:
+    @staticmethod
+    def error_review(change: Change, error: Exception) -> Dict[str, any]:
+        """Build the result of a review that failed.
+
+        Args:
+            change: The change that was being reviewed
+            error: What went wrong
+
+        Returns:
+            Review result dict rated ERROR
+        """
+        return {
+            'file': change.file,
+            'type': change.type,
+            'language': change.language,
+            'review': f"Error during review: {str(error)}",
+            'rating': 'ERROR',
+            'error': True
+        }
+
+    @staticmethod
+    def _shutdown_executor(executor: ThreadPoolExecutor, futures: List, cancel_token: CancellationToken):
+        """Shut down a worker pool, bounding the wait if the run was cancelled.
+
+        Args:
+            executor: The pool to shut down
+            futures: Futures submitted to the pool
+            cancel_token: Token of the run
+        """
+        if not cancel_token.cancelled:
+            executor.shutdown(wait=True)
+            return
+
+        for future in futures:
+            future.cancel()
+        wait(futures, timeout=config.CANCEL_DRAIN_TIMEOUT)
+        executor.shutdown(wait=False)
+
+    def review_change(self, change: Change,
+                      cancel_token: Optional[CancellationToken] = None) -> Dict[str, any]:
+        """Review one change outside of a run over the repository's changes.
+
+        The change may carry a diff or, for untracked and audit changes, full
+        file content (or a chunk of it), which triage then treats as content.
+
+        Args:
+            change: The change to review
+            cancel_token: Token that aborts the model call
+
+        Returns:
+            Review result dict
+        """
+        return self._review_single_file(change, cancel_token)
+
+    def _review_and_release(self, change: Change,
+                            cancel_token: Optional[CancellationToken] = None) -> Dict[str, any]:
+        """Review a change, then drop its diff from memory.
+
+        Args:
+            change: The change to review
+            cancel_token: Token that aborts the model call
+
+        Returns:
+            Review result dict
+        """
+        try:
+            return self._review_single_file(change, cancel_token)
+        finally:
+            change.release()
+
+    def _review_single_file(self, change: Change,
+                            cancel_token: Optional[CancellationToken] = None) -> Dict[str, any]:
         """Review a single file.
 
         Args:
-            filename: Name of the file
-            diff: The diff or content
-            language: Programming language
-            change_type: Type of change (modified, staged, untracked)
+            change: The change to review
+            cancel_token: Token that aborts the model call
 
         Returns:
             Review result dict
         """
-        review_text = self.ollama_client.review_code(filename, diff, language)
-        rating = self._extract_rating(review_text)
+        filename, language = change.file, change.language
+        # Tier 0 verdicts come from the content as it is now, never from the cache
+        triage = self._triage(change)
+        if triage['tier'] == TIER_SKIP:
+            return self._skipped_review(change, triage)
 
-        return {
+        cached = self._cached_review(change)
+        if cached:
+            return cached
+
+        payload, token_stats = self._prepare_payload(change.diff, language)
+        lookup = self._semantic_lookup(change)
+        if lookup and lookup[1] and lookup[1].similarity >= config.SEMANTIC_REUSE_THRESHOLD:
+            return self._reused_review(change, lookup, triage)
+
+        models = self.ollama_client.models
+        aspects = None
+        started = time.perf_counter()
+        if self._fan_out_aspects(triage):
+            results = dict(self._review_aspects(filename, payload, language, triage, cancel_token))
+            review_text, rating, level, escalated_from, aspects = self._merge_aspects(results)
+            reference = None
+        else:
+            reference = self._semantic_reference(lookup)
+            num_predict = self._num_predict(triage)
+            if reference:
+                num_predict = min(num_predict, config.SEMANTIC_ADAPT_NUM_PREDICT)
+            review_text, level, escalated_from = self._review_text(filename, payload, language, num_predict,
+                                                                   cancel_token, reference=reference)
+            rating = self._extract_rating(review_text)
+            self._remember_conversation(filename, payload, language, review_text, models[level], reference)
+        seconds = time.perf_counter() - started
+
+        review = {
             'file': filename,
-            'type': change_type,
+            'type': change.type,
             'language': language,
             'review': review_text,
             'rating': rating,
-            'diff_lines': len(diff.split('\n')),
+            'diff_lines': change.lines,
+            'truncated': change.truncated,
+            **token_stats,
+            'tier': triage['tier'],
+            'triage_reason': triage['reason'],
+            'model': models[level],
+            'escalated_from': escalated_from,
             'error': False
         }
+        if aspects:
+            review['aspects'] = aspects
+        self._record_semantic(lookup, review, seconds, adapted=bool(reference))
+        self._store_review(change, review)
+        return review
 
-    def review_single_file_streaming(self, filename: str, diff: str, language: str, change_type: str):
-        """Review a single file with streaming output.
+    def _review_text(self, filename: str, payload: str, language: str, num_predict: int,
+                     cancel_token: Optional[CancellationToken] = None, aspect: Optional[str] = None,
+                     reference: Optional[str] = None) -> Tuple[str, int, List[str]]:
+        """Get a review from the first model, escalating doubtful verdicts to larger ones.
+
+        Args:
+            filename: Name of the file
+            payload: Preprocessed diff
+            language: Programming language
+            num_predict: Maximum tokens generated by the first model
+            cancel_token: Token that aborts the model calls
+            aspect: Review only this aspect instead of everything
+            reference: Review of a similar past diff for the first model to adapt
+
+        Returns:
+            Tuple of (review text, index of the model that wrote it, escalation notes)
+        """
+        models = self.ollama_client.models
+        review_text = self.ollama_client.review_code(filename, payload, language,
+                                                     num_predict=num_predict, model=models[0],
+                                                     cancel_token=cancel_token, aspect=aspect, reference=reference)
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        # Escalate doubtful verdicts to the next larger model
+        level = 0
+        escalated_from = []
+        while level + 1 < len(models) and self._should_escalate(review_text):
+            candidate = self.ollama_client.review_code(filename, payload, language,
+                                                       num_predict=self._escalation_num_predict(aspect),
+                                                       model=models[level + 1],
+                                                       cancel_token=cancel_token, aspect=aspect)
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            if candidate.startswith("Error during review"):
+                break
+            escalated_from.append(f"{models[level]}: {self._explicit_rating(review_text) or 'unclear rating'}")
+            level += 1
+            review_text = candidate
+
+        return review_text, level, escalated_from
+
+    def _remember_conversation(self, filename: str, payload: str, language: str, review_text: str, model: str,
+                               reference: Optional[str] = None):
+        """Keep a finished review's messages for follow-up questions, if enabled.
+
+        Args:
+            filename: Name of the file
+            payload: Preprocessed diff that was sent
+            language: Programming language
+            review_text: The model's review
+            model: Model that wrote the review
+            reference: Past review the model adapted, if any
+        """
+        if not self.keep_conversations or review_text.startswith("Error during review"):
+            return
+        self.conversations[filename] = self.ollama_client.start_conversation(filename, payload, language,
+                                                                             review_text, model,
+                                                                             reference=reference)
+
+    def ask_follow_up(self, filename: str, question: str,
+                      cancel_token: Optional[CancellationToken] = None):
+        """Ask a follow-up question about a file's review, continuing its conversation.
+
+        Only the question is new to the model; the diff and the review are
+        already in the server's context cache.
+
+        Args:
+            filename: File whose review to continue (must be in conversations)
+            question: The question
+            cancel_token: Token that stops the answer
+
+        Yields:
+            Chunks of the answer as they are generated
+        """
+        yield from self.ollama_client.ask_streaming(self.conversations[filename], question,
+                                                    cancel_token=cancel_token)
+
+    def _escalation_num_predict(self, aspect: Optional[str]) -> int:
+        """Get the generation budget for an escalated review."""
+        return config.ASPECT_NUM_PREDICT if aspect else config.REVIEW_NUM_PREDICT
+
+    def _fan_out_aspects(self, triage: Dict[str, any]) -> bool:
+        """Check whether a change is reviewed as one request per aspect.
+
+        Cheap-tier changes keep their single short review; splitting it
+        would cost more requests than it saves in latency.
+        """
+        return config.REVIEW_FANOUT and len(config.REVIEW_ASPECTS) > 1 and triage['tier'] == TIER_FULL
+
+    def _review_aspects(self, filename: str, payload: str, language: str, triage: Dict[str, any],
+                        cancel_token: Optional[CancellationToken] = None):
+        """Review each of REVIEW_ASPECTS in its own request, all in parallel.
+
+        The client's concurrency limit still decides how many reach the
+        server at once, so on a single-slot server the aspects just queue.
 
         Args:
             filename: Name of the file
+            payload: Preprocessed diff
+            language: Programming language
+            triage: Triage result of the change
+            cancel_token: Token that aborts the model calls
+
+        Yields:
+            Tuples of (aspect, (review text, model index, escalation notes)) as they complete
+        """
+        num_predict = min(config.ASPECT_NUM_PREDICT, self._num_predict(triage))
+        with ThreadPoolExecutor(max_workers=len(config.REVIEW_ASPECTS)) as executor:
+            futures = {
+                executor.submit(self._review_text, filename, payload, language, num_predict,
+                                cancel_token, aspect): aspect
+                for aspect in config.REVIEW_ASPECTS
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _merge_aspects(self, results: Dict[str, Tuple[str, int, List[str]]]
+                       ) -> Tuple[str, str, int, List[str], Dict[str, str]]:
+        """Combine per-aspect reviews into one.
+
+        The combined rating is the most severe of the aspect ratings;
+        aspects without a recognizable rating only count if none has one.
+
+        Args:
+            results: Aspect to (review text, model index, escalation notes)
+
+        Returns:
+            Tuple of (review text, rating, highest model index, escalation notes, aspect ratings)
+        """
+        sections = []
+        ratings = {}
+        escalated_from = []
+        level = 0
+        for aspect in config.REVIEW_ASPECTS:
+            text, aspect_level, notes = results[aspect]
+            ratings[aspect] = self._extract_rating(text)
+            sections.append(f"### {aspect} ({ratings[aspect]})\n{text.strip()}")
+            escalated_from.extend(f"{aspect}: {note}" for note in notes)
+            level = max(level, aspect_level)
+
+        known = [rating for rating in ratings.values() if rating != 'UNKNOWN'] or ['UNKNOWN']
+        rating = max(known, key=lambda r: RATING_SEVERITY.get(r, 0))
+        return '\n\n'.join(sections) + f"\n\nRating: {rating}", rating, level, escalated_from, ratings
+
+    def assign_cache_keys(self, changes: List[Change], content_keys: bool = False):
+        """Compute the content-based cache keys of changes in a few batched git calls.
+
+        Args:
+            changes: Changes to key; their cache_key is set in place
+            content_keys: Also set content_key, the blob ids of the change, which
+                unlike cache_key is known when the cache is disabled
+        """
+        if self.cache is None and not content_keys:
+            return
+
+        keyed = [change for change in changes if change.type in _CACHE_SOURCES]
+        base_ids = self.git_handler.get_blob_ids([change.file for change in keyed], 'HEAD')
+
+        for source in ('index', 'worktree'):
+            members = [change for change in keyed if _CACHE_SOURCES[change.type] == source]
+            new_ids = self.git_handler.get_blob_ids([change.file for change in members], source)
+            for change in members:
+                base_id = base_ids.get(change.file)
+                new_id = new_ids.get(change.file)
+                if content_keys:
+                    change.content_key = f"{base_id or '-'}:{new_id or '-'}"
+                if self.cache is not None and new_id:
+                    change.cache_key = self.cache.key(change.file, base_id, new_id)
+
+    def cache_keys(self, filepaths: List[str], change_type: str) -> Dict[str, str]:
+        """Compute the content-based cache keys of files without building Change objects.
+
+        Args:
+            filepaths: Paths relative to the repo root
+            change_type: 'staged', 'modified' or 'untracked'
+
+        Returns:
+            Dict mapping path to cache key; files that cannot be keyed are left out
+        """
+        if self.cache is None or change_type not in _CACHE_SOURCES or not filepaths:
+            return {}
+
+        base_ids = self.git_handler.get_blob_ids(filepaths, 'HEAD')
+        new_ids = self.git_handler.get_blob_ids(filepaths, _CACHE_SOURCES[change_type])
+        return {
+            filepath: self.cache.key(filepath, base_ids.get(filepath), new_ids[filepath])
+            for filepath in filepaths if filepath in new_ids
+        }
+
+    def fetch_shared_reviews(self, keys: Iterable[Optional[str]]) -> int:
+        """Copy reviews from the team-shared cache into the local one, in one round-trip.
+
+        Args:
+            keys: Cache keys of a changeset (None entries are ignored)
+
+        Returns:
+            Number of reviews fetched
+        """
+        if self.remote_cache is None:
+            return 0
+
+        missing = [key for key in keys if key and key not in self.cache]
+        hits = self.remote_cache.get_many(missing)
+        for key, review in hits.items():
+            self.cache.put(key, review)
+        return len(hits)
+
+    def push_shared_reviews(self) -> int:
+        """Upload every locally cached review to the team-shared cache (e.g. from CI).
+
+        Returns:
+            Number of reviews the server stored
+        """
+        if self.remote_cache is None:
+            return 0
+        return self.remote_cache.put_many(dict(self.cache.items()))
+
+    def _cached_review(self, change: Change) -> Optional[Dict[str, any]]:
+        """Look up a finished review of the exact same content.
+
+        Args:
+            change: The change to review
+
+        Returns:
+            Review result dict marked as cached, or None on a miss
+        """
+        if self.cache is None or change.type not in _CACHE_SOURCES:
+            return None
+
+        if change.cache_key is None:
+            self.assign_cache_keys([change])
+        hit = self.cache.get(change.cache_key) if change.cache_key else None
+        if hit is None:
+            return None
+
+        hit.pop('semantic', None)
+        hit.update({
+            'file': change.file,
+            'type': change.type,
+            'tokens_sent': 0,
+            'duplicates': [],
+            'cached': True
+        })
+        return hit
+
+    def _store_review(self, change: Change, review: Dict[str, any]):
+        """Save a model review for reuse, unless it failed.
+
+        Args:
+            change: The reviewed change
+            review: Its review result dict
+        """
+        if self.cache is None or change.cache_key is None:
+            return
+        if review.get('error') or review['rating'] in ('ERROR', 'UNKNOWN'):
+            return
+        self.cache.put(change.cache_key, review)
+        if self.remote_cache is not None:
+            self.remote_cache.put_many({change.cache_key: review})
+
+    def _semantic_lookup(self, change: Change) -> Optional[Tuple[List[float], Optional[SemanticMatch], float]]:
+        """Embed a change's diff and find the most similar past diff.
+
+        A failing embedding model turns semantic reuse off for the rest of the run.
+
+        Args:
+            change: The change to review
+
+        Returns:
+            Tuple of (embedding, nearest match or None, seconds spent), or None if semantic reuse is off
+        """
+        if self.semantic_index is None:
+            return None
+
+        started = time.perf_counter()
+        text = normalize_diff(change.file, change.diff)[:config.SEMANTIC_MAX_EMBED_CHARS]
+        vector = self.ollama_client.embed(text)
+        if not vector:
+            self.semantic_index = None
+            return None
+
+        match = self.semantic_index.nearest(vector, change.language)
+        return vector, match, time.perf_counter() - started
+
+    def _semantic_reference(self, lookup: Optional[Tuple[List[float], Optional[SemanticMatch], float]]
+                            ) -> Optional[str]:
+        """Get the past review to adapt, if the nearest diff is similar enough."""
+        if lookup and lookup[1] and lookup[1].similarity >= config.SEMANTIC_ADAPT_THRESHOLD:
+            return lookup[1].review['review']
+        return None
+
+    def _reused_review(self, change: Change, lookup: Tuple[List[float], SemanticMatch, float],
+                       triage: Dict[str, any]) -> Dict[str, any]:
+        """Build the review result for a change that reuses a past review as is.
+
+        Args:
+            change: The change
+            lookup: Result of _semantic_lookup with a match above the reuse threshold
+            triage: Triage result of the change
+
+        Returns:
+            Review result dict
+        """
+        _, match, embed_seconds = lookup
+        review = dict(match.review)
+        review.update({
+            'file': change.file,
+            'type': change.type,
+            'language': change.language,
+            'diff_lines': change.lines,
+            'truncated': change.truncated,
+            'tokens_raw': change.tokens_raw,
+            'tokens_sent': 0,
+            'tier': triage['tier'],
+            'triage_reason': triage['reason'],
+            'escalated_from': [],
+            'reused_from': match.review.get('file'),
+            'semantic': {'outcome': 'reused', 'similarity': round(match.similarity, 3),
+                         'saved': match.seconds - embed_seconds},
+            'error': False
+        })
+        return review
+
+    def _record_semantic(self, lookup: Optional[Tuple[List[float], Optional[SemanticMatch], float]],
+                         review: Dict[str, any], seconds: float, adapted: bool):
+        """Note the semantic outcome on a fresh review and add it to the index.
+
+        Args:
+            lookup: Result of _semantic_lookup (None if semantic reuse is off)
+            review: The finished review result dict
+            seconds: Time the model took
+            adapted: Whether the model adapted the nearest past review
+        """
+        if lookup is None:
+            return
+
+        vector, match, embed_seconds = lookup
+        similarity = round(match.similarity, 3) if match else None
+        if adapted:
+            review['semantic'] = {'outcome': 'adapted', 'similarity': similarity,
+                                  'saved': match.seconds - seconds - embed_seconds}
+            # Future reuse saves what a full review costs, not what the adaptation did
+            seconds = max(seconds, match.seconds)
+        else:
+            review['semantic'] = {'outcome': 'miss', 'similarity': similarity, 'saved': -embed_seconds}
+
+        if review.get('error') or review['rating'] in ('ERROR', 'UNKNOWN') or self.semantic_index is None:
+            return
+        entry = {key: review[key] for key in ('file', 'review', 'rating', 'model') if key in review}
+        self.semantic_index.add(vector, review['language'], entry, seconds)
+
+    def _should_escalate(self, review_text: str) -> bool:
+        """Check whether a review should be redone by a larger model.
+
+        Args:
+            review_text: Review produced by the current model
+
+        Returns:
+            True for doubtful ratings and reviews without a clear rating line
+        """
+        if review_text.startswith("Error during review"):
+            return False
+
+        explicit = self._explicit_rating(review_text)
+        return explicit is None or explicit in config.ESCALATE_RATINGS
+
+    def _triage(self, change: Change) -> Dict[str, any]:
+        """Run the local triage tier for a change.
+
+        Args:
+            change: The change to assess
+
+        Returns:
+            Triage result dict (see Triage.assess)
+        """
+        if not config.TRIAGE_ENABLED:
+            return {'tier': TIER_FULL, 'reason': 'triage disabled', 'detail': '', 'rating': None}
+
+        try:
+            return self.triage.assess(change.file, change.diff, change.language, change.type,
+                                      truncated=change.truncated)
+        except Exception as e:
+            return {'tier': TIER_FULL, 'reason': 'triage failed', 'detail': str(e), 'rating': None}
+
+    def _num_predict(self, triage: Dict[str, any]) -> int:
+        """Get the generation budget for a triage tier."""
+        if triage['tier'] == TIER_CHEAP:
+            return config.TRIAGE_CHEAP_NUM_PREDICT
+        return config.REVIEW_NUM_PREDICT
+
+    def _skipped_review(self, change: Change, triage: Dict[str, any]) -> Dict[str, any]:
+        """Build the review result for a change that was not sent to the model.
+
+        Args:
+            change: The change
+            triage: Triage result with the reason and rating
+
+        Returns:
+            Review result dict
+        """
+        review_text = f"Skipped AI review: {triage['reason']}"
+        if triage['detail']:
+            review_text += f" ({triage['detail']})"
+
+        return {
+            'file': change.file,
+            'type': change.type,
+            'language': change.language,
+            'review': review_text + '.',
+            'rating': triage['rating'],
+            'diff_lines': change.lines,
+            'truncated': change.truncated,
+            'tokens_raw': change.tokens_raw,
+            'tokens_sent': 0,
+            'tier': TIER_SKIP,
+            'triage_reason': triage['reason'],
+            'skipped': triage['reason'],
+            'error': False
+        }
+
+    def _prepare_payload(self, diff: str, language: str) -> Tuple[str, Dict[str, int]]:
+        """Shrink a diff before it is embedded in the review prompt.
+
+        Args:
             diff: The diff or content
             language: Programming language
-            change_type: Type of change (modified, staged, untracked)
+
+        Returns:
+            Tuple of (payload, token stats dict)
+        """
+        if not config.PREPROCESS_ENABLED:
+            tokens = estimate_tokens(diff)
+            return diff, {'tokens_raw': tokens, 'tokens_sent': tokens}
+
+        return self.preprocessor.process(diff, language)
+
+    def triage_changes(self, changes: List[Change]) -> List[Dict[str, any]]:
+        """Run the local triage tier for a list of changes up front.
+
+        Diffs are released again after triage.
+
+        Args:
+            changes: List of changes
+
+        Returns:
+            Triage result dicts, in the same order as changes
+        """
+        results = []
+        for change in changes:
+            results.append(self._triage(change))
+            change.release()
+        return results
+
+    def review_single_file_streaming(self, change: Change,
+                                     triage: Optional[Dict[str, any]] = None,
+                                     stop_on_ratings: Optional[List[str]] = None,
+                                     cancel_token: Optional[CancellationToken] = None):
+        """Review a single file with streaming output.
+
+        The change's diff is released once the review is done.
+
+        Args:
+            change: The change to review
+            triage: Precomputed triage result (see triage_changes)
+            stop_on_ratings: Stop generating as soon as the final model states one of these ratings
+            cancel_token: Token that aborts the stream; CancelledError is raised once it fires
 
         Yields:
             Tuples of (chunk_text, is_complete, review_dict)
@@ -126,35 +895,188 @@ class CodeReviewer:
             - is_complete: True if this is the final chunk
             - review_dict: Complete review dict (only on final chunk)
         """
+        filename, language = change.file, change.language
         review_text = ""
         try:
-            for chunk in self.ollama_client.review_code_streaming(filename, diff, language):
-                review_text += chunk
-                yield (chunk, False, None)
+            # Tier 0 verdicts come from the content as it is now, never from the cache
+            if triage is None:
+                triage = self._triage(change)
+            if triage['tier'] == TIER_SKIP:
+                review_dict = self._skipped_review(change, triage)
+                yield (review_dict['review'], False, None)
+                yield ("", True, review_dict)
+                return
+
+            cached = self._cached_review(change)
+            if cached:
+                yield (cached['review'], False, None)
+                yield ("", True, cached)
+                return
+
+            payload, token_stats = self._prepare_payload(change.diff, language)
+            lookup = self._semantic_lookup(change)
+            if lookup and lookup[1] and lookup[1].similarity >= config.SEMANTIC_REUSE_THRESHOLD:
+                review_dict = self._reused_review(change, lookup, triage)
+                yield (review_dict['review'], False, None)
+                yield ("", True, review_dict)
+                return
+
+            models = self.ollama_client.models
+            started = time.perf_counter()
+            if self._fan_out_aspects(triage):
+                review_dict = yield from self._stream_aspects(change, payload, token_stats, triage, cancel_token)
+                self._record_semantic(lookup, review_dict, time.perf_counter() - started, adapted=False)
+                yield ("", True, review_dict)
+                return
+
+            reference = self._semantic_reference(lookup)
+            num_predict = self._num_predict(triage)
+            if reference:
+                num_predict = min(num_predict, config.SEMANTIC_ADAPT_NUM_PREDICT)
+            review_text = yield from self._stream_review(
+                filename, payload, language, models[0], num_predict,
+                stop_on_ratings if len(models) == 1 else None, cancel_token, reference=reference
+            )
+
+            # Escalate doubtful verdicts to the next larger model
+            level = 0
+            escalated_from = []
+            while level + 1 < len(models) and self._should_escalate(review_text):
+                yield (f"\n\n⤴ Escalating to {models[level + 1]}...\n\n", False, None)
+
+                candidate = yield from self._stream_review(
+                    filename, payload, language, models[level + 1], config.REVIEW_NUM_PREDICT,
+                    stop_on_ratings if level + 2 == len(models) else None, cancel_token
+                )
+
+                if candidate.startswith("Error during review"):
+                    break
+                escalated_from.append(f"{models[level]}: {self._explicit_rating(review_text) or 'unclear rating'}")
+                level += 1
+                review_text = candidate
+
+            seconds = time.perf_counter() - started
+            self._remember_conversation(filename, payload, language, review_text, models[level], reference)
 
             # Final chunk with complete review
             rating = self._extract_rating(review_text)
             review_dict = {
                 'file': filename,
-                'type': change_type,
+                'type': change.type,
                 'language': language,
                 'review': review_text,
                 'rating': rating,
-                'diff_lines': len(diff.split('\n')),
+                'diff_lines': change.lines,
+                'truncated': change.truncated,
+                **token_stats,
+                'tier': triage['tier'],
+                'triage_reason': triage['reason'],
+                'model': models[level],
+                'escalated_from': escalated_from,
                 'error': False
             }
+            if not (stop_on_ratings and rating in stop_on_ratings):
+                # Reviews cut short at the verdict are not worth serving again
+                self._record_semantic(lookup, review_dict, seconds, adapted=bool(reference))
+                self._store_review(change, review_dict)
             yield ("", True, review_dict)
+        except CancelledError:
+            raise
         except Exception as e:
             error_msg = f"Error during review: {str(e)}"
             review_dict = {
                 'file': filename,
-                'type': change_type,
+                'type': change.type,
                 'language': language,
                 'review': error_msg,
                 'rating': 'ERROR',
                 'error': True
             }
             yield (error_msg, True, review_dict)
+        finally:
+            change.release()
+
+    def _stream_aspects(self, change: Change, payload: str, token_stats: Dict[str, int], triage: Dict[str, any],
+                        cancel_token: Optional[CancellationToken] = None):
+        """Review a change per aspect in parallel, showing each aspect as it completes.
+
+        Args:
+            change: The change to review
+            payload: Preprocessed diff
+            token_stats: Token counts of the payload
+            triage: Triage result of the change
+            cancel_token: Token that aborts the model calls
+
+        Yields:
+            Tuples of (chunk_text, False, None)
+
+        Returns:
+            The merged review dict
+        """
+        results = {}
+        for aspect, result in self._review_aspects(change.file, payload, change.language, triage, cancel_token):
+            results[aspect] = result
+            yield (f"### {aspect}\n{result[0].strip()}\n\n", False, None)
+
+        review_text, rating, level, escalated_from, aspects = self._merge_aspects(results)
+        review_dict = {
+            'file': change.file,
+            'type': change.type,
+            'language': change.language,
+            'review': review_text,
+            'rating': rating,
+            'diff_lines': change.lines,
+            'truncated': change.truncated,
+            **token_stats,
+            'tier': triage['tier'],
+            'triage_reason': triage['reason'],
+            'model': self.ollama_client.models[level],
+            'escalated_from': escalated_from,
+            'aspects': aspects,
+            'error': False
+        }
+        self._store_review(change, review_dict)
+        return review_dict
+
+    def _stream_review(self, filename: str, payload: str, language: str, model: str, num_predict: int,
+                       stop_on_ratings: Optional[List[str]] = None,
+                       cancel_token: Optional[CancellationToken] = None, reference: Optional[str] = None):
+        """Stream one model's review, optionally cutting it short once the rating is known.
+
+        Args:
+            filename: Name of the file
+            payload: Preprocessed diff
+            language: Programming language
+            model: Model to use
+            num_predict: Maximum tokens to generate
+            stop_on_ratings: Close the stream once one of these ratings is stated
+            cancel_token: Token that aborts the stream
+            reference: Review of a similar past diff to adapt
+
+        Yields:
+            Tuples of (chunk_text, False, None)
+
+        Returns:
+            The full review text
+        """
+        review_text = ""
+        stream = self.ollama_client.review_code_streaming(filename, payload, language,
+                                                          num_predict=num_predict, model=model,
+                                                          cancel_token=cancel_token, reference=reference)
+        try:
+            for chunk in stream:
+                review_text += chunk
+                yield (chunk, False, None)
+
+                if stop_on_ratings and self._explicit_rating(review_text) in stop_on_ratings:
+                    break
+        finally:
+            stream.close()
+
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        return review_text
 
     def _extract_rating(self, review_text: str) -> str:
         """Extract rating from review text.
@@ -165,6 +1087,10 @@ class CodeReviewer:
         Returns:
             Rating string
         """
+        explicit = self._explicit_rating(review_text)
+        if explicit:
+            return explicit
+
         review_upper = review_text.upper()
 
         ratings = ['EXCELLENT', 'GOOD', 'FAIR', 'NEEDS_WORK', 'ERROR']
@@ -174,43 +1100,38 @@ class CodeReviewer:
 
         return 'UNKNOWN'
 
-    def get_summary(self, reviews: List[Dict[str, any]]) -> Dict[str, any]:
+    def _explicit_rating(self, review_text: str) -> Optional[str]:
+        """Find an unambiguous "Rating: X" line in a review.
+
+        Args:
+            review_text: The AI's review text
+
+        Returns:
+            Rating string, or None if no line names exactly one rating
+        """
+        for line in reversed(review_text.upper().split('\n')):
+            if 'RATING' not in line:
+                continue
+            tail = line.split('RATING', 1)[1].replace('NEEDS WORK', 'NEEDS_WORK')
+            found = [rating for rating in ('EXCELLENT', 'GOOD', 'FAIR', 'NEEDS_WORK') if rating in tail]
+            if len(found) == 1:
+                return found[0]
+
+        return None
+
+    def get_summary(self, reviews: Iterable[Dict[str, any]], keep_reviews: bool = True) -> Dict[str, any]:
         """Generate a summary of all reviews.
 
         Args:
-            reviews: List of review results
+            reviews: Review results; any iterable, e.g. ReviewJournal.reviews() to stream a run from disk
+            keep_reviews: Include the review dicts in the summary (off to keep memory flat)
 
         Returns:
             Summary dict
         """
-        total = len(reviews)
-        errors = sum(1 for r in reviews if r.get('error', False))
-
-        ratings = {}
+        aggregator = SummaryAggregator(keep_reviews=keep_reviews)
         for review in reviews:
-            rating = review.get('rating', 'UNKNOWN')
-            ratings[rating] = ratings.get(rating, 0) + 1
-
-        # Calculate overall assessment
-        excellent = ratings.get('EXCELLENT', 0)
-        good = ratings.get('GOOD', 0)
-        fair = ratings.get('FAIR', 0)
-        needs_work = ratings.get('NEEDS_WORK', 0)
-
-        if excellent >= total * 0.7:
-            overall = 'EXCELLENT'
-        elif (excellent + good) >= total * 0.7:
-            overall = 'GOOD'
-        elif needs_work >= total * 0.3:
-            overall = 'NEEDS_WORK'
-        else:
-            overall = 'FAIR'
+            aggregator.add(review)
 
-        return {
-            'total_files': total,
-            'errors': errors,
-            'ratings': ratings,
-            'overall': overall,
-            'reviews': reviews
-        }
+        return aggregator.summary()
 
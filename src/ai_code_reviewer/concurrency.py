@@ -0,0 +1,262 @@
+"""Adaptive limit on concurrent model requests, tuned to observed Ollama throughput."""
+
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .cancellation import CancellationToken
+from . import config
+
+
+class RequestSample:
+    """Measurements of one model request, filled in while it runs."""
+
+    __slots__ = ('started', 'concurrency', 'saturated', 'first_token_at', 'finished_at',
+                 'load_seconds', 'prompt_eval_seconds', 'eval_count', 'eval_seconds', 'chunks', 'error', 'discarded')
+
+    def __init__(self, started: float, concurrency: int, saturated: bool):
+        """Start a sample.
+
+        Args:
+            started: Clock time the request was sent
+            concurrency: Requests in flight including this one
+            saturated: Whether this request used the last free slot
+        """
+        self.started = started
+        self.concurrency = concurrency
+        self.saturated = saturated
+        self.first_token_at = None
+        self.finished_at = None
+        self.load_seconds = 0.0
+        self.prompt_eval_seconds = None
+        self.eval_count = None
+        self.eval_seconds = None
+        self.chunks = 0
+        self.error = False
+        self.discarded = False
+
+    def chunk(self, now: Optional[float] = None):
+        """Mark the arrival of a chunk of generated text."""
+        self.chunks += 1
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic() if now is None else now
+
+    def server_stats(self, response):
+        """Take the timings Ollama reports in a final response (durations in nanoseconds).
+
+        Args:
+            response: Final chat response or stream chunk
+        """
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+        if response.get('load_duration'):
+            self.load_seconds = response.get('load_duration') / 1e9
+        if response.get('prompt_eval_duration') is not None:
+            self.prompt_eval_seconds = response.get('prompt_eval_duration') / 1e9
+        if response.get('eval_count') and response.get('eval_duration'):
+            self.eval_count = response.get('eval_count')
+            self.eval_seconds = response.get('eval_duration') / 1e9
+
+    @property
+    def ttft(self) -> Optional[float]:
+        """Seconds until the first token arrived.
+
+        Non-streaming requests only see the whole response, so the
+        generation time reported by the server is subtracted instead.
+        """
+        if self.first_token_at is not None:
+            return self.first_token_at - self.started
+        if self.finished_at is not None and self.eval_seconds is not None:
+            return max(0.0, self.finished_at - self.started - self.eval_seconds)
+        return None
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        """Generation speed of this request (server-reported where available)."""
+        if self.eval_count and self.eval_seconds:
+            return self.eval_count / self.eval_seconds
+        if self.first_token_at is not None and self.finished_at is not None and self.chunks > 1:
+            elapsed = self.finished_at - self.first_token_at
+            return (self.chunks - 1) / elapsed if elapsed > 0 else None
+        return None
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight model requests.
+
+    Every finished request is a congestion signal. If the server made it
+    queue (time to first token well beyond the prompt evaluation time), or
+    the estimated aggregate token rate fell below what a lower concurrency
+    achieved, or the request failed, the limit is cut multiplicatively.
+    Once a full window of requests has completed at the limit, it grows
+    by one. Requests that were issued before the last cut are ignored,
+    since they still reflect the old limit.
+    """
+
+    def __init__(self, initial: int = config.REVIEW_BATCH_SIZE,
+                 minimum: int = config.REVIEW_CONCURRENCY_MIN,
+                 maximum: int = config.REVIEW_CONCURRENCY_MAX,
+                 adaptive: bool = config.REVIEW_CONCURRENCY_ADAPTIVE,
+                 queue_delay_target: float = config.REVIEW_QUEUE_DELAY_TARGET,
+                 throughput_drop: float = config.REVIEW_THROUGHPUT_DROP,
+                 backoff: float = config.REVIEW_CONCURRENCY_BACKOFF):
+        """Initialize the controller.
+
+        Args:
+            initial: Starting limit (clamped to the bounds)
+            minimum: Lowest limit
+            maximum: Highest limit
+            adaptive: If False the limit stays at `initial`
+            queue_delay_target: Seconds of queueing delay treated as congestion
+            throughput_drop: Fraction of the best aggregate tokens/sec below which a higher limit is backed off
+            backoff: Factor the limit is multiplied by on congestion
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.adaptive = adaptive
+        self.queue_delay_target = queue_delay_target
+        self.throughput_drop = throughput_drop
+        self.backoff = backoff
+
+        self._condition = threading.Condition()
+        self._started = time.monotonic()
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.inflight = 0
+        self._successes = 0
+        self._last_decrease = float('-inf')
+        self._min_ttft = None
+        self._best_throughput = 0.0
+        self._best_concurrency = 0
+
+        self.history: List[Tuple[float, int, str]] = [(0.0, self.limit, 'start')]
+        self.samples = 0
+        self.errors = 0
+        self.peak_inflight = 0
+        self._timed = 0
+        self._ttft_total = 0.0
+        self._queue_delay_total = 0.0
+        self._tps_total = 0.0
+        self._tps_samples = 0
+
+    def acquire(self, cancel_token: Optional[CancellationToken] = None) -> Optional[RequestSample]:
+        """Wait for a free slot.
+
+        Args:
+            cancel_token: Token that stops waiting
+
+        Returns:
+            A sample to fill in and pass to release(), or None if cancelled while waiting
+        """
+        with self._condition:
+            while self.inflight >= self.limit:
+                if cancel_token and cancel_token.cancelled:
+                    return None
+                self._condition.wait(0.1)
+            if cancel_token and cancel_token.cancelled:
+                return None
+
+            self.inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+            return RequestSample(time.monotonic(), self.inflight, saturated=self.inflight >= self.limit)
+
+    def release(self, sample: RequestSample):
+        """Free a slot and feed the request's measurements to the controller.
+
+        Args:
+            sample: The sample returned by acquire()
+        """
+        sample.finished_at = sample.finished_at or time.monotonic()
+        with self._condition:
+            self.inflight -= 1
+            if not sample.discarded:
+                self._record(sample)
+            self._condition.notify_all()
+
+    def _record(self, sample: RequestSample):
+        """Update statistics and the limit from one finished request (lock held)."""
+        self.samples += 1
+        if sample.error:
+            self.errors += 1
+            if sample.started >= self._last_decrease:
+                self._decrease('error')
+            return
+
+        ttft = sample.ttft
+        if ttft is None:
+            return
+        self._min_ttft = ttft if self._min_ttft is None else min(self._min_ttft, ttft)
+
+        # Time before the first token that the server did not spend loading the model or reading the prompt
+        if sample.prompt_eval_seconds is not None:
+            queue_delay = max(0.0, ttft - sample.load_seconds - sample.prompt_eval_seconds)
+        else:
+            queue_delay = ttft - self._min_ttft
+        self._timed += 1
+        self._ttft_total += ttft
+        self._queue_delay_total += queue_delay
+
+        tokens_per_sec = sample.tokens_per_sec
+        throughput = None
+        if tokens_per_sec:
+            self._tps_total += tokens_per_sec
+            self._tps_samples += 1
+            throughput = tokens_per_sec * sample.concurrency
+
+        if not self.adaptive or sample.started < self._last_decrease:
+            return
+
+        if queue_delay > self.queue_delay_target:
+            self._decrease('queueing')
+            return
+        if throughput is not None:
+            if (sample.concurrency > self._best_concurrency
+                    and throughput < self._best_throughput * self.throughput_drop):
+                self._decrease('throughput')
+                return
+            if throughput > self._best_throughput:
+                self._best_throughput = throughput
+                self._best_concurrency = sample.concurrency
+
+        # Only grow when the current limit is actually the bottleneck
+        if sample.saturated:
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._set_limit(self.limit + 1, 'increase')
+
+    def _decrease(self, reason: str):
+        """Cut the limit multiplicatively (lock held)."""
+        if not self.adaptive:
+            return
+        self._last_decrease = time.monotonic()
+        self._set_limit(math.floor(self.limit * self.backoff), reason)
+
+    def _set_limit(self, limit: int, reason: str):
+        """Change the limit within the bounds and log it (lock held)."""
+        self._successes = 0
+        limit = min(max(limit, self.minimum), self.maximum)
+        if limit != self.limit:
+            self.limit = limit
+            self.history.append((time.monotonic() - self._started, limit, reason))
+
+    def snapshot(self) -> Dict[str, any]:
+        """Get the controller state for the timing report.
+
+        Returns:
+            Dict with the bounds, current limit, limit history and averaged measurements (in seconds)
+        """
+        with self._condition:
+            timed = self._timed
+            return {
+                'adaptive': self.adaptive,
+                'minimum': self.minimum,
+                'maximum': self.maximum,
+                'limit': self.limit,
+                'peak_inflight': self.peak_inflight,
+                'history': list(self.history),
+                'requests': self.samples,
+                'errors': self.errors,
+                'ttft_avg': self._ttft_total / timed if timed else 0.0,
+                'queue_delay_avg': self._queue_delay_total / timed if timed else 0.0,
+                'tokens_per_sec_avg': self._tps_total / self._tps_samples if self._tps_samples else 0.0
+            }
@@ -7,17 +7,126 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:1b")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "60"))
 
+# Model escalation cascade: smallest model first, comma separated
+OLLAMA_MODELS = [m.strip() for m in os.getenv("OLLAMA_MODELS", OLLAMA_MODEL).split(",") if m.strip()]
+OLLAMA_MODEL_CONCURRENCY = [int(n) for n in os.getenv("OLLAMA_MODEL_CONCURRENCY", "8,1").split(",")]  # Per tier
+ESCALATE_RATINGS = ["NEEDS_WORK", "FAIR"]  # Ratings re-reviewed by the next larger model
+
+# HTTP transport settings (one connection pool shared by all reviews)
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection stays open for reuse
+OLLAMA_HTTP2 = os.getenv("OLLAMA_HTTP2", "0") == "1"  # Needs the h2 package and a TLS endpoint
+
 # Review settings
 MAX_DIFF_SIZE = 10000  # Maximum characters per diff to review
 MAX_FILE_SIZE = 50000  # Maximum file size to review (in bytes)
-REVIEW_BATCH_SIZE = 5  # Number of files to review in parallel
+MAX_DIFF_READ_BYTES = int(os.getenv("AI_REVIEW_MAX_DIFF_BYTES", "100000"))  # Per-file read cap; git is stopped beyond it
+REVIEW_BATCH_SIZE = 5  # Number of files to review in parallel at the start of a run
+REVIEW_NUM_PREDICT = 500  # Maximum tokens generated for a full review
+FOLLOW_UP_NUM_PREDICT = 300  # Maximum tokens generated for a follow-up answer
+CANCEL_DRAIN_TIMEOUT = 5.0  # Seconds to wait for in-flight reviews after cancellation
+PIPELINE_QUEUE_SIZE = REVIEW_BATCH_SIZE  # Diffs read ahead of the pre-commit reviewer
+SPECULATIVE_REVIEWS = int(os.getenv("AI_REVIEW_SPECULATIVE", "2"))  # Files reviewed while the confirmation prompt is open
+CATFILE_CACHE_BYTES = 8 * 1024 * 1024  # Recently read git objects kept in memory
+
+# Adaptive review concurrency (AIMD on measured time to first token, tokens/sec and queueing delay)
+REVIEW_CONCURRENCY_ADAPTIVE = os.getenv("AI_REVIEW_ADAPTIVE_CONCURRENCY", "1") != "0"
+REVIEW_CONCURRENCY_MIN = int(os.getenv("AI_REVIEW_CONCURRENCY_MIN", "1"))
+REVIEW_CONCURRENCY_MAX = int(os.getenv("AI_REVIEW_CONCURRENCY_MAX", "8"))
+REVIEW_QUEUE_DELAY_TARGET = 1.0  # Seconds waiting for the server beyond prompt evaluation that count as queueing
+REVIEW_THROUGHPUT_DROP = 0.8  # Back off when aggregate tokens/sec falls below this fraction of the best seen
+REVIEW_CONCURRENCY_BACKOFF = 0.5  # Factor applied to the limit on congestion
+OLLAMA_POOL_SIZE = REVIEW_CONCURRENCY_MAX + 1  # HTTP connections: one per parallel review, plus one for status checks
+
+# Prompt preprocessing settings
+PREPROCESS_ENABLED = os.getenv("AI_REVIEW_PREPROCESS", "1") != "0"
+PREPROCESS_CONTEXT_RADIUS = int(os.getenv("AI_REVIEW_CONTEXT_RADIUS", "1"))  # Unchanged lines kept around each change
+
+# Triage settings (local checks before any model call)
+TRIAGE_ENABLED = os.getenv("AI_REVIEW_TRIAGE", "1") != "0"
+TRIAGE_CHEAP_MAX_SCORE = 30  # Complexity score up to which a change gets the cheap review
+TRIAGE_CHEAP_NUM_PREDICT = 200  # Maximum tokens generated for a cheap review
+
+# Formatting-only change detection
+SKIP_FORMATTING_ONLY = os.getenv("AI_REVIEW_SKIP_FORMATTING", "1") != "0"
+FORMATTING_ONLY_RATING = "GOOD"  # Rating assigned without calling the model
+# Languages where whitespace can change meaning (indentation, word splitting, recipe tabs);
+# "text" covers files without a known extension, such as Makefiles
+WHITESPACE_SENSITIVE_LANGUAGES = ["python", "yaml", "markdown", "bash", "sh", "zsh", "fish", "make", "text"]
+
+# Deduplication settings
+DEDUP_ENABLED = os.getenv("AI_REVIEW_DEDUP", "1") != "0"
+DEDUP_SIMILARITY_THRESHOLD = 0.9  # Estimated Jaccard similarity for near-duplicate diffs
+DEDUP_NUM_PERM = 64  # MinHash permutations
+DEDUP_LSH_BANDS = 16  # LSH bands (must divide DEDUP_NUM_PERM)
+
+# Directory name of the tool's state inside a repository; it gets a .gitignore so git ignores it
+STATE_DIR_NAME = ".ai-review"
+
+# Review cache settings (shared by --watch and every other mode)
+CACHE_ENABLED = os.getenv("AI_REVIEW_CACHE", "1") != "0"
+CACHE_DIR = os.getenv("AI_REVIEW_CACHE_DIR", ".ai-review/cache")
+
+# Run journals: every review run appends its results to .ai-review/runs/<run-id>.jsonl (resume with --resume)
+RUN_JOURNAL_ENABLED = os.getenv("AI_REVIEW_JOURNAL", "1") != "0"
+RUNS_DIR = os.getenv("AI_REVIEW_RUNS_DIR", ".ai-review/runs")
+
+# Semantic review reuse (embedding index of past diffs; needs the embedding model pulled)
+SEMANTIC_ENABLED = os.getenv("AI_REVIEW_SEMANTIC", "0") == "1"
+SEMANTIC_EMBED_MODEL = os.getenv("AI_REVIEW_EMBED_MODEL", "nomic-embed-text")
+SEMANTIC_DIR = os.getenv("AI_REVIEW_SEMANTIC_DIR", ".ai-review/semantic")
+SEMANTIC_REUSE_THRESHOLD = 0.97  # Cosine similarity above which a past review is reused as is
+SEMANTIC_ADAPT_THRESHOLD = 0.90  # Cosine similarity above which a past review is adapted instead of written anew
+SEMANTIC_ADAPT_NUM_PREDICT = 250  # Maximum tokens generated when adapting a past review
+SEMANTIC_MAX_EMBED_CHARS = 8000  # Characters of normalized diff sent to the embedding model
+SEMANTIC_LSH_BITS = 64  # Random hyperplanes per vector
+SEMANTIC_LSH_BANDS = 8  # LSH bands (must divide SEMANTIC_LSH_BITS)
+
+# Team-shared review cache service (queried before the model; --serve-cache runs one)
+REMOTE_CACHE_URL = os.getenv("AI_REVIEW_REMOTE_CACHE", "")  # e.g. http://review-cache.internal:8765
+REMOTE_CACHE_TOKEN = os.getenv("AI_REVIEW_REMOTE_CACHE_TOKEN") or None  # Needed to store reviews
+REMOTE_CACHE_TIMEOUT = 2.0  # Seconds per request; the remote tier is dropped after a failure
+REMOTE_CACHE_BATCH = 1000  # Keys per lookup or store request
+CACHE_SERVER_BIND = os.getenv("AI_REVIEW_CACHE_BIND", "127.0.0.1:8765")
+CACHE_SERVER_DIR = os.getenv("AI_REVIEW_CACHE_SERVER_DIR", ".ai-review/shared-cache")
+
+# Ollama gateway (--serve-gateway): priority lanes and request coalescing in front of Ollama servers
+GATEWAY_BIND = os.getenv("AI_REVIEW_GATEWAY_BIND", "127.0.0.1:11500")
+GATEWAY_UPSTREAMS = [u.strip() for u in os.getenv("AI_REVIEW_GATEWAY_UPSTREAMS", OLLAMA_HOST).split(",") if u.strip()]
+GATEWAY_UPSTREAM_CONCURRENCY = int(os.getenv("AI_REVIEW_GATEWAY_CONCURRENCY", "4"))  # Match the server's OLLAMA_NUM_PARALLEL
+GATEWAY_LANES = ["interactive", "precommit", "batch"]  # Highest priority first
+GATEWAY_DEFAULT_LANE = "batch"  # Lane of requests without a priority header (e.g. other tools)
+GATEWAY_QUEUE_TIMEOUT = 600.0  # Seconds a request may wait for an upstream slot
+REVIEW_PRIORITY = os.getenv("AI_REVIEW_PRIORITY") or None  # Lane this client asks for (default: by mode)
+REVIEW_CLIENT_ID = os.getenv("AI_REVIEW_CLIENT_ID") or None  # Fair-queueing identity (default: user@host)
+
+# Watch mode settings
+WATCH_BACKEND = os.getenv("AI_REVIEW_WATCH_BACKEND", "auto")  # auto, inotify or poll
+WATCH_DEBOUNCE = 1.0  # Seconds without file events before reviewing
+WATCH_POLL_INTERVAL = 2.0  # Seconds between scans with the polling backend
+WATCH_NICENESS = 10  # Added to the process niceness so background reviews yield the CPU
+
+# Audit settings
+AUDIT_OUTPUT_DIR = os.getenv("AI_REVIEW_AUDIT_DIR", ".ai-review/audit")
+AUDIT_MAX_FILE_SIZE = 200000  # Files larger than this are skipped (in bytes)
+AUDIT_CHUNK_SIZE = MAX_DIFF_SIZE  # Characters per chunk sent to the model
+AUDIT_PREPROCESS_WORKERS = int(os.getenv("AI_REVIEW_AUDIT_WORKERS", "0")) or None  # None = CPU count
+
+# Multi-repository settings (--repos / --manifest)
+MULTI_REPO_SCAN_WORKERS = 8  # Repositories scanned for changes at once
+MULTI_REPO_CACHE_ROOT = os.getenv("AI_REVIEW_MULTI_CACHE_ROOT", ".")  # Holds the review cache shared by every repository
 
 # Review criteria
 REVIEW_ASPECTS = [
     "Code quality and readability",
+    "Security concerns",
     "Variables names being funny"
 ]
 
+# Per-aspect fan-out: one short, narrowly scoped request per aspect, sent in parallel
+REVIEW_FANOUT = os.getenv("AI_REVIEW_FANOUT", "0") == "1"
+ASPECT_NUM_PREDICT = 150  # Maximum tokens generated per aspect
+
 # UI settings
 SYNTAX_THEME = "monokai"
 MAX_LINES_PREVIEW = 50
@@ -30,8 +139,12 @@ EXCLUDE_PATTERNS = [
     "package-lock.json",
     "yarn.lock",
     "*.pyc",
-    "__pycache__/*"
+    "__pycache__/*",
+    ".ai-review/*"
 ]
+SCAN_SUBMODULES = os.getenv("AI_REVIEW_SUBMODULES", "1") != "0"  # Review changes inside initialized submodules
+SCAN_WORKTREES = os.getenv("AI_REVIEW_WORKTREES", "0") == "1"  # Also review the other linked worktrees
+NESTED_SCAN_WORKERS = 8  # Submodules and worktrees scanned for changes at once
 
 # Prompts
 SYSTEM_PROMPT = """You are an expert code reviewer that likes to make fun of the code he is reviewing. Analyze the provided code changes and provide constructive feedback by using south park jokes.
@@ -56,3 +169,33 @@ Provide a structured review covering:
 5. Rating: [EXCELLENT/GOOD/FAIR/NEEDS_WORK]
 
 Keep your response concise and actionable."""
+
+ADAPT_PROMPT_TEMPLATE = """Here is your earlier review of a very similar change:
+
+{reference}
+
+Now review the following code changes, reusing whatever still applies:
+
+File: {filename}
+Language: {language}
+
+Changes:
+```{language}
+{diff}
+```
+
+Keep the same structure, drop points that no longer apply and add anything new.
+End with the line: Rating: [EXCELLENT/GOOD/FAIR/NEEDS_WORK]"""
+
+ASPECT_PROMPT_TEMPLATE = """Review the following code changes for one aspect only: {aspect}.
+
+File: {filename}
+Language: {language}
+
+Changes:
+```{language}
+{diff}
+```
+
+Ignore everything unrelated to {aspect}. List at most three specific findings, one line each, or say "No issues."
+End with the line: Rating: [EXCELLENT/GOOD/FAIR/NEEDS_WORK]"""
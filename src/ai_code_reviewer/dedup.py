@@ -0,0 +1,163 @@
+"""Clustering of identical and near-identical diffs within a review run."""
+
+import hashlib
+import re
+from pathlib import PurePosixPath
+from typing import List
+
+from .change import Change
+from . import config
+
+
+_HEADER_PREFIXES = ('diff --git', 'index ', '--- ', '+++ ', 'new file mode', 'deleted file mode',
+                    'old mode', 'new mode', 'similarity index', 'rename from', 'rename to')
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@')
+_WHITESPACE = re.compile(r'\s+')
+
+# Large Mersenne prime for the universal hash family used by MinHash
+_PRIME = (1 << 61) - 1
+
+
+def normalize_diff(filepath: str, diff: str) -> str:
+    """Normalize a diff so that equivalent changes compare equal.
+
+    Removes file headers, hunk line numbers, whitespace differences and
+    occurrences of the file's own name.
+
+    Args:
+        filepath: Path of the changed file
+        diff: Raw diff or file content
+
+    Returns:
+        Normalized diff text
+    """
+    path = PurePosixPath(filepath)
+    names = sorted({str(path), path.name, path.stem} - {''}, key=len, reverse=True)
+
+    lines = []
+    for line in diff.split('\n'):
+        if line.startswith(_HEADER_PREFIXES):
+            continue
+        line = _HUNK_HEADER.sub('@@', line)
+        for name in names:
+            line = line.replace(name, '<file>')
+        line = _WHITESPACE.sub(' ', line).strip()
+        if line:
+            lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def _shingles(text: str, size: int) -> set:
+    """Get the set of hashed token shingles of a text."""
+    tokens = text.split()
+    if len(tokens) <= size:
+        shingles = [' '.join(tokens)]
+    else:
+        shingles = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+    return {
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles
+    }
+
+
+def _permutations(count: int) -> List[tuple]:
+    """Get deterministic (a, b) coefficients for the MinHash hash family."""
+    coefficients = []
+    for i in range(count):
+        digest = hashlib.sha256(f"minhash-{i}".encode('utf-8')).digest()
+        a = int.from_bytes(digest[:8], 'big') % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:16], 'big') % _PRIME
+        coefficients.append((a, b))
+    return coefficients
+
+
+class DiffClusterer:
+    """Group changes whose normalized diffs are identical or nearly so."""
+
+    def __init__(self, threshold: float = config.DEDUP_SIMILARITY_THRESHOLD,
+                 num_perm: int = config.DEDUP_NUM_PERM, bands: int = config.DEDUP_LSH_BANDS,
+                 shingle_size: int = 5):
+        """Initialize the clusterer.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for near-duplicates
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands (must divide num_perm)
+            shingle_size: Tokens per shingle
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._permutations = _permutations(num_perm)
+
+    def signature(self, text: str) -> List[int]:
+        """Compute the MinHash signature of a text.
+
+        Args:
+            text: Normalized diff
+
+        Returns:
+            List of num_perm minimum hash values
+        """
+        shingles = _shingles(text, self.shingle_size)
+        return [
+            min((a * s + b) % _PRIME for s in shingles)
+            for a, b in self._permutations
+        ]
+
+    def cluster(self, changes: List[Change]) -> List[List[Change]]:
+        """Cluster changes by exact hash, then by MinHash/LSH similarity.
+
+        Each diff is loaded for hashing and released again right after.
+
+        Args:
+            changes: List of changes
+
+        Returns:
+            List of clusters; the first change of each cluster is its representative
+        """
+        # Exact duplicates
+        exact = {}
+        for change in changes:
+            normalized = normalize_diff(change.file, change.diff)
+            change.release()
+            key = (change.language, hashlib.sha256(normalized.encode('utf-8')).hexdigest())
+            exact.setdefault(key, ([], normalized))[0].append(change)
+
+        groups = list(exact.values())
+        parent = list(range(len(groups)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Near duplicates between the exact groups
+        signatures = [self.signature(normalized) for _, normalized in groups]
+        buckets = {}
+        for index, signature in enumerate(signatures):
+            language = groups[index][0][0].language
+            for band in range(self.bands):
+                key = (language, band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for other in buckets.get(key, []):
+                    if find(index) != find(other) and self._similarity(signature, signatures[other]) >= self.threshold:
+                        parent[find(index)] = find(other)
+                buckets.setdefault(key, []).append(index)
+
+        clusters = {}
+        for index, (members, _) in enumerate(groups):
+            clusters.setdefault(find(index), []).extend(members)
+
+        return list(clusters.values())
+
+    def _similarity(self, first: List[int], second: List[int]) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures."""
+        return sum(1 for a, b in zip(first, second) if a == b) / self.num_perm
@@ -0,0 +1,89 @@
+"""Detection of formatting-only changes that need no AI review."""
+
+import ast
+import re
+from typing import Optional
+
+from . import config
+
+
+# Tokens of free-form code. String literals are kept whole, so whitespace
+# inside them still counts, and adjacent operator characters stay one
+# token, so "a - -b" and "a --b" do not compare equal.
+_TOKEN = re.compile(r'''
+    "(?:\\.|[^"\\\n])*"
+  | '(?:\\.|[^'\\\n])*'
+  | `(?:\\.|[^`\\])*`
+  | \w+
+  | [-+*/%=<>!&|^~?:.@#$\\]+
+  | \S
+''', re.VERBOSE)
+
+
+def _python_ast_equal(old: str, new: str) -> Optional[bool]:
+    """Compare two Python sources by their syntax trees.
+
+    Args:
+        old: Previous source
+        new: Current source
+
+    Returns:
+        True/False, or None if either side does not parse
+    """
+    try:
+        old_tree = ast.parse(old)
+        new_tree = ast.parse(new)
+    except (SyntaxError, ValueError):
+        return None
+
+    return ast.dump(old_tree) == ast.dump(new_tree)
+
+
+def whitespace_only_change(old: str, new: str, language: str) -> bool:
+    """Check whether two pieces of code differ only in insignificant whitespace.
+
+    Both sides are compared as token streams: whitespace between tokens is
+    ignored, so ``f( a,b )`` and ``f(a, b)`` compare equal, but string
+    literals and operators must match exactly. Languages where whitespace
+    is significant (config.WHITESPACE_SENSITIVE_LANGUAGES) never qualify.
+
+    Args:
+        old: Previous code
+        new: Current code
+        language: Programming language
+
+    Returns:
+        True if only insignificant whitespace changed
+    """
+    if language in config.WHITESPACE_SENSITIVE_LANGUAGES:
+        return False
+    return _TOKEN.findall(old) == _TOKEN.findall(new)
+
+
+def detect_formatting_only(old: str, new: str, language: str) -> Optional[str]:
+    """Classify a change as semantically empty.
+
+    Python is compared by AST equality, since indentation matters there.
+    Languages where whitespace is significant are never classified.
+    Everything else is compared token by token, ignoring whitespace.
+
+    Args:
+        old: Previous file content
+        new: Current file content
+        language: Programming language
+
+    Returns:
+        Skip reason if the change is formatting-only, None otherwise
+    """
+    if old == new:
+        return None
+
+    if language == 'python':
+        if _python_ast_equal(old, new):
+            return 'formatting-only change (AST unchanged)'
+        return None
+
+    if whitespace_only_change(old, new, language):
+        return 'formatting-only change (whitespace only)'
+
+    return None
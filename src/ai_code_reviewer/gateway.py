@@ -0,0 +1,620 @@
+"""Local gateway in front of Ollama servers: priority lanes, fair queueing and request coalescing (--serve-gateway)."""
+
+import hashlib
+import http.client
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from . import config
+
+
+PRIORITY_HEADER = 'X-Review-Priority'  # Lane requested by the client (one of GATEWAY_LANES)
+CLIENT_HEADER = 'X-Review-Client'  # Identity used for fair queueing (default: client address)
+
+# Endpoints that run a model; they are scheduled and coalesced, everything else is passed through
+MODEL_PATHS = {'/api/chat', '/api/generate', '/api/embed', '/api/embeddings'}
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024  # Largest request body accepted
+
+# Headers that describe one connection and must not be forwarded
+HOP_BY_HOP = {'connection', 'keep-alive', 'transfer-encoding', 'content-length', 'te', 'trailer', 'upgrade',
+              'proxy-authenticate', 'proxy-authorization'}
+
+
+class _Ticket:
+    """A request waiting for an upstream slot."""
+
+    __slots__ = ('lane', 'client', 'enqueued', 'upstream', 'ready')
+
+    def __init__(self, lane: str, client: str):
+        self.lane = lane
+        self.client = client
+        self.enqueued = time.perf_counter()
+        self.upstream = None
+        self.ready = threading.Event()
+
+
+class LaneScheduler:
+    """Hand out upstream slots by priority lane, then round-robin over clients.
+
+    A freed slot always goes to the highest lane with a waiting request.
+    Within a lane, clients take turns, so one client's burst cannot push
+    back everyone else's requests. Lanes are strict: batch work only gets
+    a slot while no interactive or pre-commit request is waiting. A waiting
+    request can be promoted to a higher lane (see promote).
+    """
+
+    def __init__(self, upstreams: List[str], slots: int = config.GATEWAY_UPSTREAM_CONCURRENCY,
+                 lanes: List[str] = config.GATEWAY_LANES):
+        """Initialize the scheduler.
+
+        Args:
+            upstreams: Ollama server URLs
+            slots: Concurrent requests per upstream
+            lanes: Lane names, highest priority first
+        """
+        self.lanes = list(lanes)
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._free = {upstream: slots for upstream in upstreams}
+        self._waiting: Dict[str, 'OrderedDict[str, deque]'] = {lane: OrderedDict() for lane in self.lanes}
+        self._stats = {
+            lane: {'served': 0, 'timeouts': 0, 'wait_total': 0.0, 'wait_max': 0.0, 'waits': deque(maxlen=1000)}
+            for lane in self.lanes
+        }
+
+    def acquire(self, lane: str, client: str, timeout: float = config.GATEWAY_QUEUE_TIMEOUT) -> str:
+        """Wait for a slot.
+
+        Args:
+            lane: Priority lane of the request
+            client: Identity of the client, for round-robin within the lane
+            timeout: Seconds to wait
+
+        Returns:
+            URL of the upstream the slot belongs to (hand it back with release)
+
+        Raises:
+            TimeoutError: If no slot became free in time
+        """
+        return self.wait(self.enqueue(lane, client), timeout)
+
+    def enqueue(self, lane: str, client: str) -> _Ticket:
+        """Queue a request for a slot without waiting for it (see wait).
+
+        Args:
+            lane: Priority lane of the request
+            client: Identity of the client, for round-robin within the lane
+
+        Returns:
+            Ticket of the request
+        """
+        ticket = _Ticket(lane, client)
+        with self._lock:
+            self._waiting[lane].setdefault(client, deque()).append(ticket)
+            self._dispatch()
+        return ticket
+
+    def wait(self, ticket: _Ticket, timeout: float = config.GATEWAY_QUEUE_TIMEOUT) -> str:
+        """Wait until a queued request gets a slot.
+
+        Args:
+            ticket: Ticket returned by enqueue
+            timeout: Seconds to wait
+
+        Returns:
+            URL of the upstream the slot belongs to (hand it back with release)
+
+        Raises:
+            TimeoutError: If no slot became free in time
+        """
+        if not ticket.ready.wait(timeout):
+            with self._lock:
+                if ticket.upstream is None:
+                    self._unqueue(ticket)
+                    self._stats[ticket.lane]['timeouts'] += 1
+                    raise TimeoutError(f"No Ollama slot became free within {timeout:.0f}s")
+        return ticket.upstream
+
+    def promote(self, ticket: _Ticket, lane: str) -> bool:
+        """Move a waiting request up to a higher lane.
+
+        Args:
+            ticket: Ticket returned by enqueue
+            lane: Lane to move the request to
+
+        Returns:
+            False if the request already has a slot, gave up waiting or is in that lane or a higher one
+        """
+        with self._lock:
+            if ticket.upstream is not None or self.lanes.index(lane) >= self.lanes.index(ticket.lane):
+                return False
+            if not self._unqueue(ticket):
+                return False
+            ticket.lane = lane
+            self._waiting[lane].setdefault(ticket.client, deque()).append(ticket)
+            self._dispatch()
+            return True
+
+    def _unqueue(self, ticket: _Ticket) -> bool:
+        """Take a ticket out of its lane (lock held); returns False if it was not waiting."""
+        clients = self._waiting[ticket.lane]
+        tickets = clients.get(ticket.client)
+        if not tickets or ticket not in tickets:
+            return False
+        tickets.remove(ticket)
+        if not tickets:
+            del clients[ticket.client]
+        return True
+
+    def release(self, upstream: str):
+        """Return a slot and hand it to the next waiting request."""
+        with self._lock:
+            self._free[upstream] += 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Give free slots to waiting requests (lock held)."""
+        while True:
+            upstream = max(self._free, key=self._free.get)
+            if not self._free[upstream]:
+                return
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+
+            self._free[upstream] -= 1
+            ticket.upstream = upstream
+            waited = time.perf_counter() - ticket.enqueued
+            stats = self._stats[ticket.lane]
+            stats['served'] += 1
+            stats['wait_total'] += waited
+            stats['wait_max'] = max(stats['wait_max'], waited)
+            stats['waits'].append(waited)
+            ticket.ready.set()
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        """Take the next request: highest lane first, clients in turn (lock held)."""
+        for lane in self.lanes:
+            clients = self._waiting[lane]
+            if not clients:
+                continue
+            client, tickets = next(iter(clients.items()))
+            ticket = tickets.popleft()
+            if tickets:
+                clients.move_to_end(client)
+            else:
+                del clients[client]
+            return ticket
+        return None
+
+    def snapshot(self) -> Dict[str, any]:
+        """Get queueing metrics.
+
+        Returns:
+            Dict with per-lane queue depth, clients waiting, served and timed-out
+            requests and queue wait (avg, p95, max), plus requests in flight per upstream
+        """
+        with self._lock:
+            lanes = {}
+            for lane in self.lanes:
+                stats = self._stats[lane]
+                waits = sorted(stats['waits'])
+                lanes[lane] = {
+                    'queued': sum(len(tickets) for tickets in self._waiting[lane].values()),
+                    'clients_waiting': len(self._waiting[lane]),
+                    'served': stats['served'],
+                    'timeouts': stats['timeouts'],
+                    'wait_avg': stats['wait_total'] / stats['served'] if stats['served'] else 0.0,
+                    'wait_p95': waits[int(len(waits) * 0.95)] if waits else 0.0,
+                    'wait_max': stats['wait_max']
+                }
+            inflight = {upstream: self.slots - free for upstream, free in self._free.items()}
+        return {'lanes': lanes, 'inflight': inflight}
+
+
+class Flight:
+    """One upstream response, shared by every identical request that arrives while it is produced.
+
+    The leader writes the response in; followers replay what was already
+    produced and then follow along, so all of them see the same bytes.
+    While the leader still waits for a slot, its ticket is kept in the
+    highest lane of any subscriber.
+    """
+
+    def __init__(self, ticket: _Ticket):
+        """Initialize the flight.
+
+        Args:
+            ticket: The leader's place in the scheduler queue
+        """
+        self.ticket = ticket
+        self._cond = threading.Condition()
+        self.status: Optional[int] = None
+        self.headers: List[Tuple[str, str]] = []
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.complete = False
+        self.subscribers = 1  # The leader; changed under the gateway's flight lock
+
+    def start(self, status: int, headers: List[Tuple[str, str]]):
+        """Publish the response status and headers."""
+        with self._cond:
+            self.status = status
+            self.headers = headers
+            self._cond.notify_all()
+
+    def add(self, chunk: bytes):
+        """Publish a piece of the response body."""
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, complete: bool = True):
+        """Mark the response finished.
+
+        Args:
+            complete: False if the response was cut short
+        """
+        with self._cond:
+            if self.done:
+                return
+            if self.status is None:
+                self.status = 502
+            self.done = True
+            self.complete = complete
+            self._cond.notify_all()
+
+    def fail(self, status: int, message: str):
+        """Publish an error response, or cut the response short if it has already started."""
+        if self.status is None:
+            self.start(status, [('Content-Type', 'application/json')])
+            self.add(json.dumps({'error': message}).encode('utf-8'))
+            self.finish()
+        else:
+            self.finish(complete=False)
+
+    def wait_started(self):
+        """Block until the status and headers are known."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.status is not None)
+
+    def follow(self) -> Iterator[bytes]:
+        """Yield every body chunk: the ones produced so far, then new ones as they arrive."""
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self.chunks) > index or self.done)
+                chunks = self.chunks[index:]
+                done = self.done
+            index += len(chunks)
+            yield from chunks
+            if done and not chunks:
+                return
+
+
+class GatewayRequestHandler(BaseHTTPRequestHandler):
+    """Ollama-compatible endpoints of the gateway, plus GET /gateway/metrics."""
+
+    server: 'OllamaGateway'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/gateway/metrics':
+            data = json.dumps(self.server.snapshot()).encode('utf-8')
+            self._start_reply(200, [('Content-Type', 'application/json')], length=len(data))
+            self._write(data)
+            return
+        self._passthrough(None)
+
+    def do_HEAD(self):
+        self._passthrough(None)
+
+    def do_DELETE(self):
+        body = self._read_body()
+        if body is not None:
+            self._passthrough(body)
+
+    def do_POST(self):
+        body = self._read_body()
+        if body is None:
+            return
+        if self.path in MODEL_PATHS:
+            self._model_request(body)
+        else:
+            self._passthrough(body)
+
+    def _read_body(self) -> Optional[bytes]:
+        """Read the request body, replying with an error if it is unusable."""
+        try:
+            length = int(self.headers.get('Content-Length', '0'))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_REQUEST_BYTES:
+            self.send_error(413, "Request body missing or too large")
+            return None
+        return self.rfile.read(length)
+
+    def _passthrough(self, body: Optional[bytes]):
+        """Forward a request that does not run a model (model lists, version, pulls)."""
+        upstream = self.server.upstreams[0]
+        try:
+            connection, response = self.server.send(upstream, self.command, self.path, body)
+        except (OSError, http.client.HTTPException) as e:
+            self.send_error(502, f"Ollama unreachable: {e}")
+            return
+
+        reusable = False
+        try:
+            headers = self._forwarded_headers(response)
+            if self.command == 'HEAD':
+                self._start_reply(response.status, headers, length=0)
+            elif self._start_reply(response.status, headers):
+                for data in iter(lambda: response.read1(65536), b''):
+                    if not self._write_chunk(data):
+                        break
+                else:
+                    self._write(b'0\r\n\r\n')
+            reusable = response.isclosed()
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            self.server.finish(upstream, connection, reusable)
+
+    def _model_request(self, body: bytes):
+        """Schedule a model request by lane and client, coalescing identical ones in flight."""
+        lane = self.headers.get(PRIORITY_HEADER, '').strip().lower()
+        if lane not in self.server.scheduler.lanes:
+            lane = config.GATEWAY_DEFAULT_LANE
+        client = self.headers.get(CLIENT_HEADER) or self.client_address[0]
+
+        key = hashlib.sha256(self.path.encode('utf-8') + b'\0' + _canonical(body)).hexdigest()
+        flight, leader = self.server.join_flight(key, lane, client)
+        try:
+            if leader:
+                self._produce(key, flight, body)
+            else:
+                self._relay(flight)
+        finally:
+            self.server.leave_flight(flight)
+
+    def _produce(self, key: str, flight: Flight, body: bytes):
+        """Run the request upstream, feeding the flight and this client at once."""
+        try:
+            upstream = self.server.scheduler.wait(flight.ticket)
+        except TimeoutError as e:
+            self.server.end_flight(key)
+            flight.fail(503, str(e))
+            self._relay(flight)
+            return
+
+        connection = None
+        reusable = False
+        complete = False
+        client_open = True
+        try:
+            connection, response = self.server.send(upstream, 'POST', self.path, body)
+            headers = self._forwarded_headers(response)
+            flight.start(response.status, headers)
+            client_open = self._start_reply(response.status, headers)
+
+            for data in iter(lambda: response.read1(65536), b''):
+                flight.add(data)
+                if client_open:
+                    client_open = self._write_chunk(data)
+                # Nobody is listening any more: stop the generation
+                if not client_open and flight.subscribers <= 1:
+                    break
+            else:
+                complete = True
+                reusable = response.isclosed()
+        except (OSError, http.client.HTTPException) as e:
+            flight.fail(502, f"Ollama request failed: {e}")
+        finally:
+            self.server.end_flight(key)
+            flight.finish(complete)
+            self.server.scheduler.release(upstream)
+            if connection is not None:
+                self.server.finish(upstream, connection, reusable)
+
+        if connection is None:
+            self._relay(flight)  # The error response
+        elif complete and client_open:
+            self._write(b'0\r\n\r\n')
+        else:
+            self.close_connection = True
+
+    def _relay(self, flight: Flight):
+        """Send a flight's response to this client."""
+        flight.wait_started()
+        if not self._start_reply(flight.status, flight.headers):
+            return
+        for chunk in flight.follow():
+            if not self._write_chunk(chunk):
+                return
+        if flight.complete:
+            self._write(b'0\r\n\r\n')
+        else:
+            # Leave the chunked body unterminated so the client sees the failure
+            self.close_connection = True
+
+    def _forwarded_headers(self, response: http.client.HTTPResponse) -> List[Tuple[str, str]]:
+        """Get the upstream response headers that describe the content."""
+        return [(name, value) for name, value in response.getheaders() if name.lower() not in HOP_BY_HOP]
+
+    def _start_reply(self, status: int, headers: List[Tuple[str, str]], length: Optional[int] = None) -> bool:
+        """Send the status line and headers; the body is chunked unless its length is given.
+
+        Returns:
+            False if the client has gone away
+        """
+        try:
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            if length is None:
+                self.send_header('Transfer-Encoding', 'chunked')
+            else:
+                self.send_header('Content-Length', str(length))
+            self.end_headers()
+            return True
+        except OSError:
+            return False
+
+    def _write_chunk(self, data: bytes) -> bool:
+        """Send one body chunk; returns False if the client has gone away."""
+        return self._write(b'%x\r\n%s\r\n' % (len(data), data)) if data else True
+
+    def _write(self, data: bytes) -> bool:
+        """Write to the client and flush; returns False if the client has gone away."""
+        try:
+            self.wfile.write(data)
+            self.wfile.flush()
+            return True
+        except OSError:
+            self.close_connection = True
+            return False
+
+    def log_message(self, format: str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _canonical(body: bytes) -> bytes:
+    """Normalize a JSON body so key order does not defeat coalescing."""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(',', ':')).encode('utf-8')
+    except ValueError:
+        return body
+
+
+class OllamaGateway(ThreadingHTTPServer):
+    """Threaded HTTP proxy that clients use instead of Ollama itself.
+
+    Model requests wait in priority lanes for one of a fixed number of
+    slots per upstream (see LaneScheduler). A request identical to one
+    already in flight is not sent upstream; it gets a copy of the running
+    response instead, and a flight still waiting for a slot is promoted to
+    the highest lane among its subscribers, so a pre-commit request never
+    waits behind batch work by joining a batch flight. Upstream connections
+    are kept alive and reused.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], upstreams: List[str] = config.GATEWAY_UPSTREAMS,
+                 slots: int = config.GATEWAY_UPSTREAM_CONCURRENCY, verbose: bool = False):
+        """Bind the gateway.
+
+        Args:
+            address: (host, port) to listen on
+            upstreams: Ollama server URLs
+            slots: Concurrent model requests per upstream
+            verbose: Log every request to stderr
+        """
+        if not upstreams:
+            raise ValueError("At least one Ollama upstream is required")
+        self.upstreams = [upstream.rstrip('/') for upstream in upstreams]
+        self.scheduler = LaneScheduler(self.upstreams, slots)
+        self.verbose = verbose
+        self.requests = 0
+        self.coalesced = 0
+        self.promoted = 0
+        self._flights: Dict[str, Flight] = {}
+        self._flight_lock = threading.Lock()
+        self._idle = {upstream: queue.LifoQueue() for upstream in self.upstreams}
+        super().__init__(address, GatewayRequestHandler)
+
+    def join_flight(self, key: str, lane: str, client: str) -> Tuple[Flight, bool]:
+        """Get the flight for a request, starting one (and queueing it for a slot) if none is running.
+
+        Args:
+            key: Hash of the request path and canonical body
+            lane: Priority lane of the request
+            client: Identity of the client
+
+        Returns:
+            Tuple of (flight, whether the caller leads it)
+        """
+        with self._flight_lock:
+            self.requests += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.subscribers += 1
+                self.coalesced += 1
+                if self.scheduler.promote(flight.ticket, lane):
+                    self.promoted += 1
+                return flight, False
+            flight = self._flights[key] = Flight(self.scheduler.enqueue(lane, client))
+            return flight, True
+
+    def leave_flight(self, flight: Flight):
+        """Record that a subscriber stopped reading a flight."""
+        with self._flight_lock:
+            flight.subscribers -= 1
+
+    def end_flight(self, key: str):
+        """Stop coalescing new requests into a flight; later requests start their own."""
+        with self._flight_lock:
+            self._flights.pop(key, None)
+
+    def _connect(self, upstream: str) -> http.client.HTTPConnection:
+        """Open a new connection to an upstream."""
+        parts = urlsplit(upstream)
+        if parts.scheme == 'https':
+            return http.client.HTTPSConnection(parts.hostname, parts.port or 443, timeout=config.OLLAMA_TIMEOUT)
+        return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=config.OLLAMA_TIMEOUT)
+
+    def send(self, upstream: str, method: str, path: str,
+             body: Optional[bytes]) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request upstream over a kept-alive connection.
+
+        A reused connection the server has meanwhile closed is replaced once.
+
+        Returns:
+            Tuple of (connection, response); hand the connection back with finish
+        """
+        prefix = urlsplit(upstream).path.rstrip('/')
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            try:
+                connection, reused = self._idle[upstream].get_nowait(), True
+            except queue.Empty:
+                connection, reused = self._connect(upstream), False
+            try:
+                connection.request(method, prefix + path, body=body, headers=headers)
+                return connection, connection.getresponse()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if not reused:
+                    raise
+        raise http.client.HTTPException("Upstream connection failed")
+
+    def finish(self, upstream: str, connection: http.client.HTTPConnection, reusable: bool):
+        """Return a connection to the idle pool, or close it."""
+        if reusable:
+            self._idle[upstream].put(connection)
+        else:
+            connection.close()
+
+    def snapshot(self) -> Dict[str, any]:
+        """Get the gateway's queueing and coalescing metrics.
+
+        Returns:
+            Dict with 'lanes', 'inflight' (see LaneScheduler.snapshot), request, coalesced and promoted counts
+        """
+        stats = self.scheduler.snapshot()
+        with self._flight_lock:
+            stats.update({
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'promoted': self.promoted,
+                'flights': len(self._flights)
+            })
+        return stats
@@ -1,19 +1,125 @@
 """Git operations handler for the code review assistant."""
 
+import hashlib
+import os
 import git
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Iterator, Optional, Tuple
+from .catfile import CatFileSession
+from .change import Change, count_changed_lines
 from . import config
 
 
+# File extension to language name
+LANGUAGE_MAP = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.jsx': 'jsx',
+    '.tsx': 'tsx',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.c': 'c',
+    '.h': 'c',
+    '.hpp': 'cpp',
+    '.cs': 'csharp',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.rb': 'ruby',
+    '.php': 'php',
+    '.swift': 'swift',
+    '.kt': 'kotlin',
+    '.scala': 'scala',
+    '.sh': 'bash',
+    '.bash': 'bash',
+    '.zsh': 'zsh',
+    '.fish': 'fish',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.json': 'json',
+    '.xml': 'xml',
+    '.html': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.sql': 'sql',
+    '.md': 'markdown',
+    '.txt': 'text'
+}
+
+
+def read_capped(stream: BinaryIO, limit: int, block_size: int = 65536) -> Tuple[bytes, bool]:
+    """Read a binary stream in blocks, stopping once more than limit bytes arrive.
+
+    A truncated result is cut back to the last complete line.
+
+    Args:
+        stream: Stream to read (e.g. a subprocess pipe)
+        limit: Maximum number of bytes to keep
+        block_size: Bytes per read
+
+    Returns:
+        Tuple of (data, whether the stream had more than limit bytes)
+    """
+    buffer = bytearray()
+    while len(buffer) <= limit:
+        block = stream.read(min(block_size, limit + 1 - len(buffer)))
+        if not block:
+            return bytes(buffer), False
+        buffer += block
+
+    cut = buffer.rfind(b'\n', 0, limit)
+    return bytes(buffer[:cut + 1 if cut >= 0 else limit]), True
+
+
+def blob_id(path: Path) -> str:
+    """Compute the git blob id of a file, as ``git hash-object`` would.
+
+    Content filters (e.g. line ending conversion) are not applied.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex SHA-1 blob id
+    """
+    digest = hashlib.sha1(f"blob {path.stat().st_size}\0".encode('ascii'))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _mark_truncated(text: str, truncated: bool) -> Tuple[str, bool]:
+    """Append the truncation marker used in review prompts to capped text."""
+    if truncated:
+        text = text.rstrip('\n') + "\n... (truncated)"
+    return text, truncated
+
+
+def detect_language(filepath: str) -> str:
+    """Detect programming language from file extension.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Language name
+    """
+    ext = Path(filepath).suffix.lower()
+    return LANGUAGE_MAP.get(ext, 'text')
+
+
 class GitHandler:
     """Handle Git operations for code review."""
 
-    def __init__(self, repo_path: Optional[str] = None):
+    def __init__(self, repo_path: Optional[str] = None, worktrees: bool = config.SCAN_WORKTREES):
         """Initialize Git handler.
 
         Args:
             repo_path: Path to git repository (default: current directory)
+            worktrees: Include the changes of the other linked worktrees in change discovery
         """
         try:
             self.repo = git.Repo(repo_path or '.', search_parent_directories=True)
@@ -21,12 +127,177 @@ class GitHandler:
         except git.InvalidGitRepositoryError:
             raise ValueError("Not a git repository. Please run from within a git repository.")
 
-    def get_unstaged_changes(self) -> List[Dict[str, str]]:
+        self.blobs = CatFileSession(self.repo_root)
+        self.worktrees = worktrees
+        # Submodules and linked worktrees, keyed by their path relative to repo_root
+        self.nested: Dict[str, 'GitHandler'] = {}
+
+    def close(self):
+        """Stop the persistent git processes used for blob reads."""
+        self.blobs.close()
+        for handler in self.nested.values():
+            handler.close()
+
+    def _nested_roots(self) -> List[str]:
+        """Find the initialized submodules and (optionally) other linked worktrees.
+
+        Returns:
+            Absolute paths of the nested repositories' working trees
+        """
+        roots = []
+        # Most repositories have no submodules; don't spawn git for them
+        if config.SCAN_SUBMODULES and (Path(self.repo_root) / '.gitmodules').exists():
+            try:
+                # "submodule.<name>.path\n<path>" records
+                output = self.repo.git.config('-z', '--file', '.gitmodules', '--get-regexp', r'^submodule\..*\.path$')
+            except git.GitCommandError:
+                output = ''
+            for record in output.split('\0'):
+                _, _, path = record.partition('\n')
+                full_path = Path(self.repo_root) / path
+                # Uninitialized submodules have no .git and would resolve to this repository
+                if path and (full_path / '.git').exists():
+                    roots.append(str(full_path))
+
+        if self.worktrees:
+            try:
+                output = self.repo.git.worktree('list', '--porcelain')
+            except git.GitCommandError:
+                output = ''
+            own_root = Path(self.repo_root).resolve()
+            for block in output.split('\n\n'):
+                lines = block.splitlines()
+                if not lines or not lines[0].startswith('worktree ') or 'bare' in lines:
+                    continue
+                path = Path(lines[0][len('worktree '):])
+                if path.resolve() != own_root and path.is_dir():
+                    roots.append(str(path))
+
+        return roots
+
+    def refresh_nested(self) -> Dict[str, 'GitHandler']:
+        """Open handlers for the nested repositories, reusing ones opened earlier.
+
+        Submodules recurse into their own submodules; worktrees are only
+        followed from the repository the run started in.
+
+        Returns:
+            Dict mapping repo-qualified path prefix to handler
+        """
+        nested = {}
+        for root in self._nested_roots():
+            prefix = os.path.relpath(root, self.repo_root).replace(os.sep, '/')
+            handler = self.nested.pop(prefix, None)
+            if handler is None:
+                try:
+                    handler = GitHandler(root, worktrees=False)
+                except ValueError:
+                    continue
+            nested[prefix] = handler
+
+        for handler in self.nested.values():
+            handler.close()
+        self.nested = nested
+        return nested
+
+    def _route(self, filepath: str) -> Tuple['GitHandler', str]:
+        """Find the repository holding a repo-qualified path.
+
+        Args:
+            filepath: Path relative to repo_root, possibly inside a submodule or worktree
+
+        Returns:
+            Tuple of (handler of the repository, path relative to its root)
+        """
+        for prefix, handler in self.nested.items():
+            if filepath.startswith(prefix + '/'):
+                return handler._route(filepath[len(prefix) + 1:])
+        return self, filepath
+
+    def _discover(self, method: str, nested: bool) -> List[Change]:
+        """Collect the changes of this repository and, in parallel, of its nested repositories.
+
+        Changes from nested repositories get repo-qualified paths (e.g.
+        "libs/core/src/app.py"); the submodule pointer changes themselves
+        are dropped since their content is reviewed instead.
+
+        Args:
+            method: Name of the single-repository discovery method, e.g. '_unstaged_changes'
+            nested: Include submodules and worktrees
+
+        Returns:
+            List of changes
+        """
+        handlers = self.refresh_nested() if nested else {}
+        if not handlers:
+            return getattr(self, method)()
+
+        with ThreadPoolExecutor(max_workers=min(config.NESTED_SCAN_WORKERS, len(handlers) + 1)) as executor:
+            own = executor.submit(getattr(self, method))
+            futures = {prefix: executor.submit(handler._discover, method, True) for prefix, handler in handlers.items()}
+
+            changes = [change for change in own.result() if change.file not in handlers]
+            for prefix, future in futures.items():
+                try:
+                    found = future.result()
+                except Exception:
+                    # A broken submodule must not stop the review of everything else
+                    continue
+                for change in found:
+                    change.file = f"{prefix}/{change.file}"
+                    changes.append(change)
+
+        return changes
+
+    def read_blobs(self, specs: List[str]) -> List[Optional[str]]:
+        """Read blobs through the persistent cat-file session.
+
+        Thousands of reads cost one git process; recently read objects are
+        served from memory. Index names (":path") are resolved to blob ids
+        with a fresh ``git ls-files`` first: cat-file loads the index once
+        when it starts, so it would keep answering with what was staged then.
+
+        Args:
+            specs: Blob ids or "rev:path" names (e.g. "HEAD:src/app.py", ":src/app.py" for the index)
+
+        Returns:
+            Decoded contents per name, or None where the blob does not exist
+        """
+        staged = [spec[1:] for spec in specs if spec.startswith(':')]
+        if staged:
+            ids = self._blob_ids(staged, 'index')
+            # An id that cannot exist keeps unstaged paths reading as missing
+            specs = [ids.get(spec[1:], '') if spec.startswith(':') else spec for spec in specs]
+
+        try:
+            objects = self.blobs.read_many(specs)
+        except OSError:
+            return [None] * len(specs)
+
+        return [
+            data.decode('utf-8', errors='replace') if info and info.type == 'blob' else None
+            for info, data in (entry or (None, None) for entry in objects)
+        ]
+
+    def read_blob(self, spec: str) -> Optional[str]:
+        """Read one blob (see read_blobs)."""
+        return self.read_blobs([spec])[0]
+
+    def get_unstaged_changes(self, nested: bool = True) -> List[Change]:
         """Get all unstaged changes.
 
+        Diffs are not read here; each change loads its own on first access.
+
+        Args:
+            nested: Include changes inside submodules (and worktrees, if enabled)
+
         Returns:
-            List of dicts with file info and diffs
+            List of changes
         """
+        return self._discover('_unstaged_changes', nested)
+
+    def _unstaged_changes(self) -> List[Change]:
+        """Get the unstaged changes of this repository only."""
         changes = []
 
         # Get modified files
@@ -35,31 +306,22 @@ class GitHandler:
         # Get untracked files
         untracked_files = self.repo.untracked_files
 
+        try:
+            stats = self._numstat('HEAD')
+        except Exception:
+            # No commits yet, compare against the index
+            stats = self._numstat()
+
         for filepath in modified_files:
-            if self._should_exclude(filepath):
+            if self._should_exclude(filepath) or filepath not in stats:
                 continue
 
-            try:
-                # Try to get diff against HEAD, fall back to full file if no commits
-                try:
-                    diff = self.repo.git.diff('HEAD', filepath)
-                except:
-                    diff = self.repo.git.diff(filepath)
-
-                if diff:
-                    changes.append({
-                        'file': filepath,
-                        'type': 'modified',
-                        'diff': diff,
-                        'language': self._detect_language(filepath)
-                    })
-            except Exception as e:
-                changes.append({
-                    'file': filepath,
-                    'type': 'modified',
-                    'diff': f"Error getting diff: {str(e)}",
-                    'language': self._detect_language(filepath)
-                })
+            additions, deletions = stats[filepath]
+            changes.append(Change(
+                filepath, 'modified', self._detect_language(filepath),
+                loader=partial(self._load_diff, filepath, staged=False),
+                additions=additions, deletions=deletions
+            ))
 
         for filepath in untracked_files:
             if self._should_exclude(filepath):
@@ -70,66 +332,285 @@ class GitHandler:
                 if full_path.stat().st_size > config.MAX_FILE_SIZE:
                     continue
 
-                with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-
-                changes.append({
-                    'file': filepath,
-                    'type': 'untracked',
-                    'diff': content,
-                    'language': self._detect_language(filepath)
-                })
+                changes.append(Change(
+                    filepath, 'untracked', self._detect_language(filepath),
+                    loader=partial(self._read_file, filepath),
+                    additions=self._count_lines(full_path)
+                ))
             except Exception:
                 continue
 
         return changes
 
-    def get_staged_changes(self) -> List[Dict[str, str]]:
+    def get_staged_changes(self, nested: bool = True) -> List[Change]:
         """Get all staged changes.
 
+        Diffs are not read here; each change loads its own on first access.
+
+        Args:
+            nested: Include changes staged inside submodules (and worktrees, if enabled)
+
         Returns:
-            List of dicts with file info and diffs
+            List of changes
         """
+        return self._discover('_staged_changes', nested)
+
+    def _staged_changes(self) -> List[Change]:
+        """Get the staged changes of this repository only."""
         changes = []
 
         try:
             # Try to get staged files (requires at least one commit)
             staged_files = [item.a_path for item in self.repo.index.diff('HEAD')]
+            stats = self._numstat('HEAD', cached=True)
         except:
             # No commits yet, get all files in index
             staged_files = [entry[0] for entry in self.repo.index.entries.keys()]
+            stats = None
 
         for filepath in staged_files:
             if self._should_exclude(filepath):
                 continue
 
-            diff = None
-            try:
+            language = self._detect_language(filepath)
+            if stats is None:
+                # No HEAD yet, review the full staged file
                 try:
-                    diff = self.repo.git.diff('HEAD', filepath, cached=True)
-                except:
-                    # No HEAD yet, show the full staged file
-                    full_path = Path(self.repo_root) / filepath
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        diff = f.read()
-
-                if diff:
-                    changes.append({
-                        'file': filepath,
-                        'type': 'staged',
-                        'diff': diff,
-                        'language': self._detect_language(filepath)
-                    })
-            except Exception as e:
-                changes.append({
-                    'file': filepath,
-                    'type': 'staged',
-                    'diff': f"Error getting diff: {str(e)}",
-                    'language': self._detect_language(filepath)
-                })
+                    lines = self._count_lines(Path(self.repo_root) / filepath)
+                except OSError:
+                    continue
+                changes.append(Change(filepath, 'staged', language,
+                                      loader=partial(self._read_file, filepath), additions=lines))
+            elif filepath in stats:
+                additions, deletions = stats[filepath]
+                changes.append(Change(
+                    filepath, 'staged', language,
+                    loader=partial(self._load_diff, filepath, staged=True),
+                    additions=additions, deletions=deletions
+                ))
 
         return changes
 
+    def get_staged_files(self) -> List[str]:
+        """List staged files without reading any diffs.
+
+        Returns:
+            Staged file paths, without excluded files
+        """
+        try:
+            # One git call; cheaper than building GitPython diff objects
+            output = self.repo.git.diff('--cached', '--name-only', '-z', '--no-renames', 'HEAD')
+        except git.GitCommandError:
+            # No commits yet, get all files in index
+            output = self.repo.git.ls_files('--cached', '-z')
+
+        return [filepath for filepath in output.split('\0') if filepath and not self._should_exclude(filepath)]
+
+    def iter_staged_changes(self) -> Iterator[Change]:
+        """Yield staged changes one at a time, each with its diff already read.
+
+        Unlike get_staged_changes, nothing is computed for the whole
+        changeset up front, so the first change is ready after a single diff.
+
+        Yields:
+            Changes in index order
+        """
+        has_head = self.repo.head.is_valid()
+
+        for filepath in self.get_staged_files():
+            if has_head:
+                loader = partial(self._load_diff, filepath, staged=True)
+            else:
+                # No HEAD yet, review the full staged file
+                loader = partial(self._read_file, filepath)
+
+            diff, truncated = loader()
+            if not diff:
+                continue
+
+            additions, deletions = count_changed_lines(diff)
+            yield Change(filepath, 'staged', self._detect_language(filepath), loader=loader, diff=diff,
+                         additions=additions, deletions=deletions, truncated=truncated)
+
+    def get_blob_ids(self, filepaths: List[str], source: str) -> Dict[str, str]:
+        """Get the git blob ids of files, without reading their contents through git.
+
+        Args:
+            filepaths: Paths relative to the repo root (repo-qualified inside nested repositories)
+            source: 'HEAD', 'index' or 'worktree'
+
+        Returns:
+            Dict mapping path to blob id; paths missing from the source are left out
+        """
+        groups = {}
+        for filepath in filepaths:
+            handler, inner = self._route(filepath)
+            groups.setdefault(handler, {})[inner] = filepath
+
+        ids = {}
+        for handler, paths in groups.items():
+            found = handler._blob_ids(list(paths), source)
+            ids.update((paths[inner], blob) for inner, blob in found.items())
+        return ids
+
+    def _blob_ids(self, filepaths: List[str], source: str) -> Dict[str, str]:
+        """Get blob ids of files in this repository only (see get_blob_ids)."""
+        ids = {}
+        if source == 'worktree':
+            for filepath in filepaths:
+                try:
+                    ids[filepath] = blob_id(Path(self.repo_root) / filepath)
+                except OSError:
+                    continue
+            return ids
+
+        # Batched to stay below command line length limits
+        for start in range(0, len(filepaths), 500):
+            batch = filepaths[start:start + 500]
+            try:
+                if source == 'HEAD':
+                    # "<mode> blob <id>\t<path>"
+                    output = self.repo.git.ls_tree('-r', '-z', '--full-tree', 'HEAD', '--', *batch)
+                    field = 2
+                else:
+                    # "<mode> <id> <stage>\t<path>"
+                    output = self.repo.git.ls_files('-s', '-z', '--', *(f':(literal){path}' for path in batch))
+                    field = 1
+            except git.GitCommandError:
+                continue
+
+            for record in output.split('\0'):
+                if '\t' not in record:
+                    continue
+                meta, filepath = record.split('\t', 1)
+                ids[filepath] = meta.split()[field]
+
+        return ids
+
+    def get_dirty_files(self) -> List[str]:
+        """List modified and untracked files in one git call.
+
+        Returns:
+            Paths relative to the repo root, without excluded files
+        """
+        output = self.repo.git.ls_files('-m', '-o', '--exclude-standard', '-z')
+        return sorted({
+            filepath for filepath in output.split('\0')
+            if filepath and not self._should_exclude(filepath)
+        })
+
+    def _numstat(self, *revisions: str, cached: bool = False) -> Dict[str, Tuple[int, int]]:
+        """Get added/removed line counts for every changed file in one git call.
+
+        Args:
+            *revisions: Revisions to compare against (none = the index)
+            cached: Compare the index instead of the working tree
+
+        Returns:
+            Dict mapping file path to (additions, deletions); binary files count as 0
+        """
+        args = ['--numstat', '-z', '--no-renames']
+        if cached:
+            args.append('--cached')
+        output = self.repo.git.diff(*args, *revisions)
+
+        stats = {}
+        for record in output.split('\0'):
+            parts = record.split('\t', 2)
+            if len(parts) != 3:
+                continue
+            added, removed, filepath = parts
+            stats[filepath] = (int(added) if added.isdigit() else 0, int(removed) if removed.isdigit() else 0)
+        return stats
+
+    def _load_diff(self, filepath: str, staged: bool) -> Tuple[str, bool]:
+        """Read the diff of one file, up to MAX_DIFF_READ_BYTES (loader for Change).
+
+        Args:
+            filepath: Path to the file
+            staged: Diff the index instead of the working tree
+
+        Returns:
+            Tuple of (diff text or error description, whether it was truncated)
+        """
+        try:
+            try:
+                return self._read_git_capped('diff', 'HEAD', filepath, cached=staged)
+            except git.GitCommandError:
+                return self._read_git_capped('diff', filepath, cached=staged)
+        except Exception as e:
+            return f"Error getting diff: {str(e)}", False
+
+    def _read_git_capped(self, command: str, *args: str, **kwargs) -> Tuple[str, bool]:
+        """Run a git command and read its output incrementally, up to MAX_DIFF_READ_BYTES.
+
+        Once the cap is reached git is terminated, so huge outputs never
+        get buffered in memory.
+
+        Args:
+            command: Git subcommand, e.g. 'diff'
+            *args: Command arguments
+            **kwargs: Command options (GitPython style)
+
+        Returns:
+            Tuple of (output, whether it was truncated)
+
+        Raises:
+            git.GitCommandError: If git fails before the cap is reached
+        """
+        process = getattr(self.repo.git, command)(*args, as_process=True, **kwargs)
+        try:
+            data, truncated = read_capped(process.stdout, config.MAX_DIFF_READ_BYTES)
+        except BaseException:
+            process.terminate()
+            raise
+
+        if truncated:
+            # Stop git instead of letting it produce output nobody reads
+            process.terminate()
+            process.proc.wait()
+        else:
+            process.wait()
+
+        text = data.decode('utf-8', errors='replace')
+        if text.endswith('\n'):
+            text = text[:-1]
+        return _mark_truncated(text, truncated)
+
+    def _read_file(self, filepath: str) -> Tuple[str, bool]:
+        """Read a working tree file, up to MAX_DIFF_READ_BYTES (loader for Change).
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            Tuple of (file contents or empty string if unreadable, whether it was truncated)
+        """
+        try:
+            with open(Path(self.repo_root) / filepath, 'rb') as f:
+                data, truncated = read_capped(f, config.MAX_DIFF_READ_BYTES)
+        except OSError:
+            return '', False
+
+        return _mark_truncated(data.decode('utf-8', errors='ignore'), truncated)
+
+    def _count_lines(self, full_path: Path) -> int:
+        """Count the lines of a file without keeping its contents in memory.
+
+        Args:
+            full_path: Absolute path to the file
+
+        Returns:
+            Number of lines
+        """
+        lines = 0
+        last = b'\n'
+        with open(full_path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                lines += block.count(b'\n')
+                last = block[-1:]
+        return lines + (last != b'\n')
+
     def get_file_diff(self, filepath: str, staged: bool = False) -> Optional[str]:
         """Get diff for a specific file.
 
@@ -140,6 +621,10 @@ class GitHandler:
         Returns:
             Diff string or None
         """
+        handler, inner = self._route(filepath)
+        if handler is not self:
+            return handler.get_file_diff(inner, staged)
+
         try:
             if staged:
                 return self.repo.git.diff('HEAD', filepath, cached=True)
@@ -148,6 +633,66 @@ class GitHandler:
         except Exception:
             return None
 
+    def get_file_versions(self, filepath: str, staged: bool = False) -> Optional[Tuple[str, str]]:
+        """Get the old and new contents of a changed file.
+
+        Args:
+            filepath: Path to the file
+            staged: Compare HEAD with the index if True, with the working tree otherwise
+
+        Returns:
+            Tuple of (old, new) contents, or None if either side is missing
+        """
+        handler, inner = self._route(filepath)
+        if handler is not self:
+            return handler.get_file_versions(inner, staged)
+
+        old = self.read_blob(f'HEAD:{filepath}')
+        if old is None:
+            return None
+
+        new = self.get_file_content(filepath, staged)
+        if new is None:
+            return None
+
+        return old, new
+
+    def get_file_content(self, filepath: str, staged: bool = False) -> Optional[str]:
+        """Get the new contents of a changed file.
+
+        Args:
+            filepath: Path to the file
+            staged: Read the index version if True, the working tree otherwise
+
+        Returns:
+            File contents, or None if the file cannot be read
+        """
+        handler, inner = self._route(filepath)
+        if handler is not self:
+            return handler.get_file_content(inner, staged)
+
+        try:
+            if staged:
+                return self.read_blob(f':{filepath}')
+
+            full_path = Path(self.repo_root) / filepath
+            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read()
+        except Exception:
+            return None
+
+    def get_tracked_files(self) -> List[str]:
+        """Get all files tracked in the index.
+
+        Returns:
+            List of tracked file paths relative to the repo root
+        """
+        output = self.repo.git.ls_files('-z')
+        return [
+            filepath for filepath in output.split('\0')
+            if filepath and not self._should_exclude(filepath)
+        ]
+
     def _should_exclude(self, filepath: str) -> bool:
         """Check if file should be excluded from review.
 
@@ -169,43 +714,7 @@ class GitHandler:
         Returns:
             Language name
         """
-        ext_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.jsx': 'jsx',
-            '.tsx': 'tsx',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.h': 'c',
-            '.hpp': 'cpp',
-            '.cs': 'csharp',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.rb': 'ruby',
-            '.php': 'php',
-            '.swift': 'swift',
-            '.kt': 'kotlin',
-            '.scala': 'scala',
-            '.sh': 'bash',
-            '.bash': 'bash',
-            '.zsh': 'zsh',
-            '.fish': 'fish',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.html': 'html',
-            '.css': 'css',
-            '.scss': 'scss',
-            '.sql': 'sql',
-            '.md': 'markdown',
-            '.txt': 'text'
-        }
-
-        ext = Path(filepath).suffix.lower()
-        return ext_map.get(ext, 'text')
+        return detect_language(filepath)
 
     def get_repo_status(self) -> Dict[str, any]:
         """Get current repository status.
@@ -0,0 +1,166 @@
+"""Append-only on-disk journals of review runs, for resuming interrupted runs."""
+
+import json
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .state_dir import make_state_dir
+
+
+# Run ids become file names
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
+
+def new_run_id() -> str:
+    """Generate a run id that sorts by start time, e.g. "20250114-093012-3fa9".
+
+    Returns:
+        Run id
+    """
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+
+
+class ReviewJournal:
+    """JSON Lines journal of one review run.
+
+    The first line describes the run; every other line is a review result,
+    written and flushed as soon as the review finishes, with the content
+    key (blob ids) of the change it covers. A file may appear several times (e.g.
+    re-reviewed after a resume); the last record wins.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, any]):
+        """Open a journal for appending (use create or open).
+
+        Args:
+            path: Journal file
+            header: Run description from the first line
+        """
+        self.path = Path(path)
+        self.header = header
+        self._file = None
+
+    @property
+    def run_id(self) -> str:
+        """Id of the run."""
+        return self.header['run_id']
+
+    @classmethod
+    def create(cls, directory: Path, staged: bool, run_id: Optional[str] = None) -> 'ReviewJournal':
+        """Start the journal of a new run.
+
+        Args:
+            directory: Directory holding run journals
+            staged: Whether the run reviews staged changes
+            run_id: Id to use (default: a new one)
+
+        Returns:
+            The journal
+        """
+        header = {
+            'run_id': run_id or new_run_id(),
+            'staged': staged,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        journal = cls(Path(directory) / f"{header['run_id']}.jsonl", header)
+        make_state_dir(journal.path.parent)
+        with open(journal.path, 'x', encoding='utf-8') as f:
+            f.write(json.dumps(header) + '\n')
+        return journal
+
+    @classmethod
+    def open(cls, directory: Path, run_id: str) -> 'ReviewJournal':
+        """Open the journal of an earlier run.
+
+        Args:
+            directory: Directory holding run journals
+            run_id: Id of the run
+
+        Returns:
+            The journal
+
+        Raises:
+            ValueError: If the run id is invalid or no such run exists
+        """
+        if not RUN_ID_PATTERN.match(run_id):
+            raise ValueError(f"Invalid run id '{run_id}'")
+
+        path = Path(directory) / f"{run_id}.jsonl"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            raise ValueError(f"No review run '{run_id}' in {directory}")
+        return cls(path, header)
+
+    def append(self, review: Dict[str, any], content_key: Optional[str] = None):
+        """Record a finished review.
+
+        Args:
+            review: Review result dict (must be JSON serializable)
+            content_key: Content key of the reviewed change, used to tell whether it changed since
+        """
+        if self._file is None:
+            self._file = open(self.path, 'a+', encoding='utf-8')
+            # Finish a line cut short by a crash, so this record stays readable
+            if self._file.tell():
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != '\n':
+                    self._file.write('\n')
+        self._file.write(json.dumps({**review, 'content_key': content_key}) + '\n')
+        self._file.flush()
+
+    def _offsets(self) -> Dict[str, int]:
+        """Find the offset of the last record of every file, without keeping the records."""
+        offsets = {}
+        with open(self.path, 'rb') as f:
+            f.readline()  # Header
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    offsets[json.loads(line)['file']] = offset
+                except (ValueError, KeyError, TypeError):
+                    # Partial line from an interrupted run
+                    continue
+        return offsets
+
+    def reviews(self) -> Iterator[Dict[str, any]]:
+        """Stream the latest review of every file, in journal order.
+
+        Yields:
+            Review result dicts
+        """
+        wanted = set(self._offsets().values())
+        with open(self.path, 'rb') as f:
+            f.readline()
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if offset in wanted:
+                    yield json.loads(line)
+
+    def completed(self) -> Dict[str, Optional[str]]:
+        """Get the files reviewed successfully so far.
+
+        Returns:
+            Dict mapping file path to the content key of the reviewed change
+        """
+        return {
+            review['file']: review.get('content_key')
+            for review in self.reviews() if not review.get('error')
+        }
+
+    def close(self):
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
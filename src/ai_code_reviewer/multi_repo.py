@@ -0,0 +1,186 @@
+"""Multi-repository mode: review many repositories in one run with a shared model pool and cache."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .cancellation import CancellationToken, CancelledError
+from .change import Change
+from .code_reviewer import CodeReviewer
+from .git_handler import GitHandler
+from .ollama_client import OllamaClient
+from .summary import SummaryAggregator
+from . import config
+
+
+def read_manifest(path: str) -> List[str]:
+    """Read a manifest listing one repository path per line.
+
+    Blank lines and lines starting with '#' are ignored. Relative paths
+    are resolved against the manifest's directory.
+
+    Args:
+        path: Manifest file
+
+    Returns:
+        Repository paths in manifest order
+    """
+    base = Path(path).resolve().parent
+    repos = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                repos.append(str(base / Path(line).expanduser()))
+    return repos
+
+
+class RepoRun:
+    """Progress of one repository in a multi-repository run."""
+
+    __slots__ = ('path', 'git_handler', 'code_reviewer', 'clusters', 'reviews', 'error', 'scan_seconds')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.git_handler: Optional[GitHandler] = None
+        self.code_reviewer: Optional[CodeReviewer] = None
+        self.clusters: List[List[Change]] = []
+        self.reviews: List[Dict[str, any]] = []
+        self.error: Optional[str] = None
+        self.scan_seconds = 0.0
+
+
+class MultiRepoReviewer:
+    """Review the changes of many repositories through one scheduler.
+
+    Repositories are scanned concurrently. As soon as one is scanned its
+    files join a single review pool, whose size (and the client's
+    adaptive limit) is shared by every repository, so the run costs
+    roughly the total review time rather than one cold start per
+    repository. All repositories use one client and one review cache.
+    """
+
+    def __init__(self, ollama_client: OllamaClient, repo_paths: List[str], staged: bool = False,
+                 cache_root: str = config.MULTI_REPO_CACHE_ROOT):
+        """Initialize the run.
+
+        Args:
+            ollama_client: Client shared by every repository
+            repo_paths: Repositories to review (duplicates are reviewed once)
+            staged: Review staged changes instead of unstaged ones
+            cache_root: Directory holding the shared review cache and semantic index
+        """
+        self.ollama_client = ollama_client
+        self.staged = staged
+        self.cache_root = Path(cache_root)
+        self.runs = [RepoRun(path) for path in dict.fromkeys(repo_paths)]
+        self._owner: Optional[CodeReviewer] = None
+        self._lock = threading.Lock()
+
+    def _reviewer(self, git_handler: GitHandler) -> CodeReviewer:
+        """Create a repository's reviewer on top of the shared cache."""
+        with self._lock:
+            if self._owner is None:
+                self._owner = CodeReviewer(git_handler, self.ollama_client, cache_root=self.cache_root)
+                return self._owner
+            return CodeReviewer(git_handler, self.ollama_client, shared=self._owner)
+
+    def _scan(self, run: RepoRun):
+        """Find a repository's changes and group identical diffs (scanner thread)."""
+        started = time.perf_counter()
+        run.git_handler = GitHandler(run.path)
+        run.code_reviewer = self._reviewer(run.git_handler)
+        if self.staged:
+            changes = run.git_handler.get_staged_changes()
+        else:
+            changes = run.git_handler.get_unstaged_changes()
+        if changes:
+            run.clusters = run.code_reviewer.plan_reviews(changes)
+        run.scan_seconds = time.perf_counter() - started
+
+    def run(self, cancel_token: Optional[CancellationToken] = None,
+            on_review: Optional[Callable[[str, Dict[str, any]], None]] = None) -> Dict[str, any]:
+        """Scan every repository and review all changes.
+
+        Args:
+            cancel_token: Token that stops the run and drains in-flight reviews
+            on_review: Called with (repo_path, review) as each representative review finishes
+
+        Returns:
+            Dict with 'repos' (per-repository results) and 'summary' (all repositories)
+        """
+        cancel_token = cancel_token or CancellationToken()
+        abort = cancel_token.add_callback(self.ollama_client.abort_inflight)
+
+        scanner = ThreadPoolExecutor(max_workers=max(1, min(config.MULTI_REPO_SCAN_WORKERS, len(self.runs))))
+        reviewer = ThreadPoolExecutor(max_workers=config.REVIEW_CONCURRENCY_MAX)
+        scans = {}
+        reviews = {}
+        try:
+            for run in self.runs:
+                scans[scanner.submit(self._scan, run)] = run
+
+            # Queue each repository's files as soon as it is scanned
+            for future in as_completed(scans):
+                run = scans[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    run.error = str(e)
+                    continue
+                cancel_token.raise_if_cancelled()
+                for cluster in run.clusters:
+                    change = cluster[0]
+                    reviews[reviewer.submit(run.code_reviewer._review_and_release, change, cancel_token)] = (run, change)
+
+            for future in as_completed(reviews):
+                run, change = reviews[future]
+                try:
+                    review = future.result()
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    review = CodeReviewer.error_review(change, e)
+                run.reviews.append(review)
+                if on_review:
+                    on_review(run.path, review)
+        except BaseException:
+            cancel_token.cancel()
+            raise
+        finally:
+            cancel_token.remove_callback(abort)
+            CodeReviewer._shutdown_executor(scanner, list(scans), cancel_token)
+            CodeReviewer._shutdown_executor(reviewer, list(reviews), cancel_token)
+
+        return self._results()
+
+    def _results(self) -> Dict[str, any]:
+        """Build the per-repository and global summaries."""
+        overall = SummaryAggregator(keep_reviews=False)
+        repos = []
+        for run in self.runs:
+            summary = None
+            if run.error is None:
+                reviews = run.code_reviewer._fan_out(run.clusters, run.reviews)
+                aggregator = SummaryAggregator()
+                for review in reviews:
+                    review['repo'] = run.path
+                    aggregator.add(review)
+                    overall.add(review)
+                summary = aggregator.summary()
+            repos.append({
+                'repo': run.path,
+                'summary': summary,
+                'error': run.error,
+                'scan_seconds': run.scan_seconds
+            })
+
+        return {'repos': repos, 'summary': overall.summary(), 'blocked': overall.blocks_commit}
+
+    def close(self):
+        """Stop every repository's git processes."""
+        for run in self.runs:
+            if run.git_handler is not None:
+                run.git_handler.close()
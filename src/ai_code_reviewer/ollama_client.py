@@ -1,23 +1,126 @@
 """Ollama client for AI code reviews."""
 
+import os
+import socket
+import threading
+from contextlib import nullcontext
 import ollama
-from typing import Optional
+from typing import List, Dict, Optional
+from .cancellation import CancellationToken
+from .concurrency import AdaptiveConcurrency
+from .gateway import CLIENT_HEADER, PRIORITY_HEADER
+from .transport import PoolStats, build_http_options
 from . import config
 
 
+class Conversation:
+    """Messages of a review and its follow-ups, in the order the model saw them."""
+
+    __slots__ = ('model', 'messages')
+
+    def __init__(self, model: str, messages: List[Dict[str, str]]):
+        self.model = model
+        self.messages = messages
+
+
 class OllamaClient:
     """Client for interacting with Ollama API."""
 
-    def __init__(self, model: str = config.OLLAMA_MODEL, host: str = config.OLLAMA_HOST):
+    def __init__(self, model: str = config.OLLAMA_MODEL, host: str = config.OLLAMA_HOST,
+                 models: Optional[List[str]] = None, priority: Optional[str] = None):
         """Initialize the Ollama client.
 
         Args:
             model: The model to use (default: llama3.2:1b)
             host: The Ollama host URL
+            models: Escalation cascade, smallest model first (default: just `model`)
+            priority: Gateway lane requested for model calls (see GATEWAY_LANES; plain Ollama ignores it)
         """
-        self.model = model
+        self.models = list(models) if models else [model]
+        self.model = self.models[0]
         self.host = host
-        self.client = ollama.Client(host=host)
+        self.headers = {
+            PRIORITY_HEADER: config.REVIEW_PRIORITY or priority or 'interactive',
+            CLIENT_HEADER: config.REVIEW_CLIENT_ID or f"{os.getenv('USER', 'unknown')}@{socket.gethostname()}"
+        }
+        self.pool_stats = PoolStats()
+        self.client = self._new_client()
+        self.concurrency = AdaptiveConcurrency()
+
+        limits = config.OLLAMA_MODEL_CONCURRENCY or [config.REVIEW_CONCURRENCY_MAX]
+        self._tier_slots = {
+            name: threading.BoundedSemaphore(limits[min(i, len(limits) - 1)])
+            for i, name in enumerate(self.models)
+        }
+
+    def abort_inflight(self):
+        """Abort every request currently in flight on this client.
+
+        Swaps in a fresh HTTP client and closes the old one, so workers
+        fail on their next read and the server sees the disconnect and
+        stops generating.
+        """
+        old_client = self.client
+        self.client = self._new_client()
+
+        http_client = getattr(old_client, '_client', None)
+        if http_client is not None:
+            http_client.close()
+
+    def _new_client(self) -> ollama.Client:
+        """Create an Ollama client on a pooled, keep-alive HTTP transport."""
+        return ollama.Client(host=self.host, headers=self.headers, **build_http_options(self.pool_stats))
+
+    def get_pool_stats(self) -> Dict[str, any]:
+        """Get connection pool statistics for the timing report.
+
+        Returns:
+            Dict with request counts, reuse ratio and wait/connect times (see PoolStats.snapshot)
+        """
+        stats = self.pool_stats.snapshot()
+        stats['pool_size'] = config.OLLAMA_POOL_SIZE
+        return stats
+
+    def get_concurrency_stats(self) -> Dict[str, any]:
+        """Get the adaptive concurrency controller's state for the timing report.
+
+        Returns:
+            Dict with the bounds, limit history and measurements (see AdaptiveConcurrency.snapshot)
+        """
+        return self.concurrency.snapshot()
+
+    def _slot(self, model: str):
+        """Get the concurrency limiter for a model tier."""
+        return self._tier_slots.get(model) or nullcontext()
+
+    def _build_prompt(self, filename: str, diff: str, language: str, aspect: Optional[str] = None,
+                      reference: Optional[str] = None) -> str:
+        """Build the review prompt, truncating oversized diffs.
+
+        Args:
+            filename: Name of the file being reviewed
+            diff: The code diff to review
+            language: Programming language of the code
+            aspect: Review only this aspect (one of REVIEW_ASPECTS) instead of everything
+            reference: Review of a similar past diff to adapt instead of starting from scratch
+
+        Returns:
+            The user prompt
+        """
+        if len(diff) > config.MAX_DIFF_SIZE:
+            diff = diff[:config.MAX_DIFF_SIZE] + "\n... (truncated)"
+
+        if reference:
+            return config.ADAPT_PROMPT_TEMPLATE.format(filename=filename, language=language, diff=diff,
+                                                       reference=reference)
+        if aspect:
+            return config.ASPECT_PROMPT_TEMPLATE.format(filename=filename, language=language, diff=diff,
+                                                        aspect=aspect)
+        return config.REVIEW_PROMPT_TEMPLATE.format(
+            filename=filename,
+            language=language,
+            diff=diff
+        )
 
     def check_connection(self) -> bool:
         """Check if Ollama is running and accessible.
@@ -31,107 +134,238 @@ class OllamaClient:
         except Exception:
             return False
 
-    def check_model_available(self) -> bool:
+    def check_model_available(self, model: Optional[str] = None) -> bool:
         """Check if the configured model is available.
 
+        Args:
+            model: Model to check (default: the first model of the cascade)
+
         Returns:
             True if model is available, False otherwise
         """
+        model = model or self.model
         try:
             models = self.client.list()
-            return any(self.model in model['model'] for model in models.get('models', []))
+            return any(model in entry['model'] for entry in models.get('models', []))
         except Exception:
             return False
 
-    def review_code(self, filename: str, diff: str, language: str = "python") -> Optional[str]:
+    def review_code(self, filename: str, diff: str, language: str = "python",
+                    num_predict: int = config.REVIEW_NUM_PREDICT, model: Optional[str] = None,
+                    cancel_token: Optional[CancellationToken] = None, aspect: Optional[str] = None,
+                    reference: Optional[str] = None) -> Optional[str]:
         """Request a code review from the AI model.
 
         Args:
             filename: Name of the file being reviewed
             diff: The code diff to review
             language: Programming language of the code
+            num_predict: Maximum number of tokens to generate
+            model: Model to use (default: the first model of the cascade)
+            cancel_token: Token that aborts the request (streamed internally so it can stop early)
+            aspect: Review only this aspect (one of REVIEW_ASPECTS) instead of everything
+            reference: Review of a similar past diff to adapt instead of starting from scratch
 
         Returns:
             The AI's review response, or None if there was an error
         """
-        if len(diff) > config.MAX_DIFF_SIZE:
-            diff = diff[:config.MAX_DIFF_SIZE] + "\n... (truncated)"
+        if cancel_token is not None:
+            return ''.join(self.review_code_streaming(filename, diff, language, num_predict=num_predict,
+                                                      model=model, cancel_token=cancel_token, aspect=aspect,
+                                                      reference=reference))
 
-        prompt = config.REVIEW_PROMPT_TEMPLATE.format(
-            filename=filename,
-            language=language,
-            diff=diff
-        )
+        prompt = self._build_prompt(filename, diff, language, aspect, reference)
 
+        model = model or self.model
         try:
-            response = self.client.chat(
-                model=self.model,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': config.SYSTEM_PROMPT
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                options={
-                    'temperature': 0.3,
-                    'num_predict': 500,
-                }
-            )
+            with self._slot(model):
+                sample = self.concurrency.acquire()
+                try:
+                    response = self.client.chat(
+                        model=model,
+                        messages=self.review_messages(prompt),
+                        options={
+                            'temperature': 0.3,
+                            'num_predict': num_predict,
+                        }
+                    )
+                    sample.server_stats(response)
+                except Exception:
+                    sample.error = True
+                    raise
+                finally:
+                    self.concurrency.release(sample)
 
             return response['message']['content']
         except Exception as e:
             return f"Error during review: {str(e)}"
 
-    def review_code_streaming(self, filename: str, diff: str, language: str = "python"):
+    def review_code_streaming(self, filename: str, diff: str, language: str = "python",
+                              num_predict: int = config.REVIEW_NUM_PREDICT, model: Optional[str] = None,
+                              cancel_token: Optional[CancellationToken] = None, aspect: Optional[str] = None,
+                              reference: Optional[str] = None):
         """Request a code review from the AI model with streaming response.
 
         Args:
             filename: Name of the file being reviewed
             diff: The code diff to review
             language: Programming language of the code
+            num_predict: Maximum number of tokens to generate
+            model: Model to use (default: the first model of the cascade)
+            cancel_token: Token that stops the stream; nothing more is yielded once it fires
+            aspect: Review only this aspect (one of REVIEW_ASPECTS) instead of everything
+            reference: Review of a similar past diff to adapt instead of starting from scratch
 
         Yields:
             Chunks of the AI's review response as they are generated
         """
-        if len(diff) > config.MAX_DIFF_SIZE:
-            diff = diff[:config.MAX_DIFF_SIZE] + "\n... (truncated)"
+        prompt = self._build_prompt(filename, diff, language, aspect, reference)
+        yield from self._chat_streaming(model or self.model, self.review_messages(prompt), num_predict, cancel_token)
 
-        prompt = config.REVIEW_PROMPT_TEMPLATE.format(
-            filename=filename,
-            language=language,
-            diff=diff
-        )
+    def review_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages of a review request.
+
+        Args:
+            prompt: User prompt (see _build_prompt)
+
+        Returns:
+            System and user messages
+        """
+        return [
+            {
+                'role': 'system',
+                'content': config.SYSTEM_PROMPT
+            },
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+
+    def start_conversation(self, filename: str, diff: str, language: str, review: str, model: str,
+                           aspect: Optional[str] = None, reference: Optional[str] = None) -> 'Conversation':
+        """Record a finished review so follow-up questions can continue it.
+
+        The messages are rebuilt exactly as they were sent, so the server
+        finds the review's prompt and answer already evaluated in its
+        context cache and only processes the new question.
+
+        Args:
+            filename: Name of the reviewed file
+            diff: The diff that was sent
+            language: Programming language
+            review: The model's answer
+            model: Model that wrote the answer
+            aspect: Aspect the review was limited to, if any
+            reference: Past review the model adapted, if any
+
+        Returns:
+            The conversation
+        """
+        messages = self.review_messages(self._build_prompt(filename, diff, language, aspect, reference))
+        messages.append({'role': 'assistant', 'content': review})
+        return Conversation(model, messages)
+
+    def ask_streaming(self, conversation: 'Conversation', question: str,
+                      num_predict: int = config.FOLLOW_UP_NUM_PREDICT,
+                      cancel_token: Optional[CancellationToken] = None):
+        """Ask a follow-up question about a review, with streaming response.
+
+        The question and answer are appended to the conversation.
+
+        Args:
+            conversation: Conversation of the review (see start_conversation)
+            question: The question
+            num_predict: Maximum number of tokens to generate
+            cancel_token: Token that stops the stream
+
+        Yields:
+            Chunks of the answer as they are generated
+        """
+        messages = conversation.messages + [{'role': 'user', 'content': question}]
+        answer = ""
+        for chunk in self._chat_streaming(conversation.model, messages, num_predict, cancel_token):
+            answer += chunk
+            yield chunk
 
+        if not answer.startswith("Error during review"):
+            conversation.messages = messages + [{'role': 'assistant', 'content': answer}]
+
+    def _chat_streaming(self, model: str, messages: List[Dict[str, str]], num_predict: int,
+                        cancel_token: Optional[CancellationToken] = None):
+        """Stream a chat request within the concurrency limits.
+
+        Args:
+            model: Model to use
+            messages: Chat messages
+            num_predict: Maximum number of tokens to generate
+            cancel_token: Token that stops the stream; nothing more is yielded once it fires
+
+        Yields:
+            Chunks of the response as they are generated
+        """
         try:
-            stream = self.client.chat(
-                model=self.model,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': config.SYSTEM_PROMPT
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                options={
-                    'temperature': 0.3,
-                    'num_predict': 500,
-                },
-                stream=True
-            )
+            with self._slot(model):
+                sample = self.concurrency.acquire(cancel_token)
+                if sample is None:
+                    return
+
+                # Streams abandoned early (cancelled, or closed by the consumer) say nothing about the server
+                sample.discarded = True
+                try:
+                    stream = self.client.chat(
+                        model=model,
+                        messages=messages,
+                        options={
+                            'temperature': 0.3,
+                            'num_predict': num_predict,
+                        },
+                        stream=True
+                    )
 
-            for chunk in stream:
-                if 'message' in chunk and 'content' in chunk['message']:
-                    yield chunk['message']['content']
+                    try:
+                        for chunk in stream:
+                            if cancel_token and cancel_token.cancelled:
+                                break
+                            if chunk.get('done'):
+                                sample.server_stats(chunk)
+                                sample.discarded = False
+                            if 'message' in chunk and 'content' in chunk['message']:
+                                if chunk['message']['content']:
+                                    sample.chunk()
+                                yield chunk['message']['content']
+                    finally:
+                        # Closing the response stops the server generating tokens nobody reads
+                        if hasattr(stream, 'close'):
+                            stream.close()
+                except Exception:
+                    sample.error = True
+                    sample.discarded = bool(cancel_token and cancel_token.cancelled)
+                    raise
+                finally:
+                    self.concurrency.release(sample)
         except Exception as e:
+            if cancel_token and cancel_token.cancelled:
+                return
             yield f"Error during review: {str(e)}"
 
+    def embed(self, text: str, model: str = config.SEMANTIC_EMBED_MODEL) -> Optional[List[float]]:
+        """Get the embedding of a text.
+
+        Args:
+            text: Text to embed
+            model: Embedding model
+
+        Returns:
+            The embedding vector, or None if the model is unavailable
+        """
+        try:
+            if hasattr(self.client, 'embed'):
+                return list(self.client.embed(model=model, input=text)['embeddings'][0])
+            return list(self.client.embeddings(model=model, prompt=text)['embedding'])
+        except Exception:
+            return None
+
     def get_quick_summary(self, changes_summary: str) -> Optional[str]:
         """Get a quick summary of all changes.
 
@@ -0,0 +1,103 @@
+"""Producer/consumer hand-offs between change discovery, review and display."""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+from . import config
+
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised by the producer so the consumer can re-raise it."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Prefetcher:
+    """Produce items on a background thread, starting right away.
+
+    Iterating yields the items in production order, first the ones
+    already buffered, then the rest as they arrive. Exceptions from the
+    producer are raised in the consumer. The producer stops once the
+    consumer stops iterating or close() is called, even if iteration
+    never began.
+    """
+
+    def __init__(self, items: Iterable[T], maxsize: int = config.PIPELINE_QUEUE_SIZE):
+        """Start producing.
+
+        Args:
+            items: Iterable to produce from
+            maxsize: Maximum number of items waiting in the buffer (0 for unbounded)
+        """
+        self._buffer = queue.Queue(maxsize=max(0, maxsize))
+        self._stop = threading.Event()
+        self._producer = threading.Thread(target=self._produce, args=(items,), name='change-producer',
+                                          daemon=True)
+        self._producer.start()
+
+    def _put(self, item) -> bool:
+        """Buffer an item, giving up once the consumer has stopped."""
+        while not self._stop.is_set():
+            try:
+                self._buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, items: Iterable[T]):
+        """Run the producer (background thread)."""
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._put(_Failure(e))
+            return
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+        self._put(_DONE)
+
+    def close(self):
+        """Stop the producer; items not yet consumed are dropped."""
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[T]:
+        try:
+            while True:
+                item = self._buffer.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            self.close()
+
+
+def prefetch(items: Iterable[T], maxsize: int = config.PIPELINE_QUEUE_SIZE) -> Iterator[T]:
+    """Produce items on a background thread while the caller consumes them.
+
+    The queue between the two is bounded, so the producer never runs more
+    than ``maxsize`` items ahead. Exceptions from the producer are raised
+    in the consumer; if the consumer stops early, the producer stops too.
+    Production starts with the first request for an item; use Prefetcher
+    directly to start it right away.
+
+    Args:
+        items: Iterable to produce from (e.g. GitHandler.iter_staged_changes())
+        maxsize: Maximum number of items waiting in the queue
+
+    Yields:
+        Items in production order
+    """
+    yield from Prefetcher(items, max(1, maxsize))
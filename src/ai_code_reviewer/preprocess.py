@@ -0,0 +1,240 @@
+"""Prompt payload reduction between GitHandler and OllamaClient."""
+
+import ast
+import re
+from typing import List, Dict, Tuple
+
+from . import config
+from .formatting import whitespace_only_change
+
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@ ?(.*)$')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a text.
+
+    Uses the common ~4 characters per token heuristic, which is close
+    enough for comparing payload sizes without loading a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return (len(text) + 3) // 4
+
+
+def is_unified_diff(text: str) -> bool:
+    """Check whether a change payload is a unified diff rather than file content.
+
+    Args:
+        text: Diff or full file content
+
+    Returns:
+        True if the text looks like git diff output
+    """
+    return text.startswith(('diff --git', '--- ', '@@ '))
+
+
+def elide_python_bodies(source: str, budget: int) -> Tuple[str, int]:
+    """Replace Python function bodies with ``...`` until the source fits a budget.
+
+    The largest bodies are elided first; signatures, decorators and
+    docstrings are kept so the model still sees the file's structure.
+
+    Args:
+        source: Python source code
+        budget: Target size in characters
+
+    Returns:
+        Tuple of (source, number of elided functions)
+    """
+    if len(source) <= budget:
+        return source, 0
+
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return source, 0
+
+    lines = source.split('\n')
+    candidates = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], 'value', None), ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            body = body[1:]
+        if not body:
+            continue
+
+        start = body[0].lineno
+        end = node.end_lineno
+        # Bodies on the signature line (def f(): return 1) are left alone
+        if start <= node.lineno:
+            continue
+
+        size = sum(len(line) + 1 for line in lines[start - 1:end])
+        candidates.append((size, start, end))
+
+    chosen = []
+    remaining = len(source)
+    for size, start, end in sorted(candidates, reverse=True):
+        if remaining <= budget:
+            break
+        if any(s <= start and end <= e for _, s, e in chosen):
+            continue
+        chosen.append((size, start, end))
+        remaining -= size
+
+    if not chosen:
+        return source, 0
+
+    for _, start, end in sorted(chosen, key=lambda item: item[1], reverse=True):
+        first = lines[start - 1]
+        indent = first[:len(first) - len(first.lstrip())]
+        lines[start - 1:end] = [f"{indent}...  # {end - start + 1} line(s) elided"]
+
+    return '\n'.join(lines), len(chosen)
+
+
+class DiffPreprocessor:
+    """Shrink diffs and file contents before they are embedded in a prompt."""
+
+    def __init__(self, context_radius: int = config.PREPROCESS_CONTEXT_RADIUS,
+                 max_size: int = config.MAX_DIFF_SIZE):
+        """Initialize the preprocessor.
+
+        Args:
+            context_radius: Unchanged lines to keep around each changed line
+            max_size: Payload size above which Python bodies are elided
+        """
+        self.context_radius = context_radius
+        self.max_size = max_size
+
+    def process(self, diff: str, language: str) -> Tuple[str, Dict[str, int]]:
+        """Compact a change payload.
+
+        Args:
+            diff: The diff or full file content
+            language: Programming language
+
+        Returns:
+            Tuple of (compacted payload, stats dict with tokens_raw, tokens_sent)
+        """
+        if is_unified_diff(diff):
+            compacted = self.compact_diff(diff, language)
+        else:
+            compacted = self.compact_source(diff, language)
+
+        return compacted, {
+            'tokens_raw': estimate_tokens(diff),
+            'tokens_sent': estimate_tokens(compacted)
+        }
+
+    def compact_diff(self, diff: str, language: str) -> str:
+        """Strip headers, trim context and collapse whitespace-only hunks.
+
+        Args:
+            diff: Unified diff
+            language: Programming language (whitespace-only hunks are kept where whitespace is significant)
+
+        Returns:
+            Compacted diff
+        """
+        output = []
+        hunk = None
+
+        for line in diff.split('\n'):
+            match = _HUNK_HEADER.match(line)
+            if match:
+                if hunk:
+                    output.extend(self._compact_hunk(*hunk, language))
+                hunk = (int(match.group(2)), match.group(3), [])
+            elif hunk is not None and line[:1] in (' ', '+', '-', ''):
+                hunk[2].append(line)
+            elif line.startswith('Binary files'):
+                output.append(line)
+
+        if hunk:
+            output.extend(self._compact_hunk(*hunk, language))
+
+        return '\n'.join(output)
+
+    def _compact_hunk(self, new_start: int, section: str, lines: List[str], language: str) -> List[str]:
+        """Compact a single hunk.
+
+        Args:
+            new_start: First line number of the hunk in the new file
+            section: Function context git prints after the hunk header
+            lines: Hunk body lines
+            language: Programming language
+
+        Returns:
+            Compacted hunk lines, including a short header
+        """
+        while lines and lines[-1] == '':
+            lines.pop()
+
+        removed = [line[1:] for line in lines if line.startswith('-')]
+        added = [line[1:] for line in lines if line.startswith('+')]
+        if not removed and not added:
+            return []
+
+        if whitespace_only_change('\n'.join(removed), '\n'.join(added), language):
+            return [f"@@ line {new_start}: whitespace-only change ({max(len(removed), len(added))} line(s)) @@"]
+
+        changed = [i for i, line in enumerate(lines) if line[:1] in ('+', '-')]
+        keep = set()
+        for i in changed:
+            keep.update(range(i - self.context_radius, i + self.context_radius + 1))
+
+        body = []
+        first_line = None
+        new_line = new_start
+        previous = None
+        for i, line in enumerate(lines):
+            if i in keep:
+                if first_line is None:
+                    first_line = new_line
+                elif previous != i - 1:
+                    body.append(' ...')
+                body.append(line[0] + line[1:].rstrip() if line[:1] in ('+', '-') else line.rstrip())
+                previous = i
+            if not line.startswith('-'):
+                new_line += 1
+
+        header = f"@@ line {first_line} @@"
+        if section:
+            header += f" {section.strip()}"
+        return [header] + body
+
+    def compact_source(self, content: str, language: str) -> str:
+        """Compact full file content (untracked or first-commit files).
+
+        Args:
+            content: File content
+            language: Programming language
+
+        Returns:
+            Compacted content
+        """
+        lines = []
+        blank_run = 0
+        for line in content.split('\n'):
+            line = line.rstrip()
+            blank_run = blank_run + 1 if not line else 0
+            if blank_run > 1:
+                continue
+            lines.append(line)
+
+        compacted = '\n'.join(lines).strip('\n')
+
+        if language == 'python':
+            compacted, _ = elide_python_bodies(compacted, self.max_size)
+
+        return compacted
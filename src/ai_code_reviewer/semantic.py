@@ -0,0 +1,204 @@
+"""On-disk embedding index of past diffs, for reusing reviews of similar changes."""
+
+import base64
+import json
+import math
+import operator
+import random
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import config
+from .state_dir import make_state_dir
+
+
+def quantize(vector: List[float]) -> array:
+    """Normalize a vector and store it as signed bytes.
+
+    Only the direction matters for cosine similarity, so one byte per
+    dimension keeps it accurate to well under a percent.
+
+    Args:
+        vector: Embedding
+
+    Returns:
+        int8 array
+    """
+    peak = max((abs(x) for x in vector), default=0.0) or 1.0
+    return array('b', (round(x / peak * 127) for x in vector))
+
+
+def _dot(first: array, second: array) -> int:
+    return sum(map(operator.mul, first, second))
+
+
+class SemanticMatch:
+    """The nearest past diff to a query."""
+
+    __slots__ = ('similarity', 'entry')
+
+    def __init__(self, similarity: float, entry: Dict[str, any]):
+        self.similarity = similarity
+        self.entry = entry
+
+    @property
+    def review(self) -> Dict[str, any]:
+        """The review of the past diff."""
+        return self.entry['review']
+
+    @property
+    def seconds(self) -> float:
+        """How long the past review took to generate."""
+        return self.entry.get('seconds', 0.0)
+
+
+class SemanticIndex:
+    """Approximate nearest-neighbour index of diff embeddings, persisted as JSON Lines.
+
+    Each line holds one diff's int8 embedding (base64), its LSH signature
+    and the review it got. Lookups use random-hyperplane LSH: the
+    signature bits are split into bands, any band equal to the query's
+    makes an entry a candidate, and candidates are ranked by exact cosine
+    similarity. Appends are single short writes, so several processes
+    can share one file.
+    """
+
+    def __init__(self, path: Path, bits: int = config.SEMANTIC_LSH_BITS, bands: int = config.SEMANTIC_LSH_BANDS):
+        """Load the index.
+
+        Args:
+            path: JSON Lines file (created on first add)
+            bits: Signature bits per vector
+            bands: LSH bands (must divide bits)
+        """
+        if bits % bands:
+            raise ValueError("bits must be divisible by bands")
+
+        self.path = Path(path)
+        self.bits = bits
+        self.bands = bands
+        self.rows = bits // bands
+        self._lock = threading.Lock()
+        self._hyperplanes = None
+        self._dim = None
+        self._vectors: List[array] = []
+        self._norms: List[float] = []
+        self._entries: List[Dict[str, any]] = []
+        self._buckets: Dict[Tuple[str, int, int], List[int]] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        """Read every entry from disk, skipping damaged lines."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        vector = array('b', base64.b64decode(record.pop('vector')))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if self._dim is None:
+                        self._dim = len(vector)
+                    if len(vector) == self._dim and len(record.get('signature', [])) == self.bands:
+                        self._insert(vector, record)
+        except OSError:
+            pass
+
+    def _planes(self, dim: int) -> List[List[float]]:
+        """Get the deterministic random hyperplanes for vectors of a dimension."""
+        if self._hyperplanes is None:
+            rng = random.Random(f"semantic-lsh-{dim}-{self.bits}")
+            self._hyperplanes = [[rng.gauss(0.0, 1.0) for _ in range(dim)] for _ in range(self.bits)]
+        return self._hyperplanes
+
+    def signature(self, vector: array) -> List[int]:
+        """Compute the banded LSH signature of a vector.
+
+        Args:
+            vector: Quantized embedding
+
+        Returns:
+            One integer per band, packing `rows` sign bits
+        """
+        planes = self._planes(len(vector))
+        bands = []
+        for band in range(self.bands):
+            value = 0
+            for plane in planes[band * self.rows:(band + 1) * self.rows]:
+                value = (value << 1) | (sum(map(operator.mul, plane, vector)) >= 0)
+            bands.append(value)
+        return bands
+
+    def _insert(self, vector: array, record: Dict[str, any]):
+        """Add an entry to the in-memory structures (lock held or loading)."""
+        index = len(self._entries)
+        self._vectors.append(vector)
+        self._norms.append(math.sqrt(_dot(vector, vector)) or 1.0)
+        self._entries.append(record)
+        for band, value in enumerate(record['signature']):
+            self._buckets.setdefault((record.get('language', ''), band, value), []).append(index)
+
+    def nearest(self, vector: List[float], language: str) -> Optional[SemanticMatch]:
+        """Find the most similar past diff in the same language.
+
+        Args:
+            vector: Embedding of the new diff
+            language: Programming language of the new diff
+
+        Returns:
+            The best match, or None if no entry shares an LSH band
+        """
+        query = quantize(vector)
+        if self._dim is not None and len(query) != self._dim:
+            return None
+        signature = self.signature(query)
+        norm = math.sqrt(_dot(query, query)) or 1.0
+
+        with self._lock:
+            candidates = set()
+            for band, value in enumerate(signature):
+                candidates.update(self._buckets.get((language, band, value), ()))
+
+            best = None
+            for index in candidates:
+                similarity = _dot(query, self._vectors[index]) / (norm * self._norms[index])
+                if best is None or similarity > best.similarity:
+                    best = SemanticMatch(similarity, self._entries[index])
+        return best
+
+    def add(self, vector: List[float], language: str, review: Dict[str, any], seconds: float):
+        """Store a diff's embedding with its review.
+
+        Args:
+            vector: Embedding of the diff
+            language: Programming language
+            review: Review result dict (must be JSON serializable)
+            seconds: How long the review took to generate
+        """
+        quantized = quantize(vector)
+        if self._dim is not None and len(quantized) != self._dim:
+            return
+        record = {
+            'language': language,
+            'signature': self.signature(quantized),
+            'review': review,
+            'seconds': round(seconds, 3)
+        }
+        line = json.dumps({**record, 'vector': base64.b64encode(quantized.tobytes()).decode('ascii')})
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = len(quantized)
+            self._insert(quantized, record)
+            try:
+                make_state_dir(self.path.parent)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+            except OSError:
+                # An index that cannot be written must never fail a review
+                pass
@@ -0,0 +1,42 @@
+"""Directories the tool keeps its state in (review cache, run journals, audit output)."""
+
+import threading
+from pathlib import Path
+
+from . import config
+
+
+_ignored = set()
+_lock = threading.Lock()
+
+
+def make_state_dir(path: Path):
+    """Create a state directory, keeping the .ai-review directory around it out of git.
+
+    The first time a directory inside .ai-review is created, a .gitignore
+    ignoring everything is written into .ai-review, so the tool's state
+    neither shows up in ``git status`` nor counts as untracked files.
+    An existing .gitignore there is left alone.
+
+    Args:
+        path: Directory to create (with its parents)
+
+    Raises:
+        OSError: If the directory cannot be created
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    root = next((parent for parent in (path, *path.parents) if parent.name == config.STATE_DIR_NAME), None)
+    if root is None:
+        return
+    with _lock:
+        if root in _ignored:
+            return
+        _ignored.add(root)
+    try:
+        with open(root / '.gitignore', 'x', encoding='utf-8') as f:
+            f.write("# Written by ai-code-review: cache, run journals and reports are local state\n*\n")
+    except OSError:
+        # Already there, or not writable; neither must fail the caller
+        pass
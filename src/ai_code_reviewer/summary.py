@@ -0,0 +1,161 @@
+"""Incremental aggregation of review results into a summary."""
+
+from typing import List, Dict
+
+
+class SummaryAggregator:
+    """Fold review results into summary counters one at a time.
+
+    The summary is available at any point, so callers can act on the
+    outcome (e.g. a blocked commit) before every file has been reviewed.
+    """
+
+    def __init__(self, keep_reviews: bool = True):
+        """Initialize an empty aggregator.
+
+        Args:
+            keep_reviews: Keep the review dicts for the 'reviews' summary entry
+        """
+        self.keep_reviews = keep_reviews
+        self.reviews = []
+        self.total = 0
+        self.errors = 0
+        self.ratings = {}
+        self.deduplicated = 0
+        self.cached = 0
+        self.semantic_lookups = 0
+        self.semantic_reused = 0
+        self.semantic_adapted = 0
+        self.semantic_saved = 0.0
+        self.skipped_reasons = {}
+        self.tiers = {}
+        self.models = {}
+        self.escalated = 0
+        self.tokens_raw = 0
+        self.tokens_sent = 0
+        self.truncated = 0
+        self.not_reviewed = []
+        self.verdicts = {}
+
+    def add(self, review: Dict[str, any]):
+        """Add one review result.
+
+        Args:
+            review: Review result dict
+        """
+        if self.keep_reviews:
+            self.reviews.append(review)
+
+        self.total += 1
+        if review.get('error', False):
+            self.errors += 1
+
+        rating = review.get('rating', 'UNKNOWN')
+        self.ratings[rating] = self.ratings.get(rating, 0) + 1
+        if rating != 'SKIPPED':
+            self.verdicts[review.get('file')] = rating
+
+        self.tokens_raw += review.get('tokens_raw', 0)
+        self.tokens_sent += review.get('tokens_sent', 0)
+        if review.get('truncated'):
+            self.truncated += 1
+
+        # Fanned-out duplicates and cache hits did not run the pipeline themselves
+        if review.get('duplicate_of'):
+            self.deduplicated += 1
+            return
+        if review.get('cached'):
+            self.cached += 1
+            return
+
+        semantic = review.get('semantic')
+        if semantic:
+            self.semantic_lookups += 1
+            self.semantic_saved += semantic.get('saved', 0.0)
+            if semantic['outcome'] == 'adapted':
+                self.semantic_adapted += 1
+            elif semantic['outcome'] == 'reused':
+                self.semantic_reused += 1
+                return
+
+        if review.get('skipped'):
+            self.skipped_reasons[review['skipped']] = self.skipped_reasons.get(review['skipped'], 0) + 1
+        if review.get('tier'):
+            self.tiers[review['tier']] = self.tiers.get(review['tier'], 0) + 1
+        if review.get('model'):
+            self.models[review['model']] = self.models.get(review['model'], 0) + 1
+        if review.get('escalated_from'):
+            self.escalated += 1
+
+    def mark_not_reviewed(self, filenames: List[str]):
+        """Record files that were skipped because the outcome was already fixed.
+
+        Their verdicts, e.g. of a review cut short by the cancellation, do
+        not count towards the overall assessment.
+
+        Args:
+            filenames: Files that were never reviewed
+        """
+        self.not_reviewed.extend(filenames)
+        for filename in filenames:
+            self.verdicts.pop(filename, None)
+
+    @property
+    def blocks_commit(self) -> bool:
+        """Whether the reviews so far are enough to block a commit."""
+        return self.ratings.get('NEEDS_WORK', 0) > 0 or self.errors > 0
+
+    def summary(self) -> Dict[str, any]:
+        """Build the summary dict for the reviews added so far.
+
+        Returns:
+            Summary dict
+        """
+        total = self.total
+        ratings = dict(self.ratings)
+
+        # Calculate overall assessment; files skipped without a review (binary, too large)
+        # and files left unreviewed by --fail-fast do not count
+        verdicts = list(self.verdicts.values())
+        rated = len(verdicts)
+        excellent = verdicts.count('EXCELLENT')
+        good = verdicts.count('GOOD')
+        needs_work = verdicts.count('NEEDS_WORK')
+
+        if rated == 0:
+            # Nothing got a verdict, which is no evidence of quality either way
+            overall = 'SKIPPED'
+        elif excellent >= rated * 0.7:
+            overall = 'EXCELLENT'
+        elif (excellent + good) >= rated * 0.7:
+            overall = 'GOOD'
+        elif needs_work >= rated * 0.3:
+            overall = 'NEEDS_WORK'
+        else:
+            overall = 'FAIR'
+
+        skipped = sum(self.skipped_reasons.values())
+
+        return {
+            'total_files': total,
+            'errors': self.errors,
+            'ratings': ratings,
+            'overall': overall,
+            'deduplicated': self.deduplicated,
+            'cached': self.cached,
+            'skipped': skipped,
+            'skipped_reasons': dict(self.skipped_reasons),
+            'tiers': dict(self.tiers),
+            'models': dict(self.models),
+            'escalated': self.escalated,
+            'semantic_lookups': self.semantic_lookups,
+            'semantic_reused': self.semantic_reused,
+            'semantic_adapted': self.semantic_adapted,
+            'semantic_saved': self.semantic_saved,
+            'model_calls': total - self.deduplicated - self.cached - skipped - self.semantic_reused,
+            'tokens_raw': self.tokens_raw,
+            'tokens_sent': self.tokens_sent,
+            'truncated': self.truncated,
+            'not_reviewed': list(self.not_reviewed),
+            'reviews': list(self.reviews)
+        }
@@ -0,0 +1,159 @@
+"""Shared HTTP transport for Ollama requests, with connection pool metrics."""
+
+import importlib.util
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from . import config
+
+
+def http2_available() -> bool:
+    """Check whether the optional HTTP/2 dependency (h2) is installed."""
+    return importlib.util.find_spec('h2') is not None
+
+
+class PoolStats:
+    """Thread-safe counters describing how the connection pool was used."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connect_total = 0.0
+        self.http_versions = {}
+
+    def record(self, new_connection: bool, wait: float, connect: float, http_version: Optional[str]):
+        """Record one request.
+
+        Args:
+            new_connection: Whether the request had to open a connection
+            wait: Seconds spent waiting for a free connection in the pool
+            connect: Seconds spent opening a connection (0 when reused)
+            http_version: Protocol used for the request, e.g. "HTTP/1.1"
+        """
+        with self._lock:
+            self.requests += 1
+            if new_connection:
+                self.new_connections += 1
+                self.connect_total += connect
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            if http_version:
+                self.http_versions[http_version] = self.http_versions.get(http_version, 0) + 1
+
+    def snapshot(self) -> Dict[str, any]:
+        """Get the counters as a dict.
+
+        Returns:
+            Dict with request counts, reuse ratio and wait/connect times (in seconds)
+        """
+        with self._lock:
+            reused = self.requests - self.new_connections
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': reused,
+                'reuse_ratio': reused / self.requests if self.requests else 0.0,
+                'wait_avg': self.wait_total / self.requests if self.requests else 0.0,
+                'wait_max': self.wait_max,
+                'connect_avg': self.connect_total / self.new_connections if self.new_connections else 0.0,
+                'http_versions': dict(self.http_versions)
+            }
+
+
+class _RequestTrace:
+    """httpcore trace callback that timestamps the phases of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect_started = None
+        self.connect_finished = None
+        self.sending = None
+
+    def __call__(self, event_name: str, info: Dict[str, any]):
+        now = time.perf_counter()
+        if event_name == 'connection.connect_tcp.started' and self.connect_started is None:
+            self.connect_started = now
+        elif event_name in ('connection.start_tls.complete', 'connection.connect_tcp.complete'):
+            self.connect_finished = now
+        elif event_name.endswith('send_request_headers.started') and self.sending is None:
+            self.sending = now
+
+
+class PooledTransport(httpx.HTTPTransport):
+    """HTTP transport that records connection reuse and pool wait times.
+
+    Pool wait is the time between handing the request to the pool and
+    either opening a new connection or writing to a reused one.
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        """Initialize the transport.
+
+        Args:
+            stats: Counters to record into
+            **kwargs: Passed to httpx.HTTPTransport
+        """
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, tracing which connection served it."""
+        trace = _RequestTrace()
+        request.extensions['trace'] = trace
+
+        response = super().handle_request(request)
+
+        new_connection = trace.connect_started is not None
+        if new_connection:
+            acquired = trace.connect_started
+            connect = (trace.connect_finished or acquired) - acquired
+        else:
+            acquired = trace.sending or trace.started
+            connect = 0.0
+
+        self.stats.record(
+            new_connection,
+            wait=acquired - trace.started,
+            connect=connect,
+            http_version=response.extensions.get('http_version', b'').decode('ascii', 'ignore') or None
+        )
+        return response
+
+
+def build_http_options(stats: PoolStats, pool_size: Optional[int] = None) -> Dict[str, any]:
+    """Build the httpx.Client options shared by every Ollama client.
+
+    Args:
+        stats: Counters the transport records into
+        pool_size: Maximum number of connections (default: config.OLLAMA_POOL_SIZE)
+
+    Returns:
+        Keyword arguments for ollama.Client (passed through to httpx.Client)
+    """
+    pool_size = pool_size or config.OLLAMA_POOL_SIZE
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=config.OLLAMA_KEEPALIVE_EXPIRY
+    )
+
+    return {
+        'timeout': httpx.Timeout(
+            connect=config.OLLAMA_CONNECT_TIMEOUT,
+            read=config.OLLAMA_TIMEOUT,
+            write=config.OLLAMA_TIMEOUT,
+            pool=config.OLLAMA_TIMEOUT
+        ),
+        'transport': PooledTransport(
+            stats,
+            limits=limits,
+            http2=config.OLLAMA_HTTP2 and http2_available()
+        )
+    }
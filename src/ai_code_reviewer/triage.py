@@ -0,0 +1,222 @@
+"""Fast local analyzers that decide how much review a change needs."""
+
+import ast
+import json
+import re
+from typing import List, Dict, Optional, Tuple
+
+from .formatting import detect_formatting_only
+from .git_handler import GitHandler
+from .preprocess import is_unified_diff
+from . import config
+
+
+# Review tiers, cheapest first
+TIER_SKIP = 'skip'
+TIER_CHEAP = 'cheap'
+TIER_FULL = 'full'
+
+_COMMENT_PREFIXES = {
+    'python': ('#',),
+    'bash': ('#',),
+    'zsh': ('#',),
+    'fish': ('#',),
+    'yaml': ('#',),
+    'ruby': ('#',),
+    'sql': ('--',),
+}
+_C_STYLE_COMMENTS = ('//', '/*', '* ', '*/')
+
+# Change types whose "diff" is full file content (or a chunk of it), not a diff
+_FULL_CONTENT_TYPES = ('untracked', 'audit')
+
+_CONTROL_FLOW = re.compile(r'\b(if|elif|else|for|while|try|except|catch|switch|case|match)\b|&&|\|\|')
+_SECRET_PATTERN = re.compile(r'(password|passwd|secret|api[_-]?key|token|private[_-]?key)\s*[:=]', re.IGNORECASE)
+
+# Python calls that always deserve a full review
+_RISKY_CALLS = {
+    'eval', 'exec', 'compile', '__import__',
+    'os.system', 'os.popen', 'pickle.loads', 'pickle.load', 'marshal.loads',
+    'yaml.load', 'subprocess.call', 'subprocess.run', 'subprocess.Popen',
+    'subprocess.check_output', 'subprocess.check_call',
+}
+
+
+def _call_name(node: ast.Call) -> str:
+    """Get the dotted name of a called function, e.g. ``os.system``."""
+    func = node.func
+    parts = []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if isinstance(func, ast.Name):
+        parts.append(func.id)
+    return '.'.join(reversed(parts))
+
+
+def changed_lines(diff: str, full_content: bool = False) -> List[str]:
+    """Get added and removed lines of a diff (or every line of full content).
+
+    Args:
+        diff: Unified diff or full file content
+        full_content: The text is file content even if it looks like a diff
+
+    Returns:
+        Changed lines without their +/- markers
+    """
+    if full_content or not is_unified_diff(diff):
+        return diff.split('\n')
+
+    lines = []
+    for line in diff.split('\n'):
+        if line.startswith(('+++', '---')):
+            continue
+        if line.startswith(('+', '-')):
+            lines.append(line[1:])
+    return lines
+
+
+class Triage:
+    """Assign each change to the skip, cheap or full review tier."""
+
+    def __init__(self, git_handler: GitHandler):
+        """Initialize triage.
+
+        Args:
+            git_handler: Git operations handler, used to read file contents
+        """
+        self.git_handler = git_handler
+
+    def assess(self, filename: str, diff: str, language: str, change_type: str,
+               truncated: bool = False) -> Dict[str, any]:
+        """Run the local analyzers on a change.
+
+        Args:
+            filename: Name of the file
+            diff: The diff or content
+            language: Programming language
+            change_type: Type of change (modified, staged, untracked, audit)
+            truncated: The diff was cut off; whole-file checks are skipped
+
+        Returns:
+            Dict with tier, reason, detail and, for the skip tier, the rating to assign
+        """
+        versions = None
+        content = None
+        if not truncated:
+            # Huge files are not read in full just to triage them
+            if change_type in ('modified', 'staged'):
+                versions = self.git_handler.get_file_versions(filename, staged=(change_type == 'staged'))
+            content = self._new_content(filename, diff, change_type, versions)
+
+        # Tier 0: broken files get an instant verdict
+        error = self._syntax_error(filename, content, language)
+        if error:
+            return self._result(TIER_SKIP, 'syntax error', error, rating='NEEDS_WORK')
+
+        # Tier 0: semantically empty changes
+        if config.SKIP_FORMATTING_ONLY and versions:
+            reason = detect_formatting_only(versions[0], versions[1], language)
+            if reason:
+                return self._result(TIER_SKIP, reason, rating=config.FORMATTING_ONLY_RATING)
+
+        full_content = change_type in _FULL_CONTENT_TYPES
+        lines = [line for line in changed_lines(diff, full_content) if line.strip()]
+        # Comments in full content are documentation, licenses or commented-out code worth a look
+        if lines and not full_content and all(self._is_comment(line, language) for line in lines):
+            return self._result(TIER_SKIP, 'comment-only change', rating=config.FORMATTING_ONLY_RATING)
+
+        # Anything touching risky APIs or credentials gets the full review
+        risk = self._risk(content, lines, language)
+        if risk:
+            return self._result(TIER_FULL, 'risky change', risk)
+
+        if truncated:
+            return self._result(TIER_FULL, 'large change', 'diff truncated')
+
+        score = self.complexity_score(lines)
+        if score <= config.TRIAGE_CHEAP_MAX_SCORE:
+            return self._result(TIER_CHEAP, 'small change', f"complexity score {score}")
+
+        return self._result(TIER_FULL, 'large change', f"complexity score {score}")
+
+    def complexity_score(self, lines: List[str]) -> int:
+        """Score a change by size and control-flow density.
+
+        Args:
+            lines: Changed, non-blank lines
+
+        Returns:
+            Score; higher means riskier
+        """
+        branches = sum(len(_CONTROL_FLOW.findall(line)) for line in lines)
+        return len(lines) + 3 * branches
+
+    def _new_content(self, filename: str, diff: str, change_type: str,
+                     versions: Optional[Tuple[str, str]]) -> Optional[str]:
+        """Get the new version of a file, if it is cheaply available."""
+        if change_type == 'untracked':
+            return diff
+        if versions:
+            return versions[1]
+        if change_type in ('modified', 'staged'):
+            return self.git_handler.get_file_content(filename, staged=(change_type == 'staged'))
+        return None
+
+    def _syntax_error(self, filename: str, content: Optional[str], language: str) -> Optional[str]:
+        """Compile-check the new content of Python and JSON files."""
+        if content is None:
+            return None
+
+        if language == 'python':
+            try:
+                compile(content, filename, 'exec', dont_inherit=True)
+            except SyntaxError as e:
+                return f"line {e.lineno}: {e.msg}"
+            except ValueError as e:
+                return str(e)
+        elif language == 'json' and content.strip():
+            try:
+                json.loads(content)
+            except json.JSONDecodeError as e:
+                return f"line {e.lineno}: {e.msg}"
+
+        return None
+
+    def _is_comment(self, line: str, language: str) -> bool:
+        """Check whether a changed line is only a comment."""
+        prefixes = _COMMENT_PREFIXES.get(language, _C_STYLE_COMMENTS)
+        stripped = line.strip()
+        return stripped == '*' or stripped.startswith(prefixes)
+
+    def _risk(self, content: Optional[str], lines: List[str], language: str) -> Optional[str]:
+        """Look for patterns that always warrant a full review."""
+        for line in lines:
+            if _SECRET_PATTERN.search(line):
+                return 'possible credential in change'
+
+        if language == 'python' and content:
+            try:
+                tree = ast.parse(content)
+            except (SyntaxError, ValueError):
+                return None
+
+            changed = {line.strip() for line in lines}
+            source_lines = content.split('\n')
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.Call):
+                    continue
+                name = _call_name(node)
+                if name in _RISKY_CALLS and source_lines[node.lineno - 1].strip() in changed:
+                    return f"call to {name}"
+
+        return None
+
+    def _result(self, tier: str, reason: str, detail: str = '', rating: Optional[str] = None) -> Dict[str, any]:
+        """Build a triage result dict."""
+        return {
+            'tier': tier,
+            'reason': reason,
+            'detail': detail,
+            'rating': rating
+        }
@@ -8,7 +8,18 @@ from rich.markdown import Markdown
 from rich.prompt import Prompt, Confirm
 from rich import box
 from rich.text import Text
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional, Tuple
+
+from .change import Change
+
+
+# Short forms accepted at the follow-up prompt; "explain 2" becomes the explain question for issue 2
+FOLLOW_UP_SHORTCUTS = {
+    'fix': "Suggest a concrete fix for the most important issue in your review, as a code snippet.",
+    'explain': "Explain issue {n} from your review in more detail: why it matters and how to address it.",
+    'why': "Explain the reasoning behind your rating."
+}
 
 
 class ReviewTUI:
@@ -62,7 +73,7 @@ class ReviewTUI:
             self.console.print("❌ Ollama not connected. Make sure it's running: ollama serve",
                              style="bold red")
 
-    def show_changes_list(self, changes: List[Dict[str, str]]):
+    def show_changes_list(self, changes: List[Change]):
         """Display list of changes to be reviewed.
 
         Args:
@@ -79,8 +90,8 @@ class ReviewTUI:
         table.add_column("Lines", justify="right", style="yellow")
 
         for change in changes:
-            change_type = change['type'].upper()
-            lines = str(len(change['diff'].split('\n')))
+            change_type = change.type.upper()
+            lines = f"+{change.additions} -{change.deletions}"
 
             # Add emoji based on type
             type_emoji = {
@@ -91,9 +102,9 @@ class ReviewTUI:
             emoji = type_emoji.get(change_type, '📄')
 
             table.add_row(
-                change['file'],
+                change.file,
                 f"{emoji} {change_type}",
-                change['language'],
+                change.language,
                 lines
             )
 
@@ -143,6 +154,18 @@ class ReviewTUI:
         header.append(f" [{review['type']}]", style="dim")
         header.append(f" • {review['language']}", style="green")
         header.append(f" • Rating: {rating}", style=color)
+        if review.get('tokens_sent') and review.get('tokens_raw'):
+            header.append(f" • {self._format_token_savings(review)}", style="dim")
+        if review.get('truncated'):
+            header.append(" • diff truncated", style="yellow")
+        if review.get('escalated_from'):
+            header.append(f" • via {review['model']}", style="magenta")
+        if review.get('cached'):
+            header.append(" • cached", style="dim")
+        if review.get('duplicate_of'):
+            header.append(f" • same change as {review['duplicate_of']}", style="dim")
+        elif review.get('duplicates'):
+            header.append(f" • also applies to {len(review['duplicates'])} other file(s)", style="dim")
 
         self.console.print()
         self.console.print(header)
@@ -187,11 +210,12 @@ class ReviewTUI:
         """
         self.console.print(chunk, end="")
 
-    def finalize_streaming_review(self, rating: str):
+    def finalize_streaming_review(self, rating: str, review: Optional[Dict[str, any]] = None):
         """Display the final rating after streaming is complete.
 
         Args:
             rating: Final rating
+            review: Complete review dict, used for token statistics
         """
         rating_colors = {
             'EXCELLENT': 'bold green',
@@ -203,8 +227,31 @@ class ReviewTUI:
         }
         color = rating_colors.get(rating, 'white')
         self.console.print(f"\n\n[{color}]✓ Rating: {rating}[/{color}]")
+        if review and review.get('escalated_from'):
+            self.console.print(f"[magenta]Verdict from {review['model']} "
+                               f"(escalated after {', '.join(review['escalated_from'])})[/magenta]")
+        if review and review.get('cached'):
+            self.console.print("[dim]Served from the review cache[/dim]")
+        if review and review.get('tokens_sent') and review.get('tokens_raw'):
+            self.console.print(f"[dim]{self._format_token_savings(review)}[/dim]")
+        if review and review.get('truncated'):
+            self.console.print("[yellow]Only the beginning of this diff was reviewed (read cap reached)[/yellow]")
         self.console.print()
 
+    def _format_token_savings(self, stats: Dict[str, any]) -> str:
+        """Format prompt token savings for display.
+
+        Args:
+            stats: Dict with tokens_raw and tokens_sent
+
+        Returns:
+            Human readable savings string
+        """
+        raw = stats['tokens_raw']
+        sent = stats['tokens_sent']
+        saved = (1 - sent / raw) * 100 if raw else 0.0
+        return f"~{sent} of {raw} prompt tokens sent ({saved:.0f}% saved)"
+
     def show_summary(self, summary: Dict[str, any]):
         """Display review summary.
 
@@ -227,10 +274,47 @@ class ReviewTUI:
 
 [bold]Files Reviewed:[/bold] {summary['total_files']}
 [bold]Errors:[/bold] {summary['errors']}
-
-[bold]Rating Distribution:[/bold]
 """
 
+        if summary.get('deduplicated'):
+            summary_text += (f"[bold]Deduplicated:[/bold] {summary['deduplicated']} file(s) reused "
+                             f"reviews ({summary['model_calls']} model review(s) for {summary['total_files']} file(s))\n")
+
+        if summary.get('cached'):
+            summary_text += f"[bold]Served from Cache:[/bold] {summary['cached']} file(s) (reviewed earlier, e.g. by --watch)\n"
+
+        if summary.get('semantic_lookups'):
+            hits = summary['semantic_reused'] + summary['semantic_adapted']
+            summary_text += (f"[bold]Similar Past Reviews:[/bold] {hits}/{summary['semantic_lookups']} hit(s) "
+                             f"({summary['semantic_reused']} reused, {summary['semantic_adapted']} adapted), "
+                             f"~{summary['semantic_saved']:.1f}s saved\n")
+
+        if summary.get('skipped'):
+            summary_text += f"[bold]Skipped AI Review:[/bold] {summary['skipped']} file(s)\n"
+            for reason, count in summary['skipped_reasons'].items():
+                summary_text += f"  • {reason}: {count}\n"
+
+        if summary.get('tiers'):
+            tiers = " • ".join(f"{tier}: {count}" for tier, count in sorted(summary['tiers'].items()))
+            summary_text += f"[bold]Triage:[/bold] {tiers}\n"
+
+        if len(summary.get('models', {})) > 1 or summary.get('escalated'):
+            models = " • ".join(f"{model}: {count}" for model, count in summary['models'].items())
+            summary_text += f"[bold]Verdicts by Model:[/bold] {models} ({summary['escalated']} escalated)\n"
+
+        if summary.get('tokens_raw'):
+            summary_text += f"[bold]Diff Tokens:[/bold] {self._format_token_savings(summary)}\n"
+
+        if summary.get('truncated'):
+            summary_text += f"[bold]Truncated Diffs:[/bold] {summary['truncated']} file(s) reviewed partially\n"
+
+        if summary.get('not_reviewed'):
+            summary_text += f"[bold]Not Reviewed (fail-fast):[/bold] {len(summary['not_reviewed'])} file(s)\n"
+            for filename in summary['not_reviewed']:
+                summary_text += f"  • {filename}\n"
+
+        summary_text += "\n[bold]Rating Distribution:[/bold]\n"
+
         for rating, count in summary['ratings'].items():
             if rating != 'UNKNOWN' and count > 0:
                 percentage = (count / summary['total_files']) * 100
@@ -238,6 +322,85 @@ class ReviewTUI:
 
         self.console.print(Panel(summary_text, title="📊 Review Summary", border_style="blue", box=box.DOUBLE))
 
+    def show_watch_review(self, review: Dict[str, any]):
+        """Display a one-line result of a background review in watch mode.
+
+        Args:
+            review: Review result dict
+        """
+        rating = review.get('rating', 'UNKNOWN')
+        color = {'EXCELLENT': 'bold green', 'GOOD': 'green', 'FAIR': 'yellow',
+                 'NEEDS_WORK': 'red', 'ERROR': 'bold red'}.get(rating, 'white')
+        detail = review.get('skipped') or review.get('model', '')
+        self.console.print(f"[dim]{time.strftime('%H:%M:%S')}[/dim] 📄 {review['file']} "
+                           f"[dim][{review['type']}][/dim] [{color}]{rating}[/{color}] [dim]{detail}[/dim]")
+
+    def show_multi_repo_summary(self, results: Dict[str, any]):
+        """Display the per-repository results of a multi-repository run.
+
+        Args:
+            results: Dict from MultiRepoReviewer.run
+        """
+        table = Table(title="📦 Repositories", box=box.ROUNDED)
+        table.add_column("Repository", style="cyan")
+        table.add_column("Files", justify="right")
+        table.add_column("Model Reviews", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("Overall")
+        table.add_column("Scan", justify="right")
+
+        colors = {'EXCELLENT': 'bold green', 'GOOD': 'green', 'FAIR': 'yellow', 'NEEDS_WORK': 'red'}
+        for repo in results['repos']:
+            summary = repo['summary']
+            if summary is None:
+                table.add_row(repo['repo'], "-", "-", "-", f"[bold red]{repo['error']}[/bold red]", "-")
+                continue
+            if not summary['total_files']:
+                overall = "[dim]no changes[/dim]"
+            else:
+                color = colors.get(summary['overall'], 'white')
+                overall = f"[{color}]{summary['overall']}[/{color}]"
+            table.add_row(repo['repo'], str(summary['total_files']), str(summary['model_calls']),
+                          str(summary['errors']), overall, f"{repo['scan_seconds']:.2f}s")
+
+        self.console.print(table)
+
+    def show_timing_report(self, timing: Dict[str, any]):
+        """Display where the time of a run went.
+
+        Args:
+            timing: Dict with 'elapsed' seconds, 'pool' connection statistics and 'concurrency' controller state
+        """
+        table = Table(title="⏱️  Timing Report", box=box.ROUNDED)
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right")
+
+        table.add_row("Elapsed", f"{timing['elapsed']:.2f}s")
+
+        pool = timing.get('pool')
+        if pool:
+            versions = ", ".join(pool['http_versions']) or "-"
+            table.add_row("HTTP requests", f"{pool['requests']} ({versions})")
+            table.add_row("Connections opened", f"{pool['new_connections']} (pool size {pool['pool_size']})")
+            table.add_row("Connection reuse", f"{pool['reuse_ratio']:.0%}")
+            table.add_row("Pool wait (avg / max)", f"{pool['wait_avg'] * 1000:.1f}ms / {pool['wait_max'] * 1000:.1f}ms")
+            table.add_row("Connect time (avg)", f"{pool['connect_avg'] * 1000:.1f}ms")
+
+        concurrency = timing.get('concurrency')
+        if concurrency and concurrency['requests']:
+            mode = "adaptive" if concurrency['adaptive'] else "fixed"
+            table.add_row("Review concurrency", f"{concurrency['limit']} {mode} "
+                                                f"({concurrency['minimum']}-{concurrency['maximum']}, "
+                                                f"peak {concurrency['peak_inflight']} in flight)")
+            history = " → ".join(f"{limit}@{offset:.1f}s" for offset, limit, _ in concurrency['history'])
+            table.add_row("Concurrency over time", history)
+            table.add_row("Model requests", f"{concurrency['requests']} ({concurrency['errors']} failed)")
+            table.add_row("Time to first token (avg)", f"{concurrency['ttft_avg']:.2f}s")
+            table.add_row("Queueing delay (avg)", f"{concurrency['queue_delay_avg']:.2f}s")
+            table.add_row("Tokens/sec per request (avg)", f"{concurrency['tokens_per_sec_avg']:.1f}")
+
+        self.console.print(table)
+
     def show_menu(self) -> str:
         """Show main menu and get user choice.
 
@@ -253,6 +416,67 @@ class ReviewTUI:
         choice = Prompt.ask("\nEnter your choice", choices=["1", "2", "3", "4"], default="1")
         return choice
 
+    def prompt_follow_up(self, files: List[str]) -> Optional[Tuple[str, str]]:
+        """Ask which reviewed file to follow up on, and the question.
+
+        Args:
+            files: Files whose reviews can be continued
+
+        Returns:
+            Tuple of (file, question), or None when the user is done
+        """
+        self.console.print("\n[bold cyan]Follow up on a review[/bold cyan] [dim](Enter to finish)[/dim]")
+        for i, filename in enumerate(files, 1):
+            self.console.print(f"  {i}. {filename}")
+
+        choice = Prompt.ask("File", choices=[str(i) for i in range(1, len(files) + 1)] + [""],
+                            default="", show_choices=False)
+        if not choice:
+            return None
+
+        self.console.print("[dim]Shortcuts: 'fix', 'explain <issue number>', 'why'[/dim]")
+        question = Prompt.ask("Question", default="fix").strip()
+        return files[int(choice) - 1], self._expand_follow_up(question)
+
+    def _expand_follow_up(self, question: str) -> str:
+        """Turn a follow-up shortcut into the full question.
+
+        Args:
+            question: What the user typed
+
+        Returns:
+            The question to send to the model
+        """
+        words = question.split()
+        if not words or words[0].lower() not in FOLLOW_UP_SHORTCUTS:
+            return question
+
+        template = FOLLOW_UP_SHORTCUTS[words[0].lower()]
+        if '{n}' not in template:
+            return template if len(words) == 1 else question
+        if len(words) == 2 and words[1].isdigit():
+            return template.format(n=words[1])
+        return question
+
+    def show_follow_up_header(self, filename: str, question: str):
+        """Display the header for a streaming follow-up answer.
+
+        Args:
+            filename: File the question is about
+            question: The question
+        """
+        self.console.print()
+        self.console.print(f"💬 {filename}: [italic]{question}[/italic]", style="bold cyan")
+        self.console.print("─" * self.console.width, style="dim")
+
+    def finalize_follow_up(self, elapsed: float):
+        """Display the answer latency after streaming is complete.
+
+        Args:
+            elapsed: Seconds the answer took
+        """
+        self.console.print(f"\n\n[dim]Answered in {elapsed:.1f}s[/dim]")
+
     def confirm_action(self, message: str) -> bool:
         """Ask for user confirmation.
 
@@ -0,0 +1,313 @@
+"""Watch mode: review files in the background as they change."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from .cancellation import CancellationToken
+from .change import Change
+from .code_reviewer import CodeReviewer
+from .git_handler import GitHandler
+from . import config
+
+
+# inotify event flags (see inotify(7))
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_ISDIR = 0x40000000
+_IN_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Changes to the index mean files were staged or unstaged
+_INDEX_PATH = '.git/index'
+
+
+class InotifyBackend:
+    """Report file changes through Linux inotify (no extra dependencies)."""
+
+    def __init__(self, git_handler: GitHandler):
+        """Start watching every directory that holds tracked or untracked files.
+
+        Args:
+            git_handler: Git operations handler of the repository to watch
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+
+        self.git_handler = git_handler
+        self.root = Path(git_handler.repo_root)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches = {}
+
+        directories = {''}
+        for filepath in git_handler.get_tracked_files() + git_handler.get_dirty_files():
+            parent = os.path.dirname(filepath)
+            while parent not in directories:
+                directories.add(parent)
+                parent = os.path.dirname(parent)
+        for directory in sorted(directories):
+            self._add_watch(directory)
+        self._add_watch('.git')
+
+    def _add_watch(self, directory: str):
+        """Watch one directory (relative to the repo root)."""
+        if directory and self._ignored(directory):
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(self.root / directory)), _IN_WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+
+    def _ignored(self, relpath: str) -> bool:
+        """Check whether events for a path are noise (our own cache writes, git internals)."""
+        if relpath == '.git' or relpath == _INDEX_PATH:
+            return False
+        if relpath.startswith('.git/'):
+            return True
+        return self.git_handler._should_exclude(relpath) or self.git_handler._should_exclude(relpath + '/')
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Wait for file events.
+
+        Args:
+            timeout: Seconds to wait for the first event
+
+        Returns:
+            Changed paths relative to the repo root (empty on timeout)
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', errors='replace')
+                offset += length
+
+                directory = self._watches.get(wd)
+                if directory is None or not name:
+                    continue
+                relpath = f"{directory}/{name}" if directory else name
+                if relpath == '.git/index.lock':
+                    relpath = _INDEX_PATH
+                if self._ignored(relpath):
+                    continue
+
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._add_watch(relpath)
+                    continue
+                changed.add(relpath)
+
+        return changed
+
+    def close(self):
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingBackend:
+    """Report file changes by periodically comparing modification times.
+
+    Only dirty (modified or untracked) files and the index are checked,
+    so each scan costs one git call plus a few stat calls.
+    """
+
+    def __init__(self, git_handler: GitHandler, interval: float = config.WATCH_POLL_INTERVAL):
+        """Take the initial snapshot.
+
+        Args:
+            git_handler: Git operations handler of the repository to watch
+            interval: Seconds between scans
+        """
+        self.git_handler = git_handler
+        self.root = Path(git_handler.repo_root)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, int]:
+        """Get the modification time of every dirty file and the index."""
+        snapshot = {}
+        for relpath in self.git_handler.get_dirty_files() + [_INDEX_PATH]:
+            try:
+                snapshot[relpath] = (self.root / relpath).stat().st_mtime_ns
+            except OSError:
+                continue
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Wait for file changes.
+
+        Args:
+            timeout: Seconds to wait at most
+
+        Returns:
+            Changed paths relative to the repo root (empty if nothing changed)
+        """
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        changed = {
+            relpath for relpath in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(relpath) != self._snapshot.get(relpath)
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        """Stop watching."""
+
+
+def create_backend(git_handler: GitHandler, name: str = config.WATCH_BACKEND):
+    """Create the file watching backend.
+
+    Args:
+        git_handler: Git operations handler of the repository to watch
+        name: 'inotify', 'poll' or 'auto' (inotify where available, polling otherwise)
+
+    Returns:
+        InotifyBackend or PollingBackend
+    """
+    if name in ('auto', 'inotify'):
+        try:
+            return InotifyBackend(git_handler)
+        except (OSError, AttributeError):
+            if name == 'inotify':
+                raise
+    return PollingBackend(git_handler)
+
+
+class ReviewWatcher:
+    """Pre-review changed files so later review runs are served from the cache.
+
+    Runs one review at a time and restarts its scan whenever files change
+    again, so work is only spent on content that has settled.
+    """
+
+    def __init__(self, code_reviewer: CodeReviewer, backend=None, debounce: float = config.WATCH_DEBOUNCE):
+        """Initialize the watcher.
+
+        Args:
+            code_reviewer: Reviewer whose cache receives the results
+            backend: File watching backend (default: create_backend())
+            debounce: Seconds without file events before reviewing
+        """
+        self.code_reviewer = code_reviewer
+        self.git_handler = code_reviewer.git_handler
+        self.backend = backend or create_backend(self.git_handler)
+        self.debounce = debounce
+        self._seen = set()
+
+    def run(self, cancel_token: CancellationToken,
+            on_review: Optional[Callable[[Dict[str, any]], None]] = None):
+        """Watch and review until cancelled.
+
+        Args:
+            cancel_token: Token that stops watching
+            on_review: Called with each fresh review result
+        """
+        try:
+            while not cancel_token.cancelled:
+                self.review_pending(cancel_token, on_review)
+                self.wait_for_changes(cancel_token)
+        finally:
+            self.backend.close()
+
+    def wait_for_changes(self, cancel_token: CancellationToken, changed: Optional[Set[str]] = None) -> Set[str]:
+        """Block until files change and then stay quiet for the debounce period.
+
+        Args:
+            cancel_token: Token that stops waiting
+            changed: Changes already seen; only the quiet period is awaited
+
+        Returns:
+            Changed paths
+        """
+        changed = set(changed or ())
+        while not cancel_token.cancelled:
+            events = self.backend.poll(self.debounce if changed else 0.5)
+            if events:
+                changed |= events
+            elif changed:
+                return changed
+        return changed
+
+    def pending_changes(self) -> List[Change]:
+        """Get the staged and unstaged changes that have no cached review yet.
+
+        Returns:
+            Changes to review
+        """
+        changes = self.git_handler.get_staged_changes() + self.git_handler.get_unstaged_changes()
+        self.code_reviewer.assign_cache_keys(changes)
+        self.code_reviewer.fetch_shared_reviews(change.cache_key for change in changes)
+
+        cache = self.code_reviewer.cache
+        return [
+            change for change in changes
+            if change.cache_key and change.cache_key not in self._seen and change.cache_key not in cache
+        ]
+
+    def review_pending(self, cancel_token: CancellationToken,
+                       on_review: Optional[Callable[[Dict[str, any]], None]] = None) -> int:
+        """Review every change without a cached review, one at a time.
+
+        Stops early when files change again; the next pass picks up the
+        new content.
+
+        Args:
+            cancel_token: Token that aborts the review in progress
+            on_review: Called with each fresh review result
+
+        Returns:
+            Number of changes reviewed
+        """
+        reviewed = 0
+        restart = True
+        while restart and not cancel_token.cancelled:
+            restart = False
+            for change in self.pending_changes():
+                if cancel_token.cancelled:
+                    break
+
+                review = self.code_reviewer._review_and_release(change, cancel_token)
+                # Skipped and failed reviews are not cached; remember them for this session
+                self._seen.add(change.cache_key)
+                reviewed += 1
+                if on_review:
+                    on_review(review)
+
+                events = self.backend.poll(0)
+                if events:
+                    # Content moved on; let it settle, then rescan
+                    self.wait_for_changes(cancel_token, events)
+                    restart = True
+                    break
+
+        return reviewed
@@ -6,6 +6,7 @@ from pathlib import Path
 # Add parent directory to path for testing
 sys.path.insert(0, str(Path(__file__).parent))
 
+from change import Change
 from git_handler import GitHandler
 from ollama_client import OllamaClient
 from tui import ReviewTUI
@@ -35,24 +36,9 @@ def demo_tui():
     # Demo changes list
     tui.show_info("Demo: Changes List")
     demo_changes = [
-        {
-            'file': 'main.py',
-            'type': 'modified',
-            'language': 'python',
-            'diff': '+ def new_function():\n+     return True\n'
-        },
-        {
-            'file': 'config.py',
-            'type': 'staged',
-            'language': 'python',
-            'diff': '+ NEW_SETTING = True\n'
-        },
-        {
-            'file': 'test.js',
-            'type': 'untracked',
-            'language': 'javascript',
-            'diff': 'console.log("Hello");\n'
-        }
+        Change.from_text('main.py', 'modified', 'python', '+ def new_function():\n+     return True\n'),
+        Change.from_text('config.py', 'staged', 'python', '+ NEW_SETTING = True\n'),
+        Change.from_text('test.js', 'untracked', 'javascript', 'console.log("Hello");\n')
     ]
     tui.show_changes_list(demo_changes)
 
@@ -0,0 +1,54 @@
+"""Tests for merging the reports of a sharded audit."""
+
+import json
+import os
+
+from ai_code_reviewer.audit import merge_audit_reports
+from ai_code_reviewer.summary import SummaryAggregator
+
+
+class Reviewer:
+    """Stand-in for CodeReviewer; merging only needs its summary."""
+
+    def get_summary(self, reviews):
+        aggregator = SummaryAggregator()
+        for review in reviews:
+            aggregator.add(review)
+        return aggregator.summary()
+
+
+def write_report(directory, index, count, ratings, mtime):
+    reviews = [{'file': filename, 'rating': rating, 'error': False} for filename, rating in ratings.items()]
+    report = Reviewer().get_summary(reviews)
+    report.update(shard=f"{index}/{count}", shard_index=index, shard_count=count)
+    path = directory / f"shard-{index}-of-{count}.json"
+    path.write_text(json.dumps(report))
+    os.utime(path, (mtime, mtime))
+
+
+def test_merge_uses_the_newest_shard_set(tmp_path):
+    write_report(tmp_path, 0, 3, {'old.py': 'NEEDS_WORK'}, mtime=1000)
+    write_report(tmp_path, 2, 3, {'gone.py': 'NEEDS_WORK'}, mtime=1001)
+    write_report(tmp_path, 0, 2, {'a.py': 'EXCELLENT'}, mtime=2000)
+    write_report(tmp_path, 1, 2, {'b.py': 'EXCELLENT'}, mtime=2001)
+    # A checkpoint still listing a deleted file must not leak into the merge
+    (tmp_path / 'shard-1-of-2.jsonl').write_text(json.dumps({'file': 'deleted.py', 'rating': 'NEEDS_WORK'}) + '\n')
+
+    summary = merge_audit_reports(Reviewer(), str(tmp_path))
+
+    assert summary['shard_count'] == 2
+    assert summary['shards'] == ['shard-0-of-2', 'shard-1-of-2']
+    assert summary['missing_shards'] == []
+    assert summary['ignored_shards'] == ['shard-0-of-3', 'shard-2-of-3']
+    assert [review['file'] for review in summary['reviews']] == ['a.py', 'b.py']
+    assert summary['overall'] == 'EXCELLENT'
+    assert json.loads((tmp_path / 'report.json').read_text())['shards'] == summary['shards']
+
+
+def test_merge_reports_missing_shards(tmp_path):
+    write_report(tmp_path, 1, 3, {'b.py': 'GOOD'}, mtime=1000)
+
+    summary = merge_audit_reports(Reviewer(), str(tmp_path))
+
+    assert summary['missing_shards'] == ['0/3', '2/3']
+    assert [review['file'] for review in summary['reviews']] == ['b.py']
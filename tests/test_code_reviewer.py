@@ -0,0 +1,112 @@
+"""Tests for the review pipeline, with a scripted model client."""
+
+import subprocess
+
+import pytest
+
+from ai_code_reviewer import config
+from ai_code_reviewer.code_reviewer import CodeReviewer
+from ai_code_reviewer.git_handler import GitHandler
+from ai_code_reviewer.journal import ReviewJournal
+
+
+class FakeClient:
+    """Model client that approves everything and records what it was asked."""
+
+    models = ['fake-model']
+
+    def __init__(self):
+        self.reviewed = []
+
+    def review_code(self, filename, *args, **kwargs):
+        self.reviewed.append(filename)
+        return "Looks fine.\nRating: GOOD"
+
+    def abort_inflight(self):
+        pass
+
+
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+
+
+def stage(repo, filename, content):
+    (repo / filename).write_text(content)
+    git(repo, 'add', filename)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_ENABLED', True)
+    monkeypatch.setattr(config, 'TRIAGE_ENABLED', True)
+    monkeypatch.setattr(config, 'SEMANTIC_ENABLED', False)
+    monkeypatch.setattr(config, 'REMOTE_CACHE_URL', '')
+
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    git(repo, 'config', 'user.email', 'test@example.com')
+    git(repo, 'config', 'user.name', 'Test')
+    stage(repo, 'a.py', 'def f():\n    return 1\n')
+    git(repo, 'commit', '-q', '-m', 'initial')
+    return repo
+
+
+def test_restaged_syntax_error_is_not_served_from_cache(repo, tmp_path):
+    client = FakeClient()
+    reviewer = CodeReviewer(GitHandler(str(repo)), client, cache_root=tmp_path / 'state')
+
+    stage(repo, 'a.py', 'def f():\n    return 2\n')
+    [review] = reviewer.review_changes(staged=True)
+    assert review['rating'] == 'GOOD'
+
+    # Same long-lived handler, as in watch mode and the pre-commit hook
+    stage(repo, 'a.py', 'def f(:\n    return 2\n')
+    [review] = reviewer.review_changes(staged=True)
+    assert review['rating'] == 'NEEDS_WORK'
+    assert review['triage_reason'] == 'syntax error'
+    assert client.reviewed == ['a.py']
+
+
+def test_triage_verdict_wins_over_a_cached_review(repo, tmp_path):
+    client = FakeClient()
+    reviewer = CodeReviewer(GitHandler(str(repo)), client, cache_root=tmp_path / 'state')
+
+    stage(repo, 'a.py', 'def f(:\n    return 2\n')
+    key = reviewer.cache_keys(['a.py'], 'staged')['a.py']
+    reviewer.cache.put(key, {'file': 'a.py', 'review': 'Looks fine.\nRating: GOOD', 'rating': 'GOOD',
+                             'error': False})
+
+    [review] = reviewer.review_changes(staged=True)
+    assert review['rating'] == 'NEEDS_WORK'
+    assert not review.get('cached')
+
+
+def test_resume_reviews_only_files_edited_since(repo, tmp_path, monkeypatch):
+    # Without the cache, only the journal can tell which reviews still hold
+    monkeypatch.setattr(config, 'CACHE_ENABLED', False)
+    for name in 'abc':
+        (repo / f'{name}.py').write_text(f'def {name}():\n    return 1\n')
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', 'more files')
+    for name in 'abc':
+        with open(repo / f'{name}.py', 'a') as f:
+            f.write(f'\ndef {name}2(x):\n    return x * {ord(name)}\n')
+
+    client = FakeClient()
+    reviewer = CodeReviewer(GitHandler(str(repo)), client, cache_root=tmp_path / 'state')
+    runs = tmp_path / 'runs'
+    journal = ReviewJournal.create(runs, staged=False)
+    reviewer.review_changes(journal=journal)
+    journal.close()
+    assert sorted(client.reviewed) == ['a.py', 'b.py', 'c.py']
+
+    with open(repo / 'b.py', 'a') as f:
+        f.write('\ndef edited():\n    return None\n')
+    client.reviewed.clear()
+    journal = ReviewJournal.open(runs, journal.run_id)
+    reviews = reviewer.review_changes(journal=journal)
+    journal.close()
+
+    assert client.reviewed == ['b.py']
+    assert sorted(review['file'] for review in reviews) == ['a.py', 'b.py', 'c.py']
@@ -0,0 +1,48 @@
+"""Tests for reading file versions through the persistent cat-file session."""
+
+import subprocess
+
+import pytest
+
+from ai_code_reviewer.git_handler import GitHandler
+
+
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'config', 'user.email', 'test@example.com')
+    git(tmp_path, 'config', 'user.name', 'Test')
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    git(tmp_path, 'add', 'a.py')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+    return tmp_path
+
+
+def test_staged_reads_follow_the_index(repo):
+    handler = GitHandler(str(repo))
+    (repo / 'a.py').write_text('x = 2\n')
+    git(repo, 'add', 'a.py')
+    assert handler.get_file_versions('a.py', staged=True) == ('x = 1\n', 'x = 2\n')
+
+    # The cat-file processes are still running from the first read
+    (repo / 'a.py').write_text('x = 3\n')
+    git(repo, 'add', 'a.py')
+    assert handler.get_file_versions('a.py', staged=True) == ('x = 1\n', 'x = 3\n')
+
+
+def test_head_reads_follow_commits(repo):
+    handler = GitHandler(str(repo))
+    assert handler.read_blob('HEAD:a.py') == 'x = 1\n'
+
+    (repo / 'a.py').write_text('x = 2\n')
+    git(repo, 'commit', '-q', '-a', '-m', 'second')
+    assert handler.read_blob('HEAD:a.py') == 'x = 2\n'
+
+
+def test_unstaged_index_path_reads_as_missing(repo):
+    handler = GitHandler(str(repo))
+    assert handler.read_blobs([':a.py', ':missing.py']) == ['x = 1\n', None]
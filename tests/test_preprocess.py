@@ -0,0 +1,30 @@
+"""Tests for diff compaction before review."""
+
+import pytest
+
+from ai_code_reviewer.preprocess import DiffPreprocessor
+
+
+# Dedents a statement out of an if block: a real change wherever indentation is syntax
+DEDENT_DIFF = """diff --git a/x b/x
+--- a/x
++++ b/x
+@@ -1,3 +1,3 @@
+ if ok:
+-    run()
++run()
+ done()
+"""
+
+
+@pytest.mark.parametrize('language', ['python', 'yaml', 'markdown', 'make'])
+def test_indentation_hunks_are_kept_where_whitespace_matters(language):
+    payload, _ = DiffPreprocessor().process(DEDENT_DIFF, language)
+    assert '-    run()' in payload
+    assert '+run()' in payload
+    assert 'whitespace-only' not in payload
+
+
+def test_whitespace_only_hunks_collapse_elsewhere():
+    payload, _ = DiffPreprocessor().process(DEDENT_DIFF, 'javascript')
+    assert payload == '@@ line 1: whitespace-only change (1 line(s)) @@'
@@ -0,0 +1,34 @@
+"""Tests for the incremental summary aggregator."""
+
+from ai_code_reviewer.summary import SummaryAggregator
+
+
+def review(filename, rating, **extra):
+    return {'file': filename, 'rating': rating, 'error': False, **extra}
+
+
+def test_all_skipped_run_has_no_verdict():
+    aggregator = SummaryAggregator()
+    aggregator.add(review('logo.png', 'SKIPPED', skipped='binary file'))
+    aggregator.add(review('dump.sql', 'SKIPPED', skipped='file too large'))
+    assert aggregator.summary()['overall'] == 'SKIPPED'
+
+
+def test_skipped_files_do_not_dilute_the_rating():
+    aggregator = SummaryAggregator()
+    aggregator.add(review('app.py', 'EXCELLENT'))
+    for i in range(5):
+        aggregator.add(review(f'asset{i}.png', 'SKIPPED', skipped='binary file'))
+    assert aggregator.summary()['overall'] == 'EXCELLENT'
+
+
+def test_not_reviewed_files_do_not_count():
+    aggregator = SummaryAggregator()
+    aggregator.add(review('a.py', 'EXCELLENT'))
+    aggregator.add(review('b.py', 'EXCELLENT'))
+    aggregator.add(review('c.py', 'UNKNOWN'))
+    aggregator.mark_not_reviewed(['c.py', 'd.py', 'e.py'])
+
+    summary = aggregator.summary()
+    assert summary['overall'] == 'EXCELLENT'
+    assert summary['not_reviewed'] == ['c.py', 'd.py', 'e.py']
@@ -0,0 +1,24 @@
+"""Tests for the local triage tier."""
+
+import pytest
+
+from ai_code_reviewer.triage import TIER_SKIP, Triage
+
+
+@pytest.mark.parametrize('language, content', [
+    ('markdown', "* run the installer\n* restart the service\n"),
+    ('python', "# Copyright (c) Example Corp.\n# Licensed under the MIT license.\n"),
+    ('sql', "-- drop table users;\n-- drop table sessions;\n"),
+])
+def test_full_content_made_of_comments_is_reviewed(language, content):
+    triage = Triage(git_handler=None)
+    for change_type in ('audit', 'untracked'):
+        result = triage.assess('chunk', content, language, change_type)
+        assert result['tier'] != TIER_SKIP
+
+
+def test_comment_only_diff_is_skipped():
+    diff = "--- a/app.py\n+++ b/app.py\n@@ -1,1 +1,1 @@\n-# old note\n+# new note\n"
+    result = Triage(git_handler=None).assess('app.py', diff, 'python', 'staged', truncated=True)
+    assert result['tier'] == TIER_SKIP
+    assert result['reason'] == 'comment-only change'